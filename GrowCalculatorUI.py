@@ -1,11 +1,608 @@
 # grow_calculator_ui.py
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from core_logic.plant_calculator import PlantCalculator
+from operator import itemgetter
+import bisect
+import csv
+import math
+import queue
 import re
+import threading
 import time
 
+
+class PrefixIndex:
+    """Sorted word-start suffixes of names: a lookup is two bisects and a slice."""
+
+    def __init__(self, names):
+        self.names = list(names)
+        entries = []
+        for pos, name in enumerate(self.names):
+            # Every word start is a key, without separators, so "chakra" finds
+            # "CorruptChakra" and "foxfire ch" finds "FoxfireChakra"
+            starts = [0] + [m.start() for m in re.finditer(r"(?<=[\s_-])\w|(?<=[a-z])[A-Z]", name)]
+            entries.extend((self._key(name[start:]), pos) for start in starts)
+        entries.sort()
+        self.keys = [key for key, _ in entries]
+        self.positions = [pos for _, pos in entries]
+
+    @staticmethod
+    def _key(text):
+        return re.sub(r"[\s_-]+", "", text).lower()
+
+    def search(self, query):
+        query = self._key(query)
+        if not query:
+            return self.names
+        lo = bisect.bisect_left(self.keys, query)
+        hi = bisect.bisect_left(self.keys, query + "\uffff", lo)
+        return [self.names[pos] for pos in sorted(set(self.positions[lo:hi]))]
+
+
+class VirtualList(tk.Frame):
+    """
+    Checkable list drawn on a canvas. Only the rows in view exist; scrolling
+    rewrites their text, so cost depends on the window height, not the item count.
+    """
+    ROW_HEIGHT = 24
+
+    def __init__(self, master, is_checked=None, on_toggle=None, width=370, height=300):
+        super().__init__(master, bg="#2b2b2b")
+        self.is_checked = is_checked
+        self.on_toggle = on_toggle
+        self.items = []
+        self.top = 0
+        self.active = 0
+        self.rows = []
+
+        self.canvas = tk.Canvas(self, width=width, height=height, bg="#2b2b2b",
+                                highlightthickness=0, takefocus=1)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self.yview("scroll", -3, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.yview("scroll", 3, "units"))
+        self.canvas.bind("<Up>", lambda e: self.move(-1))
+        self.canvas.bind("<Down>", lambda e: self.move(1))
+        self.canvas.bind("<space>", lambda e: self.toggle_active())
+
+    def set_items(self, items):
+        self.items = items
+        self.top = 0
+        self.active = 0
+        self.refresh()
+
+    def page(self):
+        return max(1, self.canvas.winfo_height() // self.ROW_HEIGHT)
+
+    def _on_resize(self, event):
+        # One pooled row per visible line (plus a partial one); never more
+        needed = event.height // self.ROW_HEIGHT + 1
+        while len(self.rows) < needed:
+            y = len(self.rows) * self.ROW_HEIGHT
+            bg = self.canvas.create_rectangle(0, y, 4000, y + self.ROW_HEIGHT, width=0, fill="#2b2b2b")
+            self.rows.append((bg,) + self._create_cells(y + self.ROW_HEIGHT // 2))
+        self.yview("scroll", 0, "units")
+
+    def _create_cells(self, mid):
+        return (
+            self.canvas.create_text(12, mid, anchor="w", fill="#4CAF50", font=("Segoe UI", 10)),
+            self.canvas.create_text(36, mid, anchor="w", fill="white", font=("Segoe UI", 9)),
+        )
+
+    def _draw_cells(self, cells, item):
+        check, label = cells
+        self.canvas.itemconfigure(check, text="☑" if self.is_checked(item) else "☐")
+        self.canvas.itemconfigure(label, text=item)
+
+    def refresh(self):
+        for i, row in enumerate(self.rows):
+            idx = self.top + i
+            if idx < len(self.items):
+                for item in row:
+                    self.canvas.itemconfigure(item, state="normal")
+                self.canvas.itemconfigure(row[0], fill="#3c3c3c" if idx == self.active else "#2b2b2b")
+                self._draw_cells(row[1:], self.items[idx])
+            else:
+                for item in row:
+                    self.canvas.itemconfigure(item, state="hidden")
+        total = len(self.items)
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.page()) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def yview(self, *args):
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.items))
+        elif args[0] == "scroll":
+            step = self.page() if args[2] == "pages" else 1
+            self.top += int(args[1]) * step
+        self.top = max(0, min(self.top, len(self.items) - self.page()))
+        self.refresh()
+
+    def _on_wheel(self, event):
+        self.yview("scroll", -3 if event.delta > 0 else 3, "units")
+
+    def _on_click(self, event):
+        self.canvas.focus_set()
+        idx = self.top + event.y // self.ROW_HEIGHT
+        if idx < len(self.items):
+            self.active = idx
+            if self.on_toggle is not None:
+                self.toggle_active()
+            else:
+                self.refresh()
+
+    def move(self, delta):
+        if not self.items:
+            return
+        self.active = max(0, min(self.active + delta, len(self.items) - 1))
+        if self.active < self.top:
+            self.top = self.active
+        elif self.active >= self.top + self.page():
+            self.top = self.active - self.page() + 1
+        self.refresh()
+
+    def toggle_active(self):
+        if self.on_toggle is not None and self.active < len(self.items):
+            self.on_toggle(self.items[self.active])
+            self.refresh()
+
+
+class VirtualTable(VirtualList):
+    """
+    VirtualList of tuples laid out in columns under a header; clicking a
+    column title calls on_sort with its index. format_row turns an item into
+    one string per column.
+    """
+
+    def __init__(self, master, columns, format_row, on_sort, width=760, height=360):
+        # columns: (title, width in pixels, "w" or "e" alignment)
+        self.columns = columns
+        self.format_row = format_row
+        super().__init__(master, width=width, height=height)
+        self.header = tk.Canvas(self, width=width, height=self.ROW_HEIGHT, bg="#3c3c3c",
+                                highlightthickness=0)
+        self.header.pack(side="top", fill="x", before=self.canvas)
+        self.titles = [
+            self.header.create_text(x, self.ROW_HEIGHT // 2, anchor=anchor, text=title,
+                                    fill="#4CAF50", font=("Segoe UI", 9, "bold"))
+            for x, (title, _, anchor) in zip(self._text_x(), columns)
+        ]
+        self.header.bind("<Button-1>", lambda e: on_sort(self._column_at(e.x)))
+
+    def _text_x(self):
+        xs, left = [], 0
+        for _, col_width, anchor in self.columns:
+            xs.append(left + 6 if anchor == "w" else left + col_width - 6)
+            left += col_width
+        return xs
+
+    def _column_at(self, x):
+        left = 0
+        for col, (_, col_width, _) in enumerate(self.columns):
+            left += col_width
+            if x < left:
+                return col
+        return None
+
+    def set_sort_indicator(self, col, reverse):
+        for i, (item, (title, _, _)) in enumerate(zip(self.titles, self.columns)):
+            arrow = (" ▼" if reverse else " ▲") if i == col else ""
+            self.header.itemconfigure(item, text=title + arrow)
+
+    def _create_cells(self, mid):
+        return tuple(
+            self.canvas.create_text(x, mid, anchor=anchor, fill="white", font=("Segoe UI", 9))
+            for x, (_, _, anchor) in zip(self._text_x(), self.columns)
+        )
+
+    def _draw_cells(self, cells, item):
+        for cell, text in zip(cells, self.format_row(item)):
+            self.canvas.itemconfigure(cell, text=text)
+
+
+class MutationPicker:
+    """
+    Mutation selection window, built on first open and hidden (not destroyed)
+    on close, so reopening only resets the search and redraws the visible rows.
+    """
+
+    def __init__(self, root, names, on_apply):
+        self.root = root
+        self.names = names
+        self.index = PrefixIndex(names)
+        self.on_apply = on_apply
+        self.selected = set()
+        self.win = None
+
+    def open(self, selected):
+        if self.win is None:
+            self._build()
+        self.selected = set(selected)
+        self.search_var.set("")
+        self._update_count()
+        self.win.deiconify()
+        self.win.lift()
+        self.win.grab_set()
+        self.search_entry.focus_set()
+
+    def _build(self):
+        self.win = tk.Toplevel(self.root)
+        self.win.withdraw()
+        self.win.title("Select Mutations")
+        self.win.configure(bg="#2b2b2b")
+        self.win.geometry("410x410")
+        self.win.transient(self.root)
+        self.win.protocol("WM_DELETE_WINDOW", self.close)
+        self.win.bind("<Escape>", lambda e: self.close())
+
+        search = tk.Frame(self.win, bg="#2b2b2b")
+        search.pack(fill="x", padx=10, pady=(10, 4))
+        tk.Label(search, text="🔍", bg="#2b2b2b", fg="white",
+                 font=("Segoe UI", 10)).pack(side="left", padx=(0, 4))
+        self.search_var = tk.StringVar()
+        self.search_entry = tk.Entry(search, textvariable=self.search_var,
+                                     font=("Segoe UI", 10), bg="#3c3c3c", fg="white",
+                                     insertbackground="white")
+        self.search_entry.pack(side="left", fill="x", expand=True)
+
+        bottom = tk.Frame(self.win, bg="#2b2b2b")
+        bottom.pack(side="bottom", fill="x", padx=10, pady=10)
+        self.count_label = tk.Label(bottom, text="", bg="#2b2b2b", fg="#FF9800",
+                                    font=("Segoe UI", 9, "italic"))
+        self.count_label.pack(side="left")
+        tk.Button(bottom, text="✔ Apply", bg="#4CAF50", fg="white",
+                  font=("Segoe UI", 10, "bold"), relief=tk.FLAT,
+                  command=self._apply).pack(side="right")
+        tk.Button(bottom, text="Clear", bg="#f44336", fg="white",
+                  font=("Segoe UI", 9, "bold"), relief=tk.FLAT,
+                  command=self._clear).pack(side="right", padx=(0, 6))
+
+        self.list = VirtualList(self.win, lambda name: name in self.selected, self._toggle)
+        self.list.pack(fill="both", expand=True, padx=10)
+
+        # Type-ahead: the list follows the search box; arrows and Enter work from it
+        self.search_var.trace_add("write", self._filter)
+        self.search_entry.bind("<Up>", lambda e: self.list.move(-1))
+        self.search_entry.bind("<Down>", lambda e: self.list.move(1))
+        self.search_entry.bind("<Prior>", lambda e: self.list.move(-self.list.page()))
+        self.search_entry.bind("<Next>", lambda e: self.list.move(self.list.page()))
+        self.search_entry.bind("<Return>", lambda e: self.list.toggle_active())
+
+    def _filter(self, *args):
+        self.list.set_items(self.index.search(self.search_var.get()))
+
+    def _toggle(self, name):
+        if name in self.selected:
+            self.selected.discard(name)
+        else:
+            self.selected.add(name)
+        self._update_count()
+
+    def _clear(self):
+        self.selected.clear()
+        self._update_count()
+        self.list.refresh()
+
+    def _update_count(self):
+        self.count_label.config(text=f"{len(self.selected)} selected")
+
+    def _apply(self):
+        self.on_apply([name for name in self.names if name in self.selected])
+        self.close()
+
+    def close(self):
+        self.win.grab_release()
+        self.win.withdraw()
+
+
+class BackgroundWorker:
+    """
+    Runs jobs on a daemon thread and hands results back to the Tk thread,
+    which polls for them with root.after while jobs are outstanding. A job
+    submitted under a key supersedes the earlier ones under that key: they
+    are skipped if they haven't started and their results are dropped.
+    """
+    POLL_MS = 16
+
+    def __init__(self, root):
+        self.root = root
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.generations = {}
+        self.pending = 0
+        self.poll_id = None
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, key, func, on_done, on_error=None, on_progress=None):
+        # With on_progress, func gets a report(value) callable; it returns False
+        # once the job is superseded, so long jobs can stop early
+        gen = self.generations.get(key, 0) + 1
+        self.generations[key] = gen
+        self.pending += 1
+        self.jobs.put((key, gen, func, on_done, on_error, on_progress))
+        if self.poll_id is None:
+            self.poll_id = self.root.after(self.POLL_MS, self._poll)
+
+    def cancel(self, key):
+        self.generations[key] = self.generations.get(key, 0) + 1
+
+    def is_current(self, key, gen):
+        return self.generations.get(key) == gen
+
+    def _report(self, key, gen, on_progress, value):
+        if not self.is_current(key, gen):
+            return False
+        self.results.put((key, gen, on_progress, value, False))
+        return True
+
+    def _run(self):
+        while True:
+            key, gen, func, on_done, on_error, on_progress = self.jobs.get()
+            if not self.is_current(key, gen):
+                self.results.put((key, gen, None, None, True))
+                continue
+            args = ()
+            if on_progress is not None:
+                args = (lambda value: self._report(key, gen, on_progress, value),)
+            try:
+                result, callback = func(*args), on_done
+            except Exception as e:
+                result, callback = e, on_error
+            self.results.put((key, gen, callback, result, True))
+
+    def _poll(self):
+        while True:
+            try:
+                key, gen, callback, value, finished = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if finished:
+                self.pending -= 1
+            if callback is not None and self.is_current(key, gen):
+                callback(value)
+        self.poll_id = self.root.after(self.POLL_MS, self._poll) if self.pending else None
+
+
+class InventoryParser:
+    """
+    Reads inventory rows from CSV or spreadsheet text (tab separated) into
+    (plant, variant, weight, mutations, amount) tuples. A header row may name
+    the columns in any order; otherwise they're taken in that order. Names
+    match case-insensitively, and mutations in one cell are split on ; | + or ,
+    """
+    COLUMNS = ("plant", "variant", "weight", "mutations", "amount")
+    ALIASES = {"plant name": "plant", "name": "plant", "kg": "weight", "weight (kg)": "weight",
+               "mutation": "mutations", "qty": "amount", "quantity": "amount", "count": "amount"}
+
+    def __init__(self, calculator, first_line):
+        self.plants = {name.lower(): name for name in calculator.plants}
+        self.variants = {name.lower(): name for name in calculator.variants}
+        self.mutations = {name.lower(): name for name in calculator.mutations}
+        self.delimiter = "\t" if "\t" in first_line else ","
+        cells = next(csv.reader([first_line], delimiter=self.delimiter), [])
+        titles = [self.ALIASES.get(c.strip().lower(), c.strip().lower()) for c in cells]
+        self.has_header = "plant" in titles
+        if self.has_header:
+            self.index = {title: i for i, title in reversed(list(enumerate(titles))) if title in self.COLUMNS}
+        else:
+            self.index = {title: i for i, title in enumerate(self.COLUMNS)}
+
+    def parse(self, cells):
+        """Returns (row, None), (None, error), or (None, None) for a blank line."""
+        def cell(column):
+            i = self.index.get(column)
+            return cells[i].strip() if i is not None and i < len(cells) else ""
+
+        plant_text = cell("plant")
+        if not plant_text:
+            return None, None
+        plant = self.plants.get(plant_text.lower())
+        if plant is None:
+            return None, f"Unknown plant: {plant_text}"
+        variant_text = cell("variant") or "Normal"
+        variant = self.variants.get(variant_text.lower())
+        if variant is None:
+            return None, f"Unknown variant: {variant_text}"
+        try:
+            weight = float(cell("weight"))
+            amount = int(cell("amount") or 1)
+        except ValueError:
+            return None, f"Invalid weight or amount: {cell('weight')!r}, {cell('amount')!r}"
+        if not math.isfinite(weight) or weight <= 0 or amount < 1:
+            return None, "Weight must be a finite number greater than 0 and amount at least 1"
+        mutations = []
+        for text in re.split(r"[;|+,]", cell("mutations")):
+            text = text.strip()
+            if text:
+                name = self.mutations.get(text.lower())
+                if name is None:
+                    return None, f"Unknown mutation: {text}"
+                mutations.append(name)
+        return (plant, variant, weight, mutations, amount), None
+
+
+class BatchWindow:
+    """
+    Values a whole inventory pasted from the clipboard or imported from a
+    CSV file. Parsing and valuation run in chunks on a worker thread with
+    progress, and the rows land in a sortable VirtualTable, so even 100k
+    rows never hold up the UI.
+    """
+    CHUNK = 5000
+    COLUMNS = [("Plant", 140, "w"), ("Variant", 70, "w"), ("Weight", 70, "e"),
+               ("Mutations", 240, "w"), ("Amount", 60, "e"), ("Value", 85, "e"), ("Total", 95, "e")]
+    # Rows are (plant, variant, weight, mutations, amount, value, total); error rows
+    # keep the plant as entered, the message as mutations, and None for the numbers
+    NUMERIC = (2, 4, 5, 6)
+
+    def __init__(self, root, calculator):
+        self.root = root
+        self.calculator = calculator
+        self.worker = BackgroundWorker(root)
+        self.records = []
+        self.sort_col = None
+        self.sort_reverse = False
+        self.win = None
+
+    def open(self):
+        if self.win is None:
+            self._build()
+        self.win.deiconify()
+        self.win.lift()
+
+    def _build(self):
+        self.win = tk.Toplevel(self.root)
+        self.win.title("Batch Valuation")
+        self.win.configure(bg="#2b2b2b")
+        self.win.geometry("800x520")
+        self.win.protocol("WM_DELETE_WINDOW", self.win.withdraw)
+
+        bar = tk.Frame(self.win, bg="#2b2b2b")
+        bar.pack(fill="x", padx=10, pady=(10, 4))
+        for text, command in (("📂 Import CSV", self._import_csv), ("📋 Paste", self._paste)):
+            tk.Button(bar, text=text, command=command, bg="#4CAF50", fg="white",
+                      font=("Segoe UI", 9, "bold"), relief=tk.FLAT, padx=8, pady=1
+                      ).pack(side="left", padx=(0, 6))
+        tk.Button(bar, text="✖ Cancel", command=self._cancel, bg="#f44336", fg="white",
+                  font=("Segoe UI", 9, "bold"), relief=tk.FLAT, padx=8, pady=1).pack(side="left")
+        self.progress = ttk.Progressbar(bar, mode="determinate", length=200)
+        self.progress.pack(side="right")
+
+        self.status = tk.Label(self.win, text="Paste rows of: plant, variant, weight, mutations, amount",
+                               bg="#2b2b2b", fg="#FF9800", font=("Segoe UI", 9, "italic"), anchor="w")
+        self.status.pack(side="bottom", fill="x", padx=10, pady=(4, 10))
+
+        self.table = VirtualTable(self.win, self.COLUMNS, self._format_row, self._sort)
+        self.table.pack(fill="both", expand=True, padx=10)
+
+    def _format_row(self, row):
+        plant, variant, weight, mutations, amount, value, total = row
+        if len(mutations) > 38:
+            mutations = mutations[:37] + "…"
+        if weight is None:
+            return plant, variant, "", mutations, "", "", ""
+        return plant, variant, f"{weight:g}", mutations, f"{amount:,}", f"{value:,}", f"{total:,}"
+
+    def _import_csv(self):
+        path = filedialog.askopenfilename(parent=self.win, title="Import Inventory",
+                                          filetypes=[("CSV files", "*.csv *.tsv *.txt"), ("All files", "*.*")])
+        if path:
+            self._start(lambda: self._read_file(path))
+
+    @staticmethod
+    def _read_file(path):
+        with open(path, encoding="utf-8-sig") as f:
+            return f.read()
+
+    def _paste(self):
+        try:
+            text = self.root.clipboard_get()
+        except tk.TclError:
+            messagebox.showwarning("Warning", "The clipboard has no text to import.", parent=self.win)
+            return
+        self._start(lambda: text)
+
+    def _start(self, load):
+        self.worker.cancel("sort")
+        self.progress.configure(value=0, maximum=1)
+        self.status.config(text="Reading…")
+        self.worker.submit("batch", lambda report: self._value(load(), report),
+                           self._on_done, self._on_error, on_progress=self._on_progress)
+
+    def _cancel(self):
+        self.worker.cancel("batch")
+        self.progress.configure(value=0)
+        self.status.config(text="Cancelled")
+
+    def _value(self, text, report):
+        # Worker thread: parse and value CHUNK lines at a time, reporting after each
+        lines = text.splitlines()
+        parser = InventoryParser(self.calculator, lines[0] if lines else "")
+        start = 1 if parser.has_header else 0
+        records = []
+        totals = {"rows": 0, "fruits": 0, "errors": 0, "value": 0}
+        for first in range(start, len(lines), self.CHUNK):
+            rows, slots = [], []
+            chunk = csv.reader(lines[first:first + self.CHUNK], delimiter=parser.delimiter)
+            for line_no, cells in enumerate(chunk, start=first + 1):
+                row, error = parser.parse(cells)
+                if error:
+                    records.append(("", "", None, f"⚠ Line {line_no}: {error}", None, None, None))
+                    totals["errors"] += 1
+                elif row:
+                    slots.append(len(records))
+                    records.append(None)
+                    rows.append(row)
+            for slot, row, result in zip(slots, rows, self.calculator.calculate_batch(rows)):
+                plant, variant, weight, mutations, amount = row
+                if "error" in result:
+                    records[slot] = (plant, variant, None, f"⚠ {result['error']}", None, None, None)
+                    totals["errors"] += 1
+                    continue
+                records[slot] = (plant, variant, weight, ", ".join(mutations) or "None",
+                                 amount, result["final_value"], result["total_value"])
+                totals["rows"] += 1
+                totals["fruits"] += amount
+                totals["value"] += result["total_value"]
+            if not report((first + self.CHUNK, len(lines))):
+                return None
+        return records, totals
+
+    def _on_progress(self, value):
+        done, total = value
+        done = min(done, total)
+        self.progress.configure(value=done, maximum=max(total, 1))
+        self.status.config(text=f"Valuing {done:,} / {total:,} lines…")
+
+    def _on_done(self, result):
+        self.records, totals = result
+        self.worker.cancel("sort")
+        self.sort_col, self.sort_reverse = None, False
+        self.table.set_sort_indicator(None, False)
+        self.table.set_items(self.records)
+        self.progress.configure(value=self.progress["maximum"])
+        self.status.config(text=(
+            f"{totals['rows']:,} rows · {totals['fruits']:,} fruits · "
+            f"{totals['errors']:,} errors · 💰 Total value: {totals['value']:,}"
+        ))
+
+    def _on_error(self, e):
+        self.progress.configure(value=0)
+        self.status.config(text="Import failed")
+        messagebox.showerror("Error", f"Batch valuation failed: {e}", parent=self.win)
+
+    def _sort(self, col):
+        if col is None or not self.records:
+            return
+        if col == self.sort_col:
+            reverse = not self.sort_reverse
+        else:
+            reverse = col in self.NUMERIC  # biggest first for numbers
+        self.sort_col, self.sort_reverse = col, reverse
+        self.table.set_sort_indicator(col, reverse)
+        records = self.records
+
+        def job():
+            # Error rows have no numbers to sort by; keep them at the end
+            rows = [r for r in records if r[2] is not None]
+            rows.sort(key=itemgetter(col), reverse=reverse)
+            return rows + [r for r in records if r[2] is None]
+
+        self.worker.submit("sort", job, self.table.set_items)
+
+
 class GrowCalculatorUI:
+    # Live results wait for typing to pause this long
+    RECALC_DELAY_MS = 150
+
     def __init__(self):
         try:
             self.calculator = PlantCalculator()
@@ -13,8 +610,10 @@ class GrowCalculatorUI:
             messagebox.showerror("Initialization Error", f"Failed to initialize calculator: {e}")
             raise SystemExit
         self.selected_mutations = []
-        self.mutation_vars_popup = {}
+        self.mutation_picker = None
         self.collapsed_height = 360
+        self.recalc_id = None
+        self.batch_window = None
 
 
         self._build_ui()
@@ -25,6 +624,7 @@ class GrowCalculatorUI:
         self.root.configure(bg="#2b2b2b")
         self.root.geometry(f"480x{self.collapsed_height}")
         self.root.minsize(480, 360)
+        self.worker = BackgroundWorker(self.root)
 
         self.root.grid_rowconfigure(0, weight=1)
         self.root.grid_columnconfigure(0, weight=1)
@@ -69,10 +669,12 @@ class GrowCalculatorUI:
         tk.Label(self.main, text="Variant:", font=("Segoe UI", 10, "bold"),
                  bg="#2b2b2b", fg="white").grid(row=2, column=0, sticky="w", pady=0, padx=(0,2))
         self.variant_var = tk.StringVar(value="Normal")
+        self.variant_names = self._safe_get_variant_names()
         self.variant_combo = ttk.Combobox(self.main, textvariable=self.variant_var,
-                                         values=self._safe_get_variant_names(),
+                                         values=self.variant_names,
                                          state="readonly", width=20)
         self.variant_combo.grid(row=2, column=1, sticky="w", pady=0)
+        self.variant_combo.bind("<<ComboboxSelected>>", lambda e: self._recalculate())
 
         tk.Label(self.main, text="Mutations:", font=("Segoe UI", 10, "bold"),
                  bg="#2b2b2b", fg="white").grid(row=3, column=0, sticky="w", pady=0, padx=(0,2))
@@ -92,6 +694,7 @@ class GrowCalculatorUI:
                                      insertbackground="white", width=24)
         self.weight_entry.grid(row=4, column=1, sticky="w", pady=0)
         self.weight_var.trace("w", self._validate_weight)
+        self.weight_var.trace("w", self._schedule_recalc)
 
         self.range_label = tk.Label(self.main, text="",
                                     font=("Segoe UI", 9), bg="#2b2b2b", fg="#FF9800")
@@ -115,7 +718,11 @@ class GrowCalculatorUI:
         self.clear_btn = tk.Button(btns, text="🗑️  Clear All", command=self._clear_all,
                                    bg="#f44336", fg="white", font=("Segoe UI", 9, "bold"),
                                    relief=tk.FLAT, padx=8, pady=3, width=14)
-        self.clear_btn.pack(side="left")
+        self.clear_btn.pack(side="left", padx=(0, 6))
+        self.batch_btn = tk.Button(btns, text="📦  Batch", command=self._open_batch,
+                                   bg="#2196F3", fg="white", font=("Segoe UI", 9, "bold"),
+                                   relief=tk.FLAT, padx=8, pady=3, width=10)
+        self.batch_btn.pack(side="left")
 
         self.results = tk.Frame(self.main, bg="#3c3c3c", relief=tk.RAISED, bd=2)
         self.results.grid(row=9, column=0, columnspan=3, sticky="we", pady=(10, 0))
@@ -140,43 +747,23 @@ class GrowCalculatorUI:
             self.weight_var.set("0.5")
 
     def _open_mutations_popup(self):
-        win = tk.Toplevel(self.root)
-        win.title("Select Mutations")
-        win.configure(bg="#2b2b2b")
-        win.geometry("410x410")
-        win.transient(self.root)
-        win.grab_set()
-
-        frm = tk.Frame(win, bg="#2b2b2b")
-        frm.pack(fill="both", expand=True, padx=10, pady=10)
-
-        self.mutation_vars_popup = {}
-        names = self._safe_get_mutation_names()
-        if not names:
-            messagebox.showwarning("Warning", "No mutations available.")
-            win.destroy()
-            return
-
-        for i, name in enumerate(names):
-            r, c = divmod(i, 3)
-            v = tk.BooleanVar(value=(name in self.selected_mutations))
-            self.mutation_vars_popup[name] = v
-            tk.Checkbutton(frm, text=name, variable=v, bg="#2b2b2b", fg="white",
-                           selectcolor="#4CAF50", activebackground="#2b2b2b",
-                           activeforeground="white", font=("Segoe UI", 9)
-                           ).grid(row=r, column=c, sticky="w", padx=10, pady=4)
-
-        tk.Button(win, text="✔ Apply", bg="#4CAF50", fg="white",
-                  font=("Segoe UI", 10, "bold"), relief=tk.FLAT,
-                  command=lambda: self._apply_mutations(win)).pack(pady=10)
-
-        self.root.wait_window(win)
+        if self.mutation_picker is None:
+            names = self._safe_get_mutation_names()
+            if not names:
+                messagebox.showwarning("Warning", "No mutations available.")
+                return
+            self.mutation_picker = MutationPicker(self.root, names, self._apply_mutations)
+        self.mutation_picker.open(self.selected_mutations)
 
-    def _apply_mutations(self, popup):
-        self.selected_mutations = [n for n, v in self.mutation_vars_popup.items() if v.get()]
+    def _apply_mutations(self, names):
+        self.selected_mutations = names
         self._update_mutation_summary()
-        self._update_multiplier()
-        popup.destroy()
+        self._recalculate()
+
+    def _open_batch(self):
+        if self.batch_window is None:
+            self.batch_window = BatchWindow(self.root, self.calculator)
+        self.batch_window.open()
 
     def _update_mutation_summary(self):
         if not self.selected_mutations:
@@ -217,10 +804,9 @@ class GrowCalculatorUI:
             mn = round(base_w * 0.7, 4)
             mx = round(base_w * 1.4, 4)
             self.range_label.config(text=f"Expected: {mn} – {mx} kg")
-            self.variant_combo.configure(values=self._safe_get_variant_names())
-            if self.variant_var.get() not in self._safe_get_variant_names():
+            if self.variant_var.get() not in self.variant_names:
                 self.variant_var.set("Normal")
-        self._update_multiplier()
+        self._recalculate()
 
     def _clear_all(self):
         self.plant_var.set("Carrot")
@@ -228,59 +814,80 @@ class GrowCalculatorUI:
         self.weight_var.set("0.5")
         self.selected_mutations = []
         self._update_mutation_summary()
-        self._update_multiplier()
         self._hide_results()
         self._on_plant_changed()
 
-    def _update_multiplier(self):
-        try:
-            mult = self.calculator.calculate_mutation_multiplier(self.selected_mutations)
-            if mult == 0:
-                txt, color = "Total Multiplier: 0x (worthless)", "#f44336"
-            elif mult == 1.0:
-                txt, color = "Total Multiplier: 1.0x", "#4CAF50"
-            else:
-                txt, color = f"Total Multiplier: {mult:.1f}x", "#FF9800"
-            self.mult_label.config(text=txt, fg=color)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to calculate multiplier: {e}")
-            self.mult_label.config(text="Total Multiplier: Error", fg="#f44336")
+    def _schedule_recalc(self, *args):
+        if self.recalc_id is not None:
+            self.root.after_cancel(self.recalc_id)
+        self.recalc_id = self.root.after(self.RECALC_DELAY_MS, self._recalculate)
 
     def _calculate(self):
+        self._recalculate(show=True)
+
+    def _recalculate(self, show=False):
+        # Read the inputs here (Tk variables belong to this thread); compute on the worker
+        if self.recalc_id is not None:
+            self.root.after_cancel(self.recalc_id)
+            self.recalc_id = None
+        inputs = (self.plant_var.get(), self.variant_var.get(),
+                  self.weight_var.get(), list(self.selected_mutations))
+        self.worker.submit("calculate", lambda: self._compute(*inputs),
+                           lambda result: self._on_result(result, show),
+                           lambda e: self._on_calc_error(e, show))
+
+    def _compute(self, plant, variant, weight_text, muts):
+        m = self.calculator.calculate_mutation_multiplier(muts)
+        result = {"mult": m}
         try:
-            plant = self.plant_var.get()
-            variant = self.variant_var.get()
-            weight = float(self.weight_var.get())
-            if not plant or not variant:
-                messagebox.showerror("Error", "Please select a plant and variant.")
-                return
-            if weight <= 0:
-                messagebox.showerror("Error", "Weight must be greater than 0.")
-                return
-            if plant not in self.calculator.plants or variant not in self.calculator.variants:
-                messagebox.showerror("Error", "Invalid plant or variant selected.")
-                return
-
-            m = self.calculator.calculate_mutation_multiplier(self.selected_mutations)
+            weight = float(weight_text)
+        except ValueError as e:
+            result["error"] = f"Invalid input: {e}"
+            return result
+        if not plant or not variant:
+            result["error"] = "Please select a plant and variant."
+        elif weight <= 0:
+            result["error"] = "Weight must be greater than 0."
+        elif plant not in self.calculator.plants or variant not in self.calculator.variants:
+            result["error"] = "Invalid plant or variant selected."
+        else:
             value = 0 if m == 0 else self.calculator.calculate_plant_value(plant, variant, weight, m)
+            result["text"] = self._format_results(plant, variant, weight, muts, m, value)
+        return result
+
+    def _on_result(self, result, show):
+        self._update_multiplier(result["mult"])
+        if "error" in result:
+            if show:
+                messagebox.showerror("Error", result["error"])
+            return
+        # Once shown, results follow the inputs live
+        if show or self.results.winfo_ismapped():
+            self._show_results(result["text"], expand=show)
 
-            self._show_results(plant, variant, weight, self.selected_mutations, m, value)
-
-        except ValueError as e:
-            messagebox.showerror("Error", f"Invalid input: {e}")
-        except Exception as e:
+    def _on_calc_error(self, e, show):
+        self.mult_label.config(text="Total Multiplier: Error", fg="#f44336")
+        if show:
             messagebox.showerror("Error", f"Calculation failed: {e}")
 
-    def _show_results(self, plant, variant, weight, muts, m_mult, value):
-        try:
-            base_price = self.calculator.plants[plant]["base_price"]
-            base_weight = self.calculator.plants[plant]["base_weight"]
-            v_mult = self.calculator.variants[variant]["multiplier"]
-            growth = weight / base_weight
-            clamped = max(0.95, growth)
-            g_mult = clamped ** 2
-
-            txt = f"""🌱 PLANT CALCULATION RESULTS
+    def _update_multiplier(self, mult):
+        if mult == 0:
+            txt, color = "Total Multiplier: 0x (worthless)", "#f44336"
+        elif mult == 1.0:
+            txt, color = "Total Multiplier: 1.0x", "#4CAF50"
+        else:
+            txt, color = f"Total Multiplier: {mult:.1f}x", "#FF9800"
+        self.mult_label.config(text=txt, fg=color)
+
+    def _format_results(self, plant, variant, weight, muts, m_mult, value):
+        base_price = self.calculator.plants[plant]["base_price"]
+        base_weight = self.calculator.plants[plant]["base_weight"]
+        v_mult = self.calculator.variants[variant]["multiplier"]
+        growth = weight / base_weight
+        clamped = max(0.95, growth)
+        g_mult = clamped ** 2
+
+        return f"""🌱 PLANT CALCULATION RESULTS
 ========================================
 
 📋 INPUT PARAMETERS:
@@ -299,17 +906,17 @@ class GrowCalculatorUI:
 
 💰 FINAL VALUE: {value:,.2f}
 """
-            self.results_text.config(state="normal")
-            self.results_text.delete("1.0", "end")
-            self.results_text.insert("1.0", txt)
-            self.results_text.config(state="disabled")
 
+    def _show_results(self, txt, expand=True):
+        self.results_text.config(state="normal")
+        self.results_text.delete("1.0", "end")
+        self.results_text.insert("1.0", txt)
+        self.results_text.config(state="disabled")
+
+        if expand:
             self.results.grid()
             self._animate_expand_to_fit()
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to display results: {e}")
-
     def _hide_results(self):
         if self.results.winfo_ismapped():
             self.results.grid_remove()
@@ -0,0 +1,264 @@
+"""
+Admission control: per-client rate limits and per-route concurrency limits
+that shed excess load with a fast 429/503 and Retry-After instead of letting
+it queue up in the event loop.
+"""
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from typing import Deque, List, Optional
+
+import config
+from metrics import MetricsRegistry, Samples, metrics
+from services.cache import LRUCache
+
+# Queue wait buckets in seconds
+QUEUE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class TokenBucket:
+    """Refills rate tokens per second up to burst; each admitted request takes one."""
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, burst: float, now: float):
+        """Start full."""
+        self.tokens = burst
+        self.updated = now
+
+    def take(self, rate: float, burst: float, now: float) -> float:
+        """Take a token; returns 0 on success, else seconds until one is available."""
+        self.tokens = min(burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / rate
+
+
+class ConcurrencyLimiter:
+    """
+    At most limit requests run at once; up to queue_size more wait in FIFO
+    order, each for at most queue_timeout seconds. A released slot passes
+    straight to the next waiter. Used from one event loop, so no locking.
+    """
+
+    def __init__(self, limit: int, queue_size: int, queue_timeout: float):
+        """Initialize with no running or waiting requests."""
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        """Requests waiting for a slot."""
+        return len(self._waiters)
+
+    async def acquire(self) -> Optional[str]:
+        """Take a slot, waiting if needed. Returns None when admitted, else why not."""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return None
+        if len(self._waiters) >= self.queue_size or self.queue_timeout <= 0:
+            return "queue_full"
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+            return None
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # The slot was handed over as the wait timed out
+                return None
+            return "queue_timeout"
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+                self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        """Free a slot, handing it to the oldest waiter if there is one."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class AdmissionRule:
+    """Limits for one route: a token bucket per client and a shared concurrency limiter."""
+
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        path: str,
+        rate: float = 0,
+        burst: float = 0,
+        concurrency: int = 0,
+        queue: int = 0,
+        queue_timeout: float = 0,
+        max_clients: int = 10000
+    ):
+        """Initialize a rule; a zero rate or concurrency disables that limit."""
+        self.name = name
+        self.method = method.upper()
+        self.prefix = path[:-1] if path.endswith("*") else None
+        self.path = path
+        self.rate = float(rate)
+        self.burst = max(float(burst), 1.0)
+        self.buckets = LRUCache(max_size=max_clients)
+        self.limiter = ConcurrencyLimiter(concurrency, queue, queue_timeout) if concurrency > 0 else None
+
+    def matches(self, method: str, path: str) -> bool:
+        """Whether a request falls under this rule."""
+        if method != self.method:
+            return False
+        if self.prefix is not None:
+            return path.startswith(self.prefix)
+        return path == self.path
+
+    def check_rate(self, client: str) -> float:
+        """Take a token for client; returns 0 when allowed, else seconds to wait."""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        bucket = self.buckets.get(client)
+        if bucket is None:
+            bucket = TokenBucket(self.burst, now)
+            self.buckets.set(client, bucket)
+        return bucket.take(self.rate, self.burst, now)
+
+    def retry_after(self) -> int:
+        """Seconds a shed client should wait before retrying a full route."""
+        return max(1, math.ceil(self.limiter.queue_timeout)) if self.limiter else 1
+
+
+class AdmissionMiddleware:
+    """
+    Applies the first matching AdmissionRule to each HTTP request. Requests
+    over a client's rate get 429; requests that find the route's queue full,
+    or wait in it past the timeout, get 503. Both carry Retry-After and are
+    counted in growcalc_admission_shed_total.
+    """
+
+    def __init__(
+        self,
+        app,
+        rules: Optional[List[AdmissionRule]] = None,
+        client_header: str = "",
+        registry: Optional[MetricsRegistry] = None
+    ):
+        """Wrap app with rules (the configured ones by default)."""
+        self.app = app
+        self.rules = rules if rules is not None else rules_from_config()
+        self.client_header = client_header.lower().encode("latin-1")
+        registry = registry or metrics
+        self._shed = registry.counter(
+            "growcalc_admission_shed_total", "Requests rejected by admission control", ("rule", "reason")
+        )
+        self._queue_seconds = registry.histogram(
+            "growcalc_admission_queue_seconds", "Time admitted requests waited for a slot",
+            ("rule",), buckets=QUEUE_BUCKETS
+        )
+        registry.register_callback(
+            "growcalc_admission_active", "Requests running under each admission rule",
+            "gauge", self._active_samples
+        )
+        registry.register_callback(
+            "growcalc_admission_queued", "Requests waiting for a slot under each admission rule",
+            "gauge", self._queued_samples
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rule = self._match(scope["method"], scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        wait = rule.check_rate(self._client(scope))
+        if wait:
+            self._shed.inc(rule.name, "rate_limited")
+            await self._reject(send, 429, "Too many requests", math.ceil(wait))
+            return
+
+        if rule.limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        refused = await rule.limiter.acquire()
+        if refused:
+            self._shed.inc(rule.name, refused)
+            await self._reject(send, 503, "Server busy, try again shortly", rule.retry_after())
+            return
+        self._queue_seconds.observe(time.perf_counter() - start, rule.name)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            rule.limiter.release()
+
+    def _match(self, method: str, path: str) -> Optional[AdmissionRule]:
+        """First rule matching the request, if any."""
+        for rule in self.rules:
+            if rule.matches(method, path):
+                return rule
+        return None
+
+    def _client(self, scope: dict) -> str:
+        """Client address: the configured header's first entry, else the peer address."""
+        if self.client_header:
+            for name, value in scope["headers"]:
+                if name == self.client_header:
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else ""
+
+    @staticmethod
+    async def _reject(send, status: int, detail: str, retry_after: int) -> None:
+        """Send a JSON error shaped like FastAPI's, with Retry-After."""
+        body = json.dumps({"detail": detail}, separators=(",", ":")).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(retry_after).encode("latin-1")),
+                (b"cache-control", b"no-store"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    def _active_samples(self) -> Samples:
+        """Running requests per rule with a concurrency limit."""
+        return [({"rule": rule.name}, rule.limiter.active) for rule in self.rules if rule.limiter]
+
+    def _queued_samples(self) -> Samples:
+        """Waiting requests per rule with a concurrency limit."""
+        return [({"rule": rule.name}, rule.limiter.waiting) for rule in self.rules if rule.limiter]
+
+
+def rules_from_config() -> List[AdmissionRule]:
+    """Rules from config.ADMISSION_RULES, most specific paths first."""
+    rules = [
+        AdmissionRule(name, max_clients=config.ADMISSION_MAX_CLIENTS, **settings)
+        for name, settings in config.ADMISSION_RULES.items()
+    ]
+    # Exact paths before prefixes, longer prefixes before shorter ones
+    rules.sort(key=lambda rule: (rule.prefix is not None, -len(rule.path)))
+    return rules
@@ -0,0 +1,229 @@
+"""
+Static asset manifest: fingerprinted URLs, plant image resolution and a static
+file handler that serves built assets with immutable caching and precompression.
+"""
+import json
+import logging
+import mimetypes
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import quote
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).parent / "static"
+DIST_DIR = STATIC_DIR / "dist"
+MANIFEST_FILE = DIST_DIR / "manifest.json"
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Precompressed sidecar extensions, in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _normalize(name: str) -> str:
+    """Reduce a plant name or image stem to lowercase letters and digits."""
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def _legacy_slug(plant_name: str) -> str:
+    """The filename stem the front end used to guess for a plant."""
+    return "crop-" + plant_name.lower().replace(" ", "-").replace("'", "")
+
+
+def index_images(img_dir: Path) -> Dict[str, List[str]]:
+    """Group image filenames in img_dir by normalized stem, minus any "crop-" prefix."""
+    candidates: Dict[str, List[str]] = {}
+    for filename in sorted(os.listdir(img_dir)):
+        stem, ext = os.path.splitext(filename)
+        if ext.lower() not in (".webp", ".png"):
+            continue
+        if stem.startswith("crop-"):
+            stem = stem[len("crop-"):]
+        candidates.setdefault(_normalize(stem), []).append(filename)
+    return candidates
+
+
+def pick_plant_image(plant_name: str, candidates: Dict[str, List[str]]) -> Optional[str]:
+    """
+    Pick the image file for a plant from index_images() output, or None.
+    Files are matched on their normalized stem, so "crop-fossilight.webp" and
+    "FlareMelon.webp" resolve. When several files match (e.g. "crop-moon-flower"
+    and "crop-moonflower"), the legacy slug wins, then crop- files, then .webp.
+    """
+    matches = candidates.get(_normalize(plant_name))
+    if not matches:
+        return None
+    slug = _legacy_slug(plant_name)
+    return min(
+        matches,
+        key=lambda filename: (
+            os.path.splitext(filename)[0] != slug,
+            not filename.startswith("crop-"),
+            not filename.endswith(".webp"),
+            len(filename),
+            filename
+        )
+    )
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """
+    Map each coding in an Accept-Encoding header to its q-value (1.0 when
+    unspecified). Malformed q-values count as 0, so they never select a coding.
+    """
+    weights = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+                if not 0.0 <= q <= 1.0:
+                    q = 0.0
+        weights[coding] = q
+    return weights
+
+
+def choose_encoding(header: str, available: Iterable[str]) -> Optional[str]:
+    """
+    Pick the precompressed coding to serve for an Accept-Encoding header, or
+    None for the identity file. The client's highest q-value wins, ties go to
+    ENCODINGS order, and codings with q=0 (explicitly or via "*;q=0") are refused.
+    """
+    weights = parse_accept_encoding(header)
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding, _ in ENCODINGS:
+        if encoding not in available:
+            continue
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def resolve_plant_images(plant_names: Iterable[str], img_dir: Path) -> Dict[str, Optional[str]]:
+    """Map each plant name to an image file in img_dir, or None if it has none."""
+    candidates = index_images(img_dir)
+    return {name: pick_plant_image(name, candidates) for name in plant_names}
+
+
+class AssetManifest:
+    """Resolves asset URLs through the build manifest, falling back to source files."""
+
+    def __init__(self, manifest_file: Path = MANIFEST_FILE):
+        """Initialize without loading; the manifest is read on first use."""
+        self.manifest_file = manifest_file
+        self._manifest: Optional[dict] = None
+        self._image_index: Optional[Dict[str, List[str]]] = None
+
+    @property
+    def manifest(self) -> dict:
+        """The parsed manifest, or an empty one when assets haven't been built."""
+        if self._manifest is None:
+            try:
+                with open(self.manifest_file, "r", encoding="utf-8") as f:
+                    self._manifest = json.load(f)
+                logger.info("Loaded asset manifest %s", self._manifest.get("version"))
+            except FileNotFoundError:
+                self._manifest = {}
+            except (OSError, ValueError) as e:
+                logger.error("Error loading asset manifest: %s", e)
+                self._manifest = {}
+        return self._manifest
+
+    def url(self, path: str) -> str:
+        """URL for a static file such as "js/main.js", fingerprinted when built."""
+        built = self.manifest.get("files", {}).get(path)
+        if built:
+            return f"/static/dist/{built}"
+        return f"/static/{path}"
+
+    def plant_image(self, plant_name: str) -> dict:
+        """
+        Image info for a plant: {"src": url, "sprite": {...} or None}. Sprite
+        entries give the atlas URL and CSS background-size/position percentages.
+        """
+        entry = self.manifest.get("plants", {}).get(plant_name)
+        if entry is not None:
+            return entry
+
+        if self._image_index is None:
+            self._image_index = index_images(STATIC_DIR / "img")
+        filename = pick_plant_image(plant_name, self._image_index)
+        src = f"/static/img/{quote(filename)}" if filename else "/static/img/placeholder.png"
+        return {"src": src, "sprite": None}
+
+    def precompressed(self, dist_path: str) -> List[str]:
+        """Content encodings available on disk for a built file."""
+        return self.manifest.get("precompressed", {}).get(dist_path, [])
+
+
+class AssetStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves built (fingerprinted) files under dist/ with
+    immutable caching and their precompressed .br/.gz variants when accepted.
+    """
+
+    def __init__(self, *args, manifest: AssetManifest, **kwargs):
+        """Initialize with the manifest describing the built files."""
+        super().__init__(*args, **kwargs)
+        self.asset_manifest = manifest
+        self.dist_dir = os.path.realpath(DIST_DIR)
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope,
+        status_code: int = 200
+    ) -> Response:
+        """Serve dist/ files immutably, preferring a precompressed variant."""
+        real_path = os.path.realpath(full_path)
+        if not real_path.startswith(self.dist_dir + os.sep):
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        request_headers = Headers(scope=scope)
+        dist_path = os.path.relpath(real_path, self.dist_dir).replace(os.sep, "/")
+        encoding = choose_encoding(
+            request_headers.get("accept-encoding", ""),
+            self.asset_manifest.precompressed(dist_path)
+        )
+
+        media_type = mimetypes.guess_type(real_path)[0] or "application/octet-stream"
+        headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+        serve_path = real_path
+        if encoding is not None:
+            serve_path = real_path + dict(ENCODINGS)[encoding]
+            stat_result = os.stat(serve_path)
+            headers["Content-Encoding"] = encoding
+
+        response = FileResponse(
+            serve_path,
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            method=scope["method"],
+            stat_result=stat_result
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+# Global manifest instance
+asset_manifest = AssetManifest()
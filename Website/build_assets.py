@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Static asset build script.
+Fingerprints scripts, styles and plant images into static/dist, packs plant
+thumbnails into sprite atlases and pre-compresses text assets, then writes
+static/dist/manifest.json for the app to resolve asset URLs from.
+
+Sprite atlases need Pillow and brotli variants need the brotli module (see
+requirements-build.txt). The build fails when either is missing unless that
+step is turned off with --no-sprites or --no-brotli.
+"""
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import logging
+import math
+import shutil
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+# Add the Website directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from assets import DIST_DIR, MANIFEST_FILE, STATIC_DIR, resolve_plant_images
+from services.calculator_service import calculator_service
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Text assets served from the manifest, relative to static/
+FINGERPRINTED_FILES = ["js/calculator-core.js", "js/main.js", "css/style.css"]
+
+# Extensions worth pre-compressing (images are already compressed)
+COMPRESSIBLE_SUFFIXES = {".js", ".css", ".json", ".svg"}
+
+# Sprite atlas layout: square cells, ATLAS_COLUMNS x ATLAS_COLUMNS per atlas
+SPRITE_CELL_SIZE = 96
+ATLAS_COLUMNS = 8
+
+
+def content_hash(data: bytes) -> str:
+    """Short content hash used in fingerprinted filenames."""
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def write_fingerprinted(relative_path: str, data: bytes) -> str:
+    """Write data to dist/ under a content-hashed name and return that name."""
+    path = Path(relative_path)
+    name = f"{path.stem}.{content_hash(data)}{path.suffix}"
+    output = DIST_DIR / path.parent / name
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_bytes(data)
+    return (path.parent / name).as_posix()
+
+
+def precompress(dist_path: str, brotli_variants: bool = True) -> List[str]:
+    """Write .br/.gz variants next to a built file; return the encodings written."""
+    source = DIST_DIR / dist_path
+    data = source.read_bytes()
+    encodings = []
+
+    if brotli_variants:
+        compressed = brotli.compress(data, quality=11)
+        if len(compressed) < len(data):
+            source.with_name(source.name + ".br").write_bytes(compressed)
+            encodings.append("br")
+
+    # mtime=0 keeps the output reproducible across builds
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(compressed) < len(data):
+        source.with_name(source.name + ".gz").write_bytes(compressed)
+        encodings.append("gzip")
+
+    return encodings
+
+
+def build_sprites(plant_files: Dict[str, str]) -> Dict[str, dict]:
+    """
+    Pack plant thumbnails into webp atlases. Returns sprite info per plant:
+    the atlas URL plus CSS background-size/position percentages, which keep
+    working at whatever size the thumbnail is displayed.
+    """
+    names = sorted(plant_files)
+    per_atlas = ATLAS_COLUMNS * ATLAS_COLUMNS
+    sprites = {}
+
+    for atlas_index in range(math.ceil(len(names) / per_atlas)):
+        batch = names[atlas_index * per_atlas:(atlas_index + 1) * per_atlas]
+        columns = min(ATLAS_COLUMNS, len(batch))
+        rows = math.ceil(len(batch) / columns)
+        atlas = Image.new(
+            "RGBA",
+            (columns * SPRITE_CELL_SIZE, rows * SPRITE_CELL_SIZE),
+            (0, 0, 0, 0)
+        )
+
+        for position, plant_name in enumerate(batch):
+            column, row = position % columns, position // columns
+            with Image.open(STATIC_DIR / "img" / plant_files[plant_name]) as image:
+                thumbnail = image.convert("RGBA")
+                thumbnail.thumbnail((SPRITE_CELL_SIZE, SPRITE_CELL_SIZE), Image.LANCZOS)
+            atlas.paste(
+                thumbnail,
+                (
+                    column * SPRITE_CELL_SIZE + (SPRITE_CELL_SIZE - thumbnail.width) // 2,
+                    row * SPRITE_CELL_SIZE + (SPRITE_CELL_SIZE - thumbnail.height) // 2
+                )
+            )
+            sprites[plant_name] = {
+                "size": f"{columns * 100}% {rows * 100}%",
+                "position": (
+                    f"{_percent(column, columns)}% {_percent(row, rows)}%"
+                ),
+            }
+
+        buffer = io.BytesIO()
+        atlas.save(buffer, "WEBP", quality=85, method=6)
+        dist_path = write_fingerprinted(f"sprites/plants-{atlas_index}.webp", buffer.getvalue())
+
+        for plant_name in batch:
+            sprites[plant_name]["atlas"] = f"/static/dist/{dist_path}"
+
+    return sprites
+
+
+def _percent(index: int, count: int) -> float:
+    """background-position percentage for a cell index along one axis."""
+    if count <= 1:
+        return 0
+    return round(index * 100 / (count - 1), 4)
+
+
+def build(sprites: bool = True, brotli_variants: bool = True) -> dict:
+    """
+    Build static/dist and return the manifest that was written. Raises
+    RuntimeError before writing anything if a requested step's package is missing.
+    """
+    missing_packages = []
+    if sprites and Image is None:
+        missing_packages.append("Pillow (or pass --no-sprites)")
+    if brotli_variants and brotli is None:
+        missing_packages.append("brotli (or pass --no-brotli)")
+    if missing_packages:
+        raise RuntimeError(
+            "Missing build dependencies: " + ", ".join(missing_packages)
+            + "; install requirements-build.txt"
+        )
+
+    if DIST_DIR.exists():
+        shutil.rmtree(DIST_DIR)
+    DIST_DIR.mkdir(parents=True)
+
+    files = {}
+    for relative_path in FINGERPRINTED_FILES:
+        files[relative_path] = write_fingerprinted(
+            relative_path, (STATIC_DIR / relative_path).read_bytes()
+        )
+
+    plant_names = [plant.name for plant in calculator_service.get_plants()]
+    plant_files = {
+        name: filename
+        for name, filename in resolve_plant_images(plant_names, STATIC_DIR / "img").items()
+        if filename is not None
+    }
+    missing = sorted(set(plant_names) - set(plant_files))
+    if missing:
+        logger.warning(f"No image found for {len(missing)} plants: {', '.join(missing)}")
+
+    plants = {}
+    for plant_name, filename in plant_files.items():
+        dist_path = write_fingerprinted(
+            f"img/{filename}", (STATIC_DIR / "img" / filename).read_bytes()
+        )
+        plants[plant_name] = {"src": f"/static/dist/{quote(dist_path)}", "sprite": None}
+    for plant_name in missing:
+        plants[plant_name] = {"src": "/static/img/placeholder.png", "sprite": None}
+
+    if sprites:
+        for plant_name, sprite in build_sprites(plant_files).items():
+            plants[plant_name]["sprite"] = sprite
+
+    precompressed = {}
+    for dist_path in sorted(files.values()):
+        if Path(dist_path).suffix in COMPRESSIBLE_SUFFIXES:
+            encodings = precompress(dist_path, brotli_variants)
+            if encodings:
+                precompressed[dist_path] = encodings
+
+    manifest = {
+        "files": files,
+        "plants": plants,
+        "precompressed": precompressed,
+        "missing_images": missing,
+    }
+    manifest["version"] = content_hash(json.dumps(manifest, sort_keys=True).encode("utf-8"))
+    MANIFEST_FILE.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    return manifest
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main build function."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--no-sprites", action="store_true", help="skip building sprite atlases"
+    )
+    parser.add_argument(
+        "--no-brotli", action="store_true", help="write gzip variants only"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        manifest = build(sprites=not args.no_sprites, brotli_variants=not args.no_brotli)
+        sprite_count = sum(1 for entry in manifest["plants"].values() if entry["sprite"])
+        logger.info(
+            f"Built assets {manifest['version']}: {len(manifest['files'])} files, "
+            f"{len(manifest['plants'])} plant images, {sprite_count} sprites, "
+            f"{len(manifest['precompressed'])} precompressed"
+        )
+        return 0
+    except Exception as e:
+        logger.error(f"Error building assets: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
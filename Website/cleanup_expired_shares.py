@@ -1,16 +1,21 @@
 #!/usr/bin/env python3
 """
-Cleanup script for expired shared results.
-This script can be run manually or scheduled to clean up expired shared results.
+Cleanup and maintenance script for the shared results database.
+Run without options to clean up expired shared results. With --maintenance
+(or individual options) it also backs up, vacuums, refreshes statistics and
+checks integrity, all without blocking the live database for long. This script can be run manually or scheduled.
 """
+import argparse
 import sys
 import os
 from pathlib import Path
+from typing import List, Optional
 
 # Add the Website directory to the Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from services.shared_results_service import shared_results_service
+from services.db_maintenance import DatabaseMaintenance
 import logging
 
 # Set up logging
@@ -21,29 +26,80 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Clean up and maintain the shared results database.")
+    parser.add_argument("--maintenance", action="store_true",
+                        help="run cleanup, vacuum, analyze and a quick integrity check")
+    parser.add_argument("--backup", metavar="PATH", help="write an online backup to PATH first")
+    parser.add_argument("--vacuum", action="store_true", help="incrementally vacuum free pages")
+    parser.add_argument("--convert-auto-vacuum", action="store_true",
+                        help="switch an older database to incremental auto_vacuum (one-off full VACUUM)")
+    parser.add_argument("--analyze", action="store_true", help="run ANALYZE and PRAGMA optimize")
+    parser.add_argument("--check", action="store_true", help="run PRAGMA quick_check")
+    parser.add_argument("--full-check", action="store_true", help="run the slower PRAGMA integrity_check")
+    parser.add_argument("--step-pages", type=int, default=256, help="pages per vacuum step")
+    parser.add_argument("--step-rows", type=int, default=500, help="expired rows deleted per step")
+    parser.add_argument("--sleep", type=float, default=0.05, help="seconds to pause between steps")
+    args = parser.parse_args(argv)
+
+    if args.maintenance:
+        args.vacuum = args.analyze = args.check = True
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
     """Main cleanup function."""
+    args = parse_args(argv)
+    maintenance = DatabaseMaintenance(
+        shared_results_service.db_path,
+        step_pages=args.step_pages,
+        step_rows=args.step_rows,
+        sleep=args.sleep
+    )
+
     try:
+        shared_results_service.init_database()
+
+        # Back up before anything is deleted
+        if args.backup:
+            logger.info(f"Backing up database to {args.backup}...")
+            maintenance.backup(args.backup)
+
         logger.info("Starting cleanup of expired shared results...")
-        
+
         # Get current stats
         stats_before = shared_results_service.get_database_stats()
         logger.info(f"Database stats before cleanup: {stats_before}")
-        
+
         # Clean up expired results
-        deleted_count = shared_results_service.cleanup_expired_results()
-        
+        deleted_count = maintenance.delete_expired()
+
         # Get stats after cleanup
         stats_after = shared_results_service.get_database_stats()
         logger.info(f"Database stats after cleanup: {stats_after}")
-        
+
         if deleted_count > 0:
             logger.info(f"Successfully cleaned up {deleted_count} expired shared results")
         else:
             logger.info("No expired results found to clean up")
-            
+
+        if args.vacuum or args.convert_auto_vacuum:
+            size_before = os.path.getsize(shared_results_service.db_path)
+            maintenance.incremental_vacuum(convert=args.convert_auto_vacuum)
+            size_after = os.path.getsize(shared_results_service.db_path)
+            logger.info(f"Database file size: {size_before} -> {size_after} bytes")
+
+        if args.analyze:
+            maintenance.optimize()
+
+        if args.check or args.full_check:
+            if not maintenance.integrity_check(full=args.full_check):
+                logger.error("Integrity check failed")
+                return 2
+
         return 0
-        
+
     except Exception as e:
         logger.error(f"Error during cleanup: {e}")
         return 1
@@ -0,0 +1,149 @@
+"""
+Runtime settings for the GrowCalculator application, read from environment variables.
+"""
+import json
+import os
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean flag such as "1", "true" or "off"."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting, falling back to default when unset or invalid."""
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting, falling back to default when unset or invalid."""
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_json(name: str, default):
+    """Read a JSON setting, falling back to default when unset or invalid."""
+    try:
+        return json.loads(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+# Encode /api/calculate results straight to JSON bytes, skipping response-model
+# validation. The engine output already matches CalculationResponse.
+FAST_RESPONSES = _env_bool("GROWCALC_FAST_RESPONSES", True)
+
+# Directory for runtime state (the shared results database and the cache
+# warm-up snapshot) unless their own settings say otherwise. Defaults to the
+# Website directory, whatever the working directory is.
+DATA_DIR = os.environ.get("GROWCALC_DATA_DIR", os.path.dirname(os.path.abspath(__file__)))
+
+# SQLite database holding shared results
+SHARED_RESULTS_DB = os.environ.get("GROWCALC_DB_PATH", os.path.join(DATA_DIR, "shared_results.db"))
+
+# Maximum number of memoized /api/calculate results per worker (0 disables)
+CALCULATION_CACHE_SIZE = _env_int("GROWCALC_CALC_CACHE_SIZE", 10000)
+
+# Maximum number of shared results (and their rendered pages) cached per worker
+SHARE_CACHE_SIZE = _env_int("GROWCALC_SHARE_CACHE_SIZE", 1000)
+
+# Seconds a cached share is served before it is re-checked in the database, so
+# deletions made through other workers show within this window (0 checks every hit)
+SHARE_CACHE_REVALIDATE = _env_float("GROWCALC_SHARE_CACHE_REVALIDATE", 5.0)
+
+# Largest inventory body accepted by /api/calculate/stream; enforced as the body
+# streams in (413 up front when Content-Length already exceeds it)
+INVENTORY_MAX_BYTES = _env_int("GROWCALC_INVENTORY_MAX_BYTES", 32 * 1024 * 1024)
+
+# Token required in the X-Admin-Token header for admin endpoints such as the
+# shared-result export (unset disables them)
+ADMIN_TOKEN = os.environ.get("GROWCALC_ADMIN_TOKEN", "")
+
+# Startup cache pre-warming: a snapshot of the hottest cache keys is saved at
+# shutdown and replayed in the background at startup for up to the time budget.
+# A snapshot saved under another data version is ignored.
+WARM_SNAPSHOT_FILE = os.environ.get("GROWCALC_WARM_SNAPSHOT_FILE", os.path.join(DATA_DIR, "cache_snapshot.json"))
+WARM_SNAPSHOT_SIZE = _env_int("GROWCALC_WARM_SNAPSHOT_SIZE", 2000)
+WARM_TIME_BUDGET = _env_float("GROWCALC_WARM_TIME_BUDGET", 5.0)
+
+# Name of a shared-memory cache that backs the per-process calculation caches
+# across all workers on the host (empty disables), and its result slot count
+SHARED_CACHE_NAME = os.environ.get("GROWCALC_SHARED_CACHE", "")
+SHARED_CACHE_SLOTS = _env_int("GROWCALC_SHARED_CACHE_SLOTS", 65536)
+
+# Record request/cache/database metrics and serve them at /metrics (Prometheus
+# text format). When a token is set, scrapers must send "Authorization: Bearer <token>"
+METRICS_ENABLED = _env_bool("GROWCALC_METRICS", True)
+METRICS_TOKEN = os.environ.get("GROWCALC_METRICS_TOKEN", "")
+
+# Send a Server-Timing header (parse, endpoint, calc, db, render, serialize, total)
+# with every response
+SERVER_TIMING = _env_bool("GROWCALC_SERVER_TIMING", True)
+
+# Admission control: each rule limits requests matching its method and path
+# ("*" suffix for a prefix) with a per-client token bucket (rate per second,
+# burst) and a per-worker concurrency limit with a bounded wait queue. Over the
+# rate gets 429, a full queue or a queue wait over queue_timeout seconds gets
+# 503, both with Retry-After. 0 disables a limit. GROWCALC_ADMISSION_LIMITS
+# overrides fields per rule, e.g. {"share_create": {"rate": 2, "concurrency": 8}},
+# or for every rule under "*". Off by default: clients are keyed by address, so
+# behind a proxy it also needs GROWCALC_ADMISSION_CLIENT_HEADER (below)
+ADMISSION_ENABLED = _env_bool("GROWCALC_ADMISSION", False)
+ADMISSION_RULES = {
+    "calculate": {
+        "method": "POST", "path": "/api/calculate",
+        "rate": 20, "burst": 60, "concurrency": 64, "queue": 128, "queue_timeout": 0.5
+    },
+    "calculate_stream": {
+        "method": "POST", "path": "/api/calculate/stream",
+        "rate": 0.5, "burst": 3, "concurrency": 4, "queue": 4, "queue_timeout": 2.0
+    },
+    "share_create": {
+        "method": "POST", "path": "/api/share",
+        "rate": 1, "burst": 10, "concurrency": 4, "queue": 16, "queue_timeout": 1.0
+    },
+    "share_bulk": {
+        "method": "POST", "path": "/api/share/bulk",
+        "rate": 0.2, "burst": 2, "concurrency": 2, "queue": 4, "queue_timeout": 2.0
+    },
+    "share_view": {
+        "method": "GET", "path": "/share/*",
+        "rate": 10, "burst": 30, "concurrency": 32, "queue": 64, "queue_timeout": 1.0
+    },
+}
+_admission_overrides = _env_json("GROWCALC_ADMISSION_LIMITS", {})
+if isinstance(_admission_overrides, dict):
+    for _name, _rule in ADMISSION_RULES.items():
+        for _key in ("*", _name):
+            if isinstance(_admission_overrides.get(_key), dict):
+                _rule.update(_admission_overrides[_key])
+
+# Request header carrying the client address when behind a proxy, e.g.
+# "x-forwarded-for" (first address is used); empty uses the connection's address,
+# which behind a proxy is the proxy's, putting every user in one bucket
+ADMISSION_CLIENT_HEADER = os.environ.get("GROWCALC_ADMISSION_CLIENT_HEADER", "").lower()
+
+# Most clients tracked per rule; the least recently seen are forgotten first
+ADMISSION_MAX_CLIENTS = _env_int("GROWCALC_ADMISSION_MAX_CLIENTS", 10000)
+
+# Logging: records are sampled and rate-capped per message type, queued, and
+# written by a background thread as text or JSON lines ("json"). Sample rates
+# (0-1) apply below WARNING and are keyed by event name (e.g. "share_created")
+# or logger name; the rate limit caps each message type in records per second
+LOG_LEVEL = os.environ.get("GROWCALC_LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.environ.get("GROWCALC_LOG_FORMAT", "text").lower()
+LOG_SAMPLE_RATES = _env_json("GROWCALC_LOG_SAMPLING", {
+    "share_created": 0.1,
+    "share_deleted": 0.1,
+    "share_expired": 0.1,
+})
+LOG_RATE_LIMIT = _env_float("GROWCALC_LOG_RATE_LIMIT", 50)
+LOG_QUEUE_SIZE = _env_int("GROWCALC_LOG_QUEUE_SIZE", 10000)
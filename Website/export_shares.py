@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Export script for active shared results.
+Streams every unexpired shared result as NDJSON or CSV, reading the live
+database in keyset-paginated batches without blocking the app's writes.
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+# Add the Website directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import config
+from services.shared_results_service import SharedResultsService
+from services.share_export import EXPORT_FORMATS, export_chunks
+import logging
+
+# Set up logging (to stderr, so stdout carries only the export)
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main export function."""
+    parser = argparse.ArgumentParser(description="Export active shared results.")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson", help="output format")
+    parser.add_argument("--output", "-o", help="output file (default: stdout)")
+    parser.add_argument("--db", default=config.SHARED_RESULTS_DB, help="database path")
+    parser.add_argument("--batch-size", type=int, default=500, help="rows fetched per query")
+    args = parser.parse_args(argv)
+
+    try:
+        service = SharedResultsService(args.db)
+        output = open(args.output, "wb") if args.output else sys.stdout.buffer
+        try:
+            for chunk in export_chunks(service.iter_active_results(args.batch_size), args.format):
+                output.write(chunk)
+        finally:
+            if args.output:
+                output.close()
+        logger.info(f"Exported active shared results from {args.db}")
+        return 0
+
+    except Exception as e:
+        logger.error(f"Error exporting shared results: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
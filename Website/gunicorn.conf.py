@@ -0,0 +1,33 @@
+"""
+Gunicorn settings for preforked production workers:
+
+    gunicorn -c gunicorn.conf.py [-w 4] [--bind 0.0.0.0:8000]
+
+The app is built once in the master, and the read-only catalog is loaded and
+frozen there before any worker forks (see main.prefork), so workers share those
+pages instead of each loading a copy. Each worker then runs the app's lifespan:
+shared-memory tables, database setup and cache warm-up happen per worker.
+"""
+import gc
+import os
+
+wsgi_app = "main:create_app()"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.environ.get("WEB_CONCURRENCY", 4))
+bind = os.environ.get("GROWCALC_BIND", "0.0.0.0:8000")
+preload_app = True
+
+# Don't collect while the master imports the app: a collection would only
+# churn pages that are about to be shared with the workers
+gc.disable()
+
+
+def when_ready(server):
+    """Load and freeze the read-only data after preloading, before the first fork."""
+    import main
+    main.prefork()
+
+
+def post_fork(server, worker):
+    """Collect normally in each worker; frozen objects stay out of its reach."""
+    gc.enable()
@@ -0,0 +1,274 @@
+"""
+Non-blocking log pipeline: records are filtered (sampled and rate-capped per
+message type) in the logging thread, queued, and formatted and written by a
+background listener, so a slow sink never stalls a request.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Iterable, Optional, TextIO
+
+from metrics import metrics
+
+# Records that never reached the sink, by reason (sampled, rate_limited, queue_full)
+LOG_RECORDS_DROPPED = metrics.counter(
+    "growcalc_log_records_dropped_total", "Log records dropped before reaching the sink", ("reason",)
+)
+
+# Loggers that get their own handlers elsewhere (uvicorn) but should go through the pipeline
+ROUTED_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+# Loggers whose records aren't rate-capped: every access line shares one message
+# template, so a cap would limit all requests together. Sample them instead.
+RATE_LIMIT_EXEMPT_LOGGERS = ("uvicorn.access",)
+
+# Message types tracked by a SamplingFilter; the least recently seen are
+# forgotten first, so templates built per call (f-strings) can't grow it forever
+MAX_MESSAGE_TYPES = 1000
+
+# How long stopping the listener waits for room in a full queue before dropping
+# queued records to make room for its stop marker
+STOP_TIMEOUT = 2.0
+
+# LogRecord attributes that aren't extra fields passed by the caller
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message", "asctime", "event", "suppressed"
+}
+
+
+def message_type(record: logging.LogRecord) -> str:
+    """A record's type: its event name (extra={"event": ...}) or logger name and template."""
+    return getattr(record, "event", None) or f"{record.name}:{record.msg}"
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps 1 in N records below WARNING for each message type with a sample
+    rate (matched by event name, then logger name), and caps every message
+    type, except those of the exempt loggers, at rate_limit records per second.
+    The next record kept after drops carries how many were dropped in its
+    suppressed attribute.
+    """
+
+    def __init__(
+        self,
+        sample_rates: Optional[Dict[str, float]] = None,
+        rate_limit: float = 0,
+        exempt_loggers: Iterable[str] = RATE_LIMIT_EXEMPT_LOGGERS,
+        max_types: int = MAX_MESSAGE_TYPES
+    ):
+        """Initialize with sample rates (0-1) per event or logger name and a per-type rate cap."""
+        super().__init__()
+        self.sample_rates = dict(sample_rates or {})
+        self.rate_limit = rate_limit
+        self.exempt_loggers = frozenset(exempt_loggers)
+        self.max_types = max_types
+        # Per message type, least recently seen first:
+        # [records seen, sample interval, cap tokens, last refill, suppressed]
+        self._types: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _interval(self, record: logging.LogRecord) -> int:
+        """Keep every Nth record of this type (1 keeps all)."""
+        if record.levelno >= logging.WARNING:
+            return 1
+        rate = self.sample_rates.get(getattr(record, "event", None))
+        if rate is None:
+            rate = self.sample_rates.get(record.name, 1.0)
+        return max(1, round(1 / rate)) if rate > 0 else 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = message_type(record)
+        now = time.monotonic()
+        with self._lock:
+            state = self._types.get(key)
+            if state is None:
+                state = self._types[key] = [0, self._interval(record), self.rate_limit, now, 0]
+                if len(self._types) > self.max_types:
+                    self._types.popitem(last=False)
+            else:
+                self._types.move_to_end(key)
+            seen, interval = state[0], state[1]
+            state[0] += 1
+            if interval == 0 or seen % interval:
+                state[4] += 1
+                LOG_RECORDS_DROPPED.inc("sampled")
+                return False
+            if self.rate_limit > 0 and record.name not in self.exempt_loggers:
+                state[2] = min(self.rate_limit, state[2] + (now - state[3]) * self.rate_limit)
+                state[3] = now
+                if state[2] < 1:
+                    state[4] += 1
+                    LOG_RECORDS_DROPPED.inc("rate_limited")
+                    return False
+                state[2] -= 1
+            if state[4]:
+                record.suppressed = state[4]
+                state[4] = 0
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Enqueues records without formatting them (the listener formats), and
+    drops them when the queue is full rather than blocking the caller.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same-process queue: the record needs no pickling, so skip formatting here
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc("queue_full")
+
+
+class TextFormatter(logging.Formatter):
+    """Plain text lines, noting how many similar records were suppressed."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            text += f" ({suppressed} similar suppressed)"
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, event, message and extra fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", None) or record.msg,
+            "message": record.getMessage(),
+        }
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRIBUTES:
+                entry[name] = value
+        if getattr(record, "suppressed", 0):
+            entry["suppressed"] = record.suppressed
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, separators=(",", ":"))
+
+
+class StoppableQueueListener(QueueListener):
+    """
+    QueueListener whose stop marker fits in a full bounded queue: it waits up
+    to STOP_TIMEOUT for the listener to make room, then drops the oldest queued
+    records rather than failing (the stock put_nowait raises queue.Full).
+    """
+
+    def enqueue_sentinel(self) -> None:
+        try:
+            self.queue.put(self._sentinel, timeout=STOP_TIMEOUT)
+            return
+        except queue.Full:
+            pass
+        while True:
+            try:
+                self.queue.put_nowait(self._sentinel)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    LOG_RECORDS_DROPPED.inc("queue_full")
+                except queue.Empty:
+                    pass
+
+
+class LogPipeline:
+    """Owns the root logger's queue handler and the listener thread that drains it."""
+
+    def __init__(self):
+        """Initialize without installing anything; see install()."""
+        self.handler: Optional[DroppingQueueHandler] = None
+        self.listener: Optional[StoppableQueueListener] = None
+        self._sink: Optional[logging.Handler] = None
+        self._queue_size = 0
+
+    def install(
+        self,
+        level: str = "INFO",
+        json_format: bool = False,
+        sample_rates: Optional[Dict[str, float]] = None,
+        rate_limit: float = 0,
+        queue_size: int = 10000,
+        stream: Optional[TextIO] = None,
+        routed_loggers: Iterable[str] = ROUTED_LOGGERS
+    ) -> None:
+        """
+        Replace the root logger's handlers with the queued pipeline writing to
+        stream (stderr by default), and route the given loggers through it.
+        Calling it again reconfigures the pipeline.
+        """
+        self.uninstall()
+        self._sink = logging.StreamHandler(stream or sys.stderr)
+        self._sink.setFormatter(
+            JsonFormatter() if json_format
+            else TextFormatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        )
+        self._queue_size = queue_size
+        self.handler = DroppingQueueHandler(queue.Queue(queue_size))
+        self.handler.addFilter(SamplingFilter(sample_rates, rate_limit))
+        self._start_listener()
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(self.handler)
+        root.setLevel(level)
+        for name in routed_loggers:
+            routed = logging.getLogger(name)
+            for handler in list(routed.handlers):
+                routed.removeHandler(handler)
+            routed.propagate = True
+
+    def _start_listener(self) -> None:
+        """Start a listener thread draining the handler's queue into the sink."""
+        self.listener = StoppableQueueListener(self.handler.queue, self._sink, respect_handler_level=True)
+        self.listener.start()
+
+    def restart_after_fork(self) -> None:
+        """Threads don't survive fork: give the child a fresh queue and listener."""
+        if self.handler is not None:
+            for log_filter in self.handler.filters:
+                if isinstance(log_filter, SamplingFilter):
+                    log_filter._lock = threading.Lock()
+            self.handler.queue = queue.Queue(self._queue_size)
+            self._start_listener()
+
+    def flush(self) -> None:
+        """Write out everything queued so far (stops and restarts the listener)."""
+        if self.listener is not None:
+            self.listener.stop()
+            self._start_listener()
+
+    def uninstall(self) -> None:
+        """Drain the queue and remove the pipeline from the root logger."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        if self.handler is not None:
+            logging.getLogger().removeHandler(self.handler)
+            self.handler = None
+
+
+# Global pipeline instance; install() it from the app (see main.create_app)
+log_pipeline = LogPipeline()
+atexit.register(log_pipeline.uninstall)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=log_pipeline.restart_after_fork)
@@ -1,65 +1,184 @@
 """
 Main FastAPI application entry point.
+
+create_app() builds the application; the services behind it load on first use
+and the lifespan handler starts them in order. The module-level app used by
+"uvicorn main:app" is created on first access, so importing main is cheap.
 """
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
 
-from routes import calculator, api
+from admission import AdmissionMiddleware
+from assets import AssetStaticFiles, asset_manifest
+from log_pipeline import log_pipeline
+from metrics import MetricsMiddleware
+from profiling import ServerTimingMiddleware
+from routes import calculator, api, admin
+from services.calculator_service import calculator_service
+from services.calculation_cache import calculation_cache
 from services.shared_results_service import shared_results_service
+from services.cache_warmer import cache_warmer
+import config
 import asyncio
+import gc
 import logging
+import math
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(
-    title="GrowCalculator",
-    description="A modern plant value calculator for Roblox Grow a Garden",
-    version="1.0.0"
-)
-
-# Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Include routers
-app.include_router(calculator.router)
-app.include_router(api.router, prefix="/api")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start services in dependency order, and stop them in reverse, in each worker."""
+    logger.info("Starting GrowCalculator application...")
 
-# Templates
-templates = Jinja2Templates(directory="templates")
+    # Read-only data first; a no-op when prefork() loaded it before forking
+    calculator_service.ensure_loaded()
 
+    # Shared-memory tables are opened per worker, after any fork
+    if calculation_cache.open_shared(config.SHARED_CACHE_NAME, config.SHARED_CACHE_SLOTS):
+        logger.info("Attached shared calculation cache %s", config.SHARED_CACHE_NAME)
 
-@app.on_event("startup")
-async def startup_event():
-    """Run on application startup."""
-    logger.info("Starting GrowCalculator application...")
-    
-    # Clean up any expired results on startup
+    # Create tables if needed, then clean up any expired results
+    shared_results_service.init_database()
     try:
         deleted_count = shared_results_service.cleanup_expired_results()
         if deleted_count > 0:
-            logger.info(f"Cleaned up {deleted_count} expired shared results on startup")
+            logger.info("Cleaned up %d expired shared results on startup", deleted_count)
         else:
             logger.info("No expired results found on startup")
     except Exception as e:
-        logger.error(f"Error during startup cleanup: {e}")
+        logger.error("Error during startup cleanup: %s", e)
 
+    # Warm caches in the background so startup isn't delayed
+    warm_task = None
+    if config.WARM_TIME_BUDGET > 0:
+        warm_task = asyncio.create_task(
+            cache_warmer.warm(config.WARM_TIME_BUDGET, calculator.render_share_page)
+        )
+
+    yield
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Run on application shutdown."""
     logger.info("Shutting down GrowCalculator application...")
-    
+
+    if warm_task is not None and not warm_task.done():
+        warm_task.cancel()
+
+    # Save the hottest cache keys for the next startup to warm from
+    try:
+        saved_count = cache_warmer.save_snapshot()
+        logger.info("Saved %d cache keys for warm-up", saved_count)
+    except Exception as e:
+        logger.error("Error saving cache snapshot: %s", e)
+
     # Clean up expired results before shutdown
     try:
         deleted_count = shared_results_service.cleanup_expired_results()
         if deleted_count > 0:
-            logger.info(f"Cleaned up {deleted_count} expired shared results on shutdown")
+            logger.info("Cleaned up %d expired shared results on shutdown", deleted_count)
     except Exception as e:
-        logger.error(f"Error during shutdown cleanup: {e}")
+        logger.error("Error during shutdown cleanup: %s", e)
+
+    calculation_cache.close_shared()
+
+
+def _finite(value):
+    """Replace non-finite floats (anywhere in value) with their text, for JSON output."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return str(value)
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_finite(item) for item in value]
+    return value
+
+
+async def validation_error_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
+    """FastAPI's 422 response, except rejected inputs like inf are echoed as strings."""
+    return JSONResponse(status_code=422, content={"detail": _finite(jsonable_encoder(exc.errors()))})
+
+
+def create_app() -> FastAPI:
+    """Build the application: logging, static files, routers and middleware."""
+    log_pipeline.install(
+        level=config.LOG_LEVEL,
+        json_format=config.LOG_FORMAT == "json",
+        sample_rates=config.LOG_SAMPLE_RATES,
+        rate_limit=config.LOG_RATE_LIMIT,
+        queue_size=config.LOG_QUEUE_SIZE
+    )
+
+    app = FastAPI(
+        title="GrowCalculator",
+        description="A modern plant value calculator for Roblox Grow a Garden",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+
+    # Mount static files (built assets under /static/dist are served immutable)
+    app.mount(
+        "/static",
+        AssetStaticFiles(directory="static", manifest=asset_manifest),
+        name="static"
+    )
+
+    # Keep 422 responses valid JSON when the rejected input was inf or nan
+    app.add_exception_handler(RequestValidationError, validation_error_handler)
+
+    # Include routers
+    app.include_router(calculator.router)
+    app.include_router(api.router, prefix="/api")
+    app.include_router(admin.router)
+
+    # Shed load over the per-client rates and per-route concurrency limits
+    if config.ADMISSION_ENABLED:
+        if not config.ADMISSION_CLIENT_HEADER:
+            logger.warning(
+                "Admission control keys clients by connection address; behind a reverse "
+                "proxy every user shares one rate limit. Set GROWCALC_ADMISSION_CLIENT_HEADER "
+                "to the header the proxy sets (e.g. x-forwarded-for)"
+            )
+        app.add_middleware(AdmissionMiddleware, client_header=config.ADMISSION_CLIENT_HEADER)
+
+    # Per-phase timings in a Server-Timing response header
+    if config.SERVER_TIMING:
+        app.add_middleware(ServerTimingMiddleware)
+
+    # Per-route latency and status metrics, served at /metrics
+    if config.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+
+    return app
+
+
+def prefork() -> None:
+    """
+    Load the read-only catalog in the parent of preforked workers, then move
+    every object allocated so far into the collector's permanent generation.
+    Collections in the workers never touch those objects again, so their pages
+    stay shared copy-on-write instead of being copied into every worker.
+    """
+    calculator_service.ensure_loaded()
+    calculator_service.get_catalog_json()
+    asset_manifest.manifest
+    gc.collect()
+    gc.freeze()
+    logger.info(
+        "Preloaded catalog %s; froze %d objects", calculator_service.data_version, gc.get_freeze_count()
+    )
+
+
+def __getattr__(name: str):
+    """Create the module-level app on first access ("uvicorn main:app")."""
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run("main:create_app", factory=True, host="0.0.0.0", port=8000, reload=True)
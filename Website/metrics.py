@@ -0,0 +1,258 @@
+"""
+In-process metrics: counters, histograms and collection-time callbacks,
+rendered in the Prometheus text exposition format at /metrics.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Request latency buckets in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# SQLite statement/transaction buckets in seconds
+QUERY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+# A callback returns ({label: value}, sample value) pairs when metrics are collected
+Samples = Iterable[Tuple[Dict[str, str], float]]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text format."""
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Render {a="x",b="y"}, or nothing without labels."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Render integers without a trailing .0."""
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
+
+
+class Counter:
+    """Monotonic counter with an optional fixed set of label names."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        """Initialize a counter with no series."""
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Add amount to the series for the given label values."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        """Current value of one series."""
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        """Exposition lines for this counter."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(dict(zip(self.labelnames, labels)))} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Fixed-bucket histogram with an optional fixed set of label names."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        """Initialize a histogram with no series."""
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: [count per bucket..., count above the last bucket], sum
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation for the given label values."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """Observe the duration of a with-block, including one that raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def count(self, *labels: str) -> int:
+        """Number of observations in one series."""
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        """Exposition lines for this histogram (cumulative buckets, sum, count)."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        for labels, counts, total in items:
+            label_dict = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels({**label_dict, 'le': le})} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(label_dict)} {repr(total)}")
+            lines.append(f"{self.name}_count{_format_labels(label_dict)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Holds the process's metrics. Values are per worker process; scrape each
+    worker (or sum across them) when running several.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: Dict[str, object] = {}
+        self._callbacks: List[Tuple[str, str, str, Callable[[], Samples]]] = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        if name not in self._metrics:
+            self._metrics[name] = Counter(name, help, labelnames)
+        return self._metrics[name]
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        """Get or create a histogram."""
+        if name not in self._metrics:
+            self._metrics[name] = Histogram(name, help, labelnames, buckets)
+        return self._metrics[name]
+
+    def register_callback(self, name: str, help: str, kind: str, callback: Callable[[], Samples]) -> None:
+        """Add a metric (gauge or counter) whose samples are read from callback at collection time."""
+        self._callbacks = [entry for entry in self._callbacks if entry[0] != name]
+        self._callbacks.append((name, help, kind, callback))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        for name, help, kind, callback in self._callbacks:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in callback():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route request latency and response status.
+    Routes are labelled by their template (/share/{share_id}), read from the
+    scope after routing; unmatched paths share one label to bound cardinality.
+    In-flight requests are counted per route at collection time from the
+    active scopes, so tracking them costs one dict insert and delete.
+    """
+
+    def __init__(self, app, registry: Optional[MetricsRegistry] = None):
+        """Wrap app, registering the HTTP metrics in registry (the global one by default)."""
+        self.app = app
+        registry = registry or metrics
+        self._duration = registry.histogram(
+            "growcalc_http_request_duration_seconds",
+            "HTTP request latency by route",
+            ("method", "route")
+        )
+        self._requests = registry.counter(
+            "growcalc_http_requests_total",
+            "HTTP requests by route and status",
+            ("method", "route", "status")
+        )
+        self._active: Dict[int, dict] = {}
+        registry.register_callback(
+            "growcalc_http_requests_in_flight",
+            "HTTP requests currently being handled, by route",
+            "gauge",
+            self._in_flight_samples
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        root_path = scope.get("root_path", "")
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        key = id(scope)
+        self._active[key] = scope
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            del self._active[key]
+            route = route_label(scope, root_path)
+            self._duration.observe(elapsed, scope["method"], route)
+            self._requests.inc(scope["method"], route, str(status))
+
+    def _in_flight_samples(self) -> Samples:
+        """In-flight counts per route; requests not yet routed count as "routing"."""
+        counts: Dict[Tuple[str, str], int] = {}
+        for scope in list(self._active.values()):
+            route = route_label(scope, None) if "endpoint" in scope else "routing"
+            counts[(scope["method"], route)] = counts.get((scope["method"], route), 0) + 1
+        return [({"method": method, "route": route}, count) for (method, route), count in counts.items()]
+
+
+def route_label(scope: dict, root_path) -> str:
+    """Route template for a routed scope, the mount path for mounted apps, else "unmatched"."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if scope.get("endpoint") is not None:
+        # Mounted app (e.g. /static); the mount prefix was appended to root_path
+        mount = scope.get("root_path", "")
+        if root_path is not None and mount.startswith(root_path):
+            mount = mount[len(root_path):]
+        return mount or "unmatched"
+    return "unmatched"
+
+
+# Global metrics registry
+metrics = MetricsRegistry()
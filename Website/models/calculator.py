@@ -1,7 +1,7 @@
 """
 Pydantic models for calculator requests and responses.
 """
-from typing import List, Optional
+from typing import Annotated, Dict, List, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -30,7 +30,7 @@ class CalculationRequest(BaseModel):
     """Request model for plant value calculation."""
     plant_name: str = Field(..., description="Name of the plant")
     variant: str = Field(default="Normal", description="Plant variant")
-    weight: float = Field(..., gt=0, description="Weight in kg")
+    weight: float = Field(..., gt=0, allow_inf_nan=False, description="Weight in kg")
     mutations: List[str] = Field(default=[], description="List of mutation names")
     plant_amount: int = Field(default=1, ge=1, le=10000, description="Number of plants")
 
@@ -49,6 +49,52 @@ class CalculationResponse(BaseModel):
     total_value: int  # final_value * plant_amount
 
 
+class ValueDistributionRequest(BaseModel):
+    """Request model for the value distribution over the expected weight range."""
+    plant_name: str = Field(..., description="Name of the plant")
+    variant: str = Field(default="Normal", description="Plant variant")
+    mutations: List[str] = Field(default=[], description="List of mutation names")
+    percentiles: List[Annotated[float, Field(allow_inf_nan=False)]] = Field(
+        default=[5, 25, 50, 75, 95],
+        min_length=1,
+        max_length=101,
+        description="Percentiles to report, each between 0 and 100"
+    )
+
+
+class ValueDistributionResponse(BaseModel):
+    """Response model for the value distribution over the expected weight range."""
+    plant_name: str
+    variant: str
+    mutations: List[str]
+    mutation_multiplier: float
+    weight_min: float
+    weight_max: float
+    min_value: int
+    max_value: int
+    expected_value: float
+    floor_probability: float  # share of the range clamped to the 0.95 ratio floor
+    percentiles: Dict[str, int]
+
+
+class RankedPlant(BaseModel):
+    """A plant entry in a value ranking."""
+    rank: int
+    plant_name: str
+    base_weight: float
+    value: int
+    value_per_kg: float
+
+
+class RankingResponse(BaseModel):
+    """Response model for ranked plant lists."""
+    metric: str
+    variant: str
+    mutations: List[str]
+    mutation_multiplier: float
+    plants: List[RankedPlant]
+
+
 class PlantListResponse(BaseModel):
     """Response model for plant list."""
     plants: List[str]
@@ -88,3 +134,52 @@ class SharedResultResponse(BaseModel):
     success: bool
     data: Optional[SharedResult] = None
     error: Optional[str] = None
+
+
+class BulkShareRequest(BaseModel):
+    """Request model for creating many shared results at once."""
+    shares: List[dict] = Field(..., min_length=1, max_length=1000, description="Share payloads, as for POST /api/share")
+
+
+class BulkShareStatus(BaseModel):
+    """Outcome for one item of a bulk share request."""
+    share_id: Optional[str] = None
+    success: bool
+    data: Optional[SharedResult] = None
+    error: Optional[str] = None
+
+
+class BulkShareResponse(BaseModel):
+    """Response model for bulk share creation and lookup, one status per item in request order."""
+    results: List[BulkShareStatus]
+    succeeded: int
+    failed: int
+
+
+class BulkShareLookupRequest(BaseModel):
+    """Request model for looking up many shared results at once."""
+    share_ids: List[str] = Field(..., min_length=1, max_length=1000, description="Share IDs to resolve")
+
+
+class PopularityCount(BaseModel):
+    """Share count for one plant, variant or mutation."""
+    name: str
+    count: int
+
+
+class PopularCombo(BaseModel):
+    """Approximate share count for a plant, variant and mutation set."""
+    plant: str
+    variant: str
+    mutations: List[str]
+    count: int = Field(..., description="Estimated share count (may overestimate by up to error)")
+    error: int = Field(..., description="Maximum overestimate of count")
+
+
+class SharePopularityResponse(BaseModel):
+    """Response model for the most shared plants, variants, mutations and combos."""
+    total_shares: int
+    plants: List[PopularityCount]
+    variants: List[PopularityCount]
+    mutations: List[PopularityCount]
+    combos: List[PopularCombo]
@@ -0,0 +1,186 @@
+"""
+Server-Timing instrumentation for routes, templates and the ASGI app (the
+phases themselves are recorded with timing.phase), and an on-demand sampling
+profiler that produces collapsed stacks for flamegraphs.
+"""
+import asyncio
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict
+
+from fastapi.routing import APIRoute
+from fastapi.templating import Jinja2Templates
+
+from timing import format_server_timing, phase, request_phases
+
+# Longest and shortest profiles the admin endpoint accepts
+MAX_PROFILE_SECONDS = 60.0
+MIN_PROFILE_INTERVAL = 0.001
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute that splits handler time into "parse" (body parsing, dependencies
+    and validation), "endpoint" and "serialize" (response model validation and
+    encoding) phases.
+    """
+
+    def get_route_handler(self):
+        call = self.dependant.call
+        if not getattr(call, "_timed", False):
+            if asyncio.iscoroutinefunction(call):
+                @functools.wraps(call)
+                async def timed_call(*args, **kwargs):
+                    _mark("endpoint_start")
+                    try:
+                        return await call(*args, **kwargs)
+                    finally:
+                        _mark("endpoint_end")
+            else:
+                @functools.wraps(call)
+                def timed_call(*args, **kwargs):
+                    _mark("endpoint_start")
+                    try:
+                        return call(*args, **kwargs)
+                    finally:
+                        _mark("endpoint_end")
+            timed_call._timed = True
+            self.dependant.call = timed_call
+
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            phases = request_phases.get()
+            if phases is None:
+                return await handler(request)
+            start = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                end = time.perf_counter()
+                endpoint_start = phases.pop("_endpoint_start", None)
+                endpoint_end = phases.pop("_endpoint_end", None)
+                if endpoint_start is not None:
+                    phases["parse"] = endpoint_start - start
+                    if endpoint_end is not None:
+                        phases["endpoint"] = endpoint_end - endpoint_start
+                        phases["serialize"] = end - endpoint_end
+
+        return timed_handler
+
+
+class TimedTemplates(Jinja2Templates):
+    """Jinja2Templates that times rendering as the "render" phase."""
+
+    def TemplateResponse(self, *args, **kwargs):
+        with phase("render"):
+            return super().TemplateResponse(*args, **kwargs)
+
+
+def _mark(name: str) -> None:
+    """Record a timestamp for TimedRoute in the current request's phases."""
+    phases = request_phases.get()
+    if phases is not None:
+        phases[f"_{name}"] = time.perf_counter()
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware that collects the phases recorded while handling a request
+    and sends them, with the total time to the response headers, as a
+    Server-Timing header.
+    """
+
+    def __init__(self, app):
+        """Wrap app."""
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        phases: Dict[str, float] = {}
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                timings = {name: value for name, value in phases.items() if not name.startswith("_")}
+                timings["total"] = time.perf_counter() - start
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", format_server_timing(timings).encode("latin-1"))
+                ]
+            await send(message)
+
+        token = request_phases.set(phases)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_phases.reset(token)
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of every thread in this process at a fixed interval and
+    counts them in collapsed-stack form ("outer;inner;leaf count"), the input
+    format of flamegraph.pl and speedscope. Nothing runs between profiles.
+    """
+
+    def __init__(self):
+        """Initialize an idle profiler."""
+        self._lock = threading.Lock()
+        self.running = False
+
+    def profile(self, seconds: float, interval: float = 0.005) -> str:
+        """
+        Sample for seconds, blocking the calling thread, and return the
+        collapsed stacks. Raises RuntimeError if a profile is already running.
+        """
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+        self.running = True
+        try:
+            return self._sample(
+                min(max(seconds, interval), MAX_PROFILE_SECONDS),
+                max(interval, MIN_PROFILE_INTERVAL)
+            )
+        finally:
+            self.running = False
+            self._lock.release()
+
+    def _sample(self, seconds: float, interval: float) -> str:
+        """Collect samples until seconds have passed."""
+        own_thread = threading.get_ident()
+        stacks: Counter = Counter()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            # Threadpool threads come and go during a profile
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                stacks[(thread_names.get(thread_id, str(thread_id)), self._stack(frame))] += 1
+            time.sleep(interval)
+
+        return "".join(
+            f"{thread_name};{stack} {count}\n"
+            for (thread_name, stack), count in stacks.most_common()
+        )
+
+    @staticmethod
+    def _stack(frame) -> str:
+        """Outermost-first frame labels joined by semicolons."""
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            labels.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(labels))
+
+
+# Global profiler instance
+sampling_profiler = SamplingProfiler()
@@ -0,0 +1,76 @@
+"""
+Operational routes: metrics for monitoring and on-demand profiling.
+"""
+import os
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
+
+from metrics import metrics
+from profiling import MAX_PROFILE_SECONDS, MIN_PROFILE_INTERVAL, TimedRoute, sampling_profiler
+from services.calculation_cache import calculation_cache
+from services.calculator_service import calculator_service
+from services.shared_result_cache import shared_result_cache
+from routes.dependencies import require_admin, require_metrics_access
+
+router = APIRouter(route_class=TimedRoute)
+
+# Prometheus text exposition format; Starlette appends "; charset=utf-8" to text/ types
+METRICS_MEDIA_TYPE = "text/plain; version=0.0.4"
+
+
+def _cache_stats() -> dict:
+    """LRU stats of every in-process cache, by cache name."""
+    calculations = calculation_cache.stats()
+    shares = shared_result_cache.stats()
+    return {
+        "calculations": calculations["results"],
+        "mutation_multipliers": calculations["mutation_multipliers"],
+        "distributions": calculator_service.get_distribution_cache_stats(),
+        "share_results": shares["results"],
+        "share_pages": shares["pages"],
+    }
+
+
+def _cache_samples(field: str):
+    """Collection callback reading one stats field of every cache."""
+    def samples():
+        return [({"cache": name}, stats[field]) for name, stats in _cache_stats().items()]
+    return samples
+
+
+metrics.register_callback("growcalc_cache_hits_total", "Cache hits", "counter", _cache_samples("hits"))
+metrics.register_callback("growcalc_cache_misses_total", "Cache misses", "counter", _cache_samples("misses"))
+metrics.register_callback("growcalc_cache_evictions_total", "Cache evictions", "counter", _cache_samples("evictions"))
+metrics.register_callback("growcalc_cache_entries", "Entries held per cache", "gauge", _cache_samples("size"))
+
+
+@router.get("/metrics", dependencies=[Depends(require_metrics_access)], include_in_schema=False)
+async def get_metrics():
+    """Request, cache, engine and database metrics for this worker process."""
+    return Response(metrics.render(), media_type=METRICS_MEDIA_TYPE)
+
+
+@router.post("/admin/profile", dependencies=[Depends(require_admin)], include_in_schema=False)
+async def run_profile(
+    seconds: float = Query(default=10.0, gt=0, le=MAX_PROFILE_SECONDS, description="How long to sample"),
+    interval: float = Query(default=0.005, ge=MIN_PROFILE_INTERVAL, le=1.0, description="Seconds between samples")
+):
+    """
+    Sample every thread of this worker for the given time and return collapsed
+    stacks, ready for flamegraph.pl or speedscope.
+    """
+    if sampling_profiler.running:
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    try:
+        stacks = await run_in_threadpool(sampling_profiler.profile, seconds, interval)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    filename = f"profile-{os.getpid()}-{int(time.time())}.folded"
+    return Response(
+        stacks,
+        media_type="text/plain",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -1,39 +1,214 @@
 """
 API routes for calculator functionality.
 """
-from typing import List
-from fastapi import APIRouter, HTTPException
+import gzip
+import json
+from functools import lru_cache
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
+
+import config
+from profiling import TimedRoute
+from timing import phase
 
 from models.calculator import (
     CalculationRequest,
     CalculationResponse,
     PlantListResponse,
     VariantListResponse,
-    MutationListResponse
+    MutationListResponse,
+    ValueDistributionRequest,
+    ValueDistributionResponse,
+    RankingResponse
 )
 from services.calculator_service import calculator_service
+from services.calculation_cache import calculation_cache
+from services.shared_result_cache import shared_result_cache
+from services.cache_warmer import cache_warmer
+from services.inventory_service import inventory_service
+from services.live_service import create_session
+
+router = APIRouter(route_class=TimedRoute)
+
+# Compact C-accelerated encoder for responses that skip model validation
+_json_encoder = json.JSONEncoder(separators=(",", ":"))
+
 
-router = APIRouter()
+class BodyStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for handlers that keep reading the request body while
+    responding. The stock class listens for disconnects on the same receive
+    channel, which would swallow body messages, so it is skipped here.
+    """
+    
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
 
 
 @router.post("/calculate", response_model=CalculationResponse)
 async def calculate_plant_value(request: CalculationRequest):
     """Calculate plant value based on provided parameters."""
     try:
-        result = calculator_service.calculate_full_value(
+        result = await calculation_cache.calculate(
             plant_name=request.plant_name,
             variant=request.variant,
             weight=request.weight,
             mutations=request.mutations,
             plant_amount=request.plant_amount
         )
-        return result
+        if config.FAST_RESPONSES:
+            # The engine dict already matches CalculationResponse, so encode it
+            # directly instead of validating and re-encoding it through the model
+            return Response(
+                content=_json_encoder.encode(result).encode("utf-8"),
+                media_type="application/json"
+            )
+        return CalculationResponse(**result)
     except KeyError as e:
         raise HTTPException(status_code=400, detail=f"Invalid data: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Calculation error: {str(e)}")
 
 
+@router.websocket("/ws/calculate")
+async def live_calculation(websocket: WebSocket):
+    """
+    Live calculation channel. The client sends compact input deltas such as
+    {"s": 3, "w": 1.25} and gets {"s": 3, "r": <calculation>} for the newest one.
+    """
+    await websocket.accept()
+    session = create_session()
+    try:
+        while True:
+            text = await websocket.receive_text()
+            await session.handle_message(websocket, text)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        session.close()
+
+
+@router.post("/calculate/stream")
+async def calculate_inventory_stream(request: Request, format: Optional[str] = None):
+    """
+    Value an NDJSON or CSV inventory streamed in the request body.
+    Results are streamed back as NDJSON with running totals.
+    """
+    input_format = format
+    if input_format is None:
+        content_type = request.headers.get("content-type", "")
+        input_format = "csv" if "csv" in content_type else "ndjson"
+    if input_format not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {input_format}")
+    
+    try:
+        declared = int(request.headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length")
+    if declared > config.INVENTORY_MAX_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Inventory body exceeds {config.INVENTORY_MAX_BYTES} bytes"
+        )
+    
+    # Results are sent while the body is still arriving, so clients must read
+    # the response concurrently with their upload
+    return BodyStreamingResponse(
+        inventory_service.value_stream(
+            request.stream(), input_format, max_bytes=config.INVENTORY_MAX_BYTES
+        ),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.post("/value-distribution", response_model=ValueDistributionResponse)
+async def get_value_distribution(request: ValueDistributionRequest):
+    """Get percentiles and expected value across a plant's expected weight range."""
+    if any(p < 0 or p > 100 for p in request.percentiles):
+        raise HTTPException(status_code=400, detail="Percentiles must be between 0 and 100")
+    try:
+        with phase("calc"):
+            distribution = calculator_service.get_value_distribution(
+                plant_name=request.plant_name,
+                variant=request.variant,
+                mutations=request.mutations,
+                percentiles=request.percentiles
+            )
+        return ValueDistributionResponse(mutations=request.mutations, **distribution)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid data: {str(e)}")
+
+
+@router.get("/rankings", response_model=RankingResponse)
+async def get_rankings(
+    metric: str = Query(default="value", description="Either 'value' or 'value_per_kg'"),
+    variant: str = Query(default="Normal", description="Plant variant"),
+    mutations: List[str] = Query(default=[], description="Mutation names"),
+    limit: int = Query(default=10, ge=1, le=500, description="Number of plants to return")
+):
+    """Get the most valuable plants at base weight for a variant and mutation set."""
+    if metric not in ("value", "value_per_kg"):
+        raise HTTPException(status_code=400, detail=f"Unknown metric: {metric}")
+    try:
+        with phase("calc"):
+            plants = calculator_service.get_top_plants(metric, variant, mutations, limit)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid data: {str(e)}")
+    return RankingResponse(
+        metric=metric,
+        variant=variant,
+        mutations=mutations,
+        mutation_multiplier=calculation_cache.mutation_multiplier(mutations),
+        plants=plants
+    )
+
+
+@router.get("/catalog")
+async def get_catalog(request: Request, v: Optional[str] = None):
+    """
+    Get plants, variants, mutations, weight ranges and traits as one versioned blob.
+    Requests pinned to the current version (?v=<version>) may be cached forever.
+    """
+    version = calculator_service.data_version
+    etag = f'"{version}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": (
+            "public, max-age=31536000, immutable" if v == version
+            else "public, max-age=300"
+        ),
+        "Vary": "Accept-Encoding"
+    }
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    
+    body = calculator_service.get_catalog_json()
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        body = _compressed_catalog(version)
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@lru_cache(maxsize=1)
+def _compressed_catalog(version: str) -> bytes:
+    """Gzip the catalog once per data version."""
+    return gzip.compress(calculator_service.get_catalog_json(), compresslevel=9)
+
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Get hit/miss statistics for the calculation caches."""
+    return {
+        "calculations": calculation_cache.stats(),
+        "distributions": calculator_service.get_distribution_cache_stats(),
+        "shares": shared_result_cache.stats(),
+        "warmup": cache_warmer.last_run
+    }
+
+
 @router.get("/plants", response_model=PlantListResponse)
 async def get_plants():
     """Get list of all available plants."""
@@ -71,7 +246,7 @@ async def get_plant_data(plant_name: str):
 async def calculate_mutation_multiplier(mutations: List[str]):
     """Calculate mutation multiplier for given mutations."""
     try:
-        multiplier = calculator_service.calculate_mutation_multiplier(mutations)
+        multiplier = calculation_cache.mutation_multiplier(mutations)
         return {
             "mutations": mutations,
             "multiplier": multiplier,
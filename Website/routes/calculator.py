@@ -1,18 +1,41 @@
 """
 Main calculator routes for rendering HTML pages.
 """
-from fastapi import APIRouter, Request
-from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from assets import asset_manifest
+from profiling import TimedRoute, TimedTemplates
+from timing import phase
 
 from services.calculator_service import calculator_service
 from services.shared_results_service import shared_results_service
-from models.calculator import SharedResult, SharedResultResponse
+from services.shared_result_cache import share_expiry, shared_result_cache
+from services.share_export import EXPORT_MEDIA_TYPES, export_chunks
+from routes.dependencies import require_admin
+from models.calculator import (
+    SharedResult, SharedResultResponse, BulkShareRequest, BulkShareLookupRequest,
+    BulkShareResponse, BulkShareStatus, SharePopularityResponse
+)
 from fastapi import HTTPException
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import secrets
+from email.utils import format_datetime
+
+router = APIRouter(route_class=TimedRoute)
+templates = TimedTemplates(directory="templates")
+
+
+def catalog_url() -> str:
+    """Versioned catalog URL so pages can calculate locally from a long-cached blob."""
+    return f"/api/catalog?v={calculator_service.data_version}"
+
 
-router = APIRouter()
-templates = Jinja2Templates(directory="templates")
+templates.env.globals["catalog_url"] = catalog_url
+# Fingerprinted asset URLs and resolved plant images from the build manifest
+templates.env.globals["asset_url"] = asset_manifest.url
+templates.env.globals["plant_image"] = asset_manifest.plant_image
 
 
 @router.get("/", response_class=HTMLResponse)
@@ -50,12 +73,44 @@ async def about(request: Request):
     )
 
 
+def render_share_page(share: dict) -> str:
+    """Render share.html for a shared result (the page doesn't depend on the request)."""
+    data = SharedResult(**share).model_dump(mode="json")
+    with phase("render"):
+        return templates.get_template("share.html").render({"request": None, "share": data})
+
+
 @router.get("/share/{share_id}", response_class=HTMLResponse)
 async def share_result(request: Request, share_id: str):
-    """Share results page."""
-    return templates.TemplateResponse(
-        "share.html",
-        {"request": request, "share_id": share_id}
+    """Share results page, rendered with the shared data inlined."""
+    page = await shared_result_cache.get_page(share_id, render_share_page)
+    if page is None:
+        return templates.TemplateResponse(
+            "share.html",
+            {"request": request, "share": None},
+            status_code=404,
+            headers={"Cache-Control": "public, max-age=60"}
+        )
+
+    # The page never changes before the share expires, so let caches keep it until then
+    html, share = page
+    expires = share_expiry(share)
+    max_age = max(0, int((expires - datetime.now(timezone.utc)).total_seconds()))
+    return HTMLResponse(
+        html,
+        headers={
+            "Cache-Control": f"public, max-age={max_age}",
+            "Expires": format_datetime(expires, usegmt=True)
+        }
+    )
+
+
+@router.get("/images/plants/{plant_name}")
+async def plant_image(plant_name: str):
+    """Redirect to a plant's resolved (fingerprinted when built) image."""
+    return RedirectResponse(
+        asset_manifest.plant_image(plant_name)["src"],
+        headers={"Cache-Control": "public, max-age=300"}
     )
 
 
@@ -63,15 +118,10 @@ async def share_result(request: Request, share_id: str):
 async def create_shared_result(share_data: dict):
     """Create a new shared result."""
     try:
-        # Generate share ID if not provided
-        if 'share_id' not in share_data:
-            share_data['share_id'] = f"share_{int(datetime.utcnow().timestamp())}_{hash(str(share_data)) % 10000}"
+        _prepare_share(share_data)
         
-        # Set expiration to 24 hours from now
-        share_data['expires_at'] = (datetime.utcnow() + timedelta(hours=24)).isoformat()
-        
-        # Create the shared result
-        success = shared_results_service.create_shared_result(share_data)
+        # Create the shared result, off the event loop since SQLite writes can wait on locks
+        success = await run_in_threadpool(shared_results_service.create_shared_result, share_data)
         
         if success:
             return SharedResultResponse(
@@ -85,11 +135,79 @@ async def create_shared_result(share_data: dict):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/api/share/bulk", response_model=BulkShareResponse)
+async def create_shared_results(request: BulkShareRequest):
+    """Create many shared results in one transaction, with a status per item."""
+    shares = []
+    for share_data in request.shares:
+        share_data = dict(share_data)
+        share_data.setdefault('created_at', datetime.utcnow().isoformat())
+        _prepare_share(share_data)
+        shares.append(share_data)
+
+    statuses = await run_in_threadpool(shared_results_service.create_shared_results, shares)
+    results = []
+    for share_data, status in zip(shares, statuses):
+        data = None
+        if status['success']:
+            try:
+                data = SharedResult(**share_data)
+            except ValueError:
+                data = None
+        results.append(BulkShareStatus(data=data, **status))
+    return _bulk_response(results)
+
+
+@router.post("/api/share/lookup", response_model=BulkShareResponse)
+async def get_shared_results(request: BulkShareLookupRequest):
+    """Retrieve many shared results by ID, with a status per requested ID."""
+    found = await run_in_threadpool(shared_results_service.get_shared_results, request.share_ids)
+    results = []
+    for share_id in request.share_ids:
+        result = found.get(share_id)
+        if result is None:
+            results.append(BulkShareStatus(
+                share_id=share_id, success=False, error="Shared result not found or has expired"
+            ))
+        else:
+            results.append(BulkShareStatus(share_id=share_id, success=True, data=SharedResult(**result)))
+    return _bulk_response(results)
+
+
+@router.get("/api/share/export", dependencies=[Depends(require_admin)])
+async def export_shared_results(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Export format: ndjson or csv")
+):
+    """Stream all active shared results, oldest first (requires the admin token)."""
+    return StreamingResponse(
+        export_chunks(shared_results_service.iter_active_results(), format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="shared_results.{format}"',
+            "Cache-Control": "no-store"
+        }
+    )
+
+
+@router.get("/api/share/popular", response_model=SharePopularityResponse)
+async def get_share_popularity(
+    response: Response,
+    limit: int = Query(10, ge=1, le=100, description="Entries per list")
+):
+    """Most shared plants, variants, mutations and combos, from incremental aggregates."""
+    try:
+        popularity = await run_in_threadpool(shared_results_service.get_popularity, limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    response.headers["Cache-Control"] = "public, max-age=60"
+    return SharePopularityResponse(**popularity)
+
+
 @router.get("/api/share/{share_id}", response_model=SharedResultResponse)
 async def get_shared_result(share_id: str):
     """Retrieve a shared result by ID."""
     try:
-        result = shared_results_service.get_shared_result(share_id)
+        result = await shared_result_cache.get(share_id)
         
         if result:
             return SharedResultResponse(
@@ -111,6 +229,7 @@ async def delete_shared_result(share_id: str):
     """Delete a shared result by ID."""
     try:
         success = shared_results_service.delete_shared_result(share_id)
+        shared_result_cache.invalidate(share_id)
         
         if success:
             return {"success": True, "message": "Shared result deleted"}
@@ -146,3 +265,20 @@ async def get_share_stats():
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def _prepare_share(share_data: dict) -> None:
+    """Fill in a generated share ID if missing and set expiry to 24 hours from now."""
+    # Generate share ID if not provided; random, so identical payloads created
+    # together (e.g. in one bulk request) still get distinct IDs
+    if 'share_id' not in share_data:
+        share_data['share_id'] = f"share_{secrets.token_urlsafe(12)}"
+    
+    # Set expiration to 24 hours from now
+    share_data['expires_at'] = (datetime.utcnow() + timedelta(hours=24)).isoformat()
+
+
+def _bulk_response(results: list) -> BulkShareResponse:
+    """Wrap per-item statuses with success/failure counts."""
+    succeeded = sum(1 for result in results if result.success)
+    return BulkShareResponse(results=results, succeeded=succeeded, failed=len(results) - succeeded)
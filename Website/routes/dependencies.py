@@ -0,0 +1,26 @@
+"""
+Shared route dependencies.
+"""
+import hmac
+
+from fastapi import Header, HTTPException
+
+import config
+
+
+async def require_admin(x_admin_token: str = Header("")) -> None:
+    """Reject requests without the configured X-Admin-Token (all, if none is configured)."""
+    if not config.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(x_admin_token.encode(), config.ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+async def require_metrics_access(authorization: str = Header("")) -> None:
+    """Hide /metrics when disabled and check the scraper's bearer token when one is configured."""
+    if not config.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if config.METRICS_TOKEN:
+        expected = f"Bearer {config.METRICS_TOKEN}"
+        if not hmac.compare_digest(authorization.encode(), expected.encode()):
+            raise HTTPException(status_code=403, detail="Invalid metrics token")
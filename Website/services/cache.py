@@ -0,0 +1,159 @@
+"""
+Small in-process caches shared by the service layer.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe bounded LRU cache with hit/miss counters."""
+
+    def __init__(self, max_size: int = 1024):
+        """Initialize an empty cache holding at most max_size entries."""
+        self.max_size = max_size
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default on a miss."""
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def items(self, limit: Optional[int] = None) -> List[Tuple[Hashable, Any]]:
+        """Return up to limit (key, value) pairs, most recently used first."""
+        with self._lock:
+            pairs = []
+            for key in reversed(self._data):
+                if limit is not None and len(pairs) >= limit:
+                    break
+                pairs.append((key, self._data[key]))
+            return pairs
+
+    def delete(self, key: Hashable) -> None:
+        """Remove key if it is cached."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all cached entries (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        """Get cache size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TTLCache(LRUCache):
+    """LRUCache whose entries each carry their own expiry time (epoch seconds)."""
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default on a miss or expired entry."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING and entry[1] <= time.time():
+                del self._data[key]
+                entry = _MISSING
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def items(self, limit: Optional[int] = None) -> List[Tuple[Hashable, Any]]:
+        """Return up to limit unexpired (key, value) pairs, most recently used first."""
+        now = time.time()
+        return [
+            (key, entry[0])
+            for key, entry in super().items()
+            if entry[1] > now
+        ][:limit]
+
+    def set(self, key: Hashable, value: Any, expires_at: float = float("inf")) -> None:
+        """Store a value until expires_at, evicting the least recently used entry if full."""
+        super().set(key, (value, expires_at))
+
+
+class LeaderCancelled(RuntimeError):
+    """Raised in SingleFlight waiters when the call they joined was cancelled."""
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent async computations of the same key into one call.
+    Only computations that await (e.g. a threadpool lookup) can overlap; a
+    compute() that never yields finishes before anyone else could join it.
+    """
+
+    def __init__(self):
+        """Initialize with no computations in flight."""
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Await compute() for key, or join the computation already running for it."""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await compute()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                # Only the leader was cancelled: fail the waiters rather than
+                # cancelling them, so their own callers can tell the difference
+                future.set_exception(LeaderCancelled(f"Computation of {key!r} was cancelled"))
+            else:
+                future.set_exception(e)
+            # Mark the exception retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    def in_flight(self) -> int:
+        """Number of keys currently being computed."""
+        return len(self._inflight)
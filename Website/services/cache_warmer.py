@@ -0,0 +1,160 @@
+"""
+Cache pre-warming from a snapshot of the hottest keys of the previous run.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+import config
+from services.calculation_cache import CalculationCache, calculation_cache
+from services.shared_result_cache import SharedResultCache, shared_result_cache
+from services.shared_results_service import SharedResultsService, shared_results_service
+
+logger = logging.getLogger(__name__)
+
+# Yield to the event loop after this many warmed entries
+WARM_BATCH_SIZE = 50
+
+# Most shared combos to warm when there is no snapshot to replay
+POPULAR_COMBO_LIMIT = 100
+
+
+class CacheWarmer:
+    """
+    Saves the most recently used calculation inputs and share page IDs at
+    shutdown and replays them at startup, so a fresh worker starts warm.
+    Without a snapshot, it warms the most shared plant/variant/mutation combos.
+    """
+
+    def __init__(
+        self,
+        calculations: CalculationCache,
+        shares: SharedResultCache,
+        results_service: SharedResultsService,
+        snapshot_file: str,
+        snapshot_size: int = 2000
+    ):
+        """Initialize with the caches to warm and the snapshot location."""
+        self.calculations = calculations
+        self.shares = shares
+        self.results_service = results_service
+        self.snapshot_file = Path(snapshot_file)
+        self.snapshot_size = snapshot_size
+        self.last_run: Optional[dict] = None
+
+    def save_snapshot(self) -> int:
+        """Write the hottest cache keys to the snapshot file; return the entry count."""
+        snapshot = {
+            "data_version": self.calculations.calculator.data_version,
+            "calculations": self.calculations.snapshot(self.snapshot_size),
+            "shares": self.shares.snapshot(self.snapshot_size),
+        }
+        self.snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so concurrent workers never leave a torn file
+        temp_file = self.snapshot_file.with_name(f"{self.snapshot_file.name}.{os.getpid()}.tmp")
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(temp_file, self.snapshot_file)
+        return len(snapshot["calculations"]) + len(snapshot["shares"])
+
+    def load_snapshot(self) -> dict:
+        """
+        Read the snapshot file. Returns an empty snapshot if there is none, or
+        if it was saved under a different data version: its keys were hot
+        for data that has since changed.
+        """
+        try:
+            with open(self.snapshot_file, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            if not isinstance(snapshot, dict):
+                logger.warning("Ignoring malformed cache snapshot")
+            elif snapshot.get("data_version") != self.calculations.calculator.data_version:
+                logger.info(
+                    "Ignoring cache snapshot from data version %s (current %s)",
+                    snapshot.get("data_version"), self.calculations.calculator.data_version
+                )
+            else:
+                return snapshot
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning("Error reading cache snapshot: %s", e)
+        return {}
+
+    async def warm(self, budget: float, render_share_page: Callable[[dict], str]) -> dict:
+        """
+        Warm the calculation, mutation-multiplier and share page caches until
+        done or budget seconds have passed. Returns counts of warmed entries.
+        """
+        deadline = time.monotonic() + budget
+        stats = {"calculations": 0, "combos": 0, "pages": 0, "complete": False}
+        snapshot = await run_in_threadpool(self.load_snapshot)
+
+        for count, inputs in enumerate(snapshot.get("calculations", []), 1):
+            if time.monotonic() > deadline:
+                return self._finish(stats, deadline, budget)
+            try:
+                await self.calculations.calculate(**inputs)
+                stats["calculations"] += 1
+            except (KeyError, TypeError, ValueError):
+                # Inputs from an older data version may no longer exist
+                continue
+            if count % WARM_BATCH_SIZE == 0:
+                await asyncio.sleep(0)
+
+        if not snapshot.get("calculations"):
+            await self._warm_popular_combos(stats, deadline)
+
+        for share_id in snapshot.get("shares", []):
+            if time.monotonic() > deadline:
+                return self._finish(stats, deadline, budget)
+            if await self.shares.get_page(share_id, render_share_page) is not None:
+                stats["pages"] += 1
+
+        stats["complete"] = time.monotonic() <= deadline
+        return self._finish(stats, deadline, budget)
+
+    async def _warm_popular_combos(self, stats: dict, deadline: float) -> None:
+        """Warm multipliers and base-weight results for the most shared combos."""
+        try:
+            popularity = await run_in_threadpool(
+                self.results_service.get_popularity, POPULAR_COMBO_LIMIT
+            )
+        except Exception as e:
+            logger.warning("Skipping popular combos: %s", e)
+            return
+
+        calculator = self.calculations.calculator
+        for combo in popularity["combos"]:
+            if time.monotonic() > deadline:
+                return
+            plant = calculator.plants.get(combo["plant"])
+            if plant is None or combo["variant"] not in calculator.variants:
+                continue
+            await self.calculations.calculate(
+                combo["plant"], combo["variant"], plant.base_weight, combo["mutations"]
+            )
+            stats["combos"] += 1
+
+    def _finish(self, stats: dict, deadline: float, budget: float) -> dict:
+        """Record and log the outcome of a warm-up run."""
+        stats["elapsed"] = round(budget - (deadline - time.monotonic()), 3)
+        self.last_run = stats
+        logger.info("Cache warm-up: %s", stats)
+        return stats
+
+
+# Global warmer instance
+cache_warmer = CacheWarmer(
+    calculation_cache,
+    shared_result_cache,
+    shared_results_service,
+    snapshot_file=config.WARM_SNAPSHOT_FILE,
+    snapshot_size=config.WARM_SNAPSHOT_SIZE
+)
@@ -0,0 +1,284 @@
+"""
+Memoization of calculation results keyed by normalized inputs.
+"""
+import logging
+import struct
+from typing import List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+import config
+from timing import phase
+from services.cache import LRUCache, SingleFlight
+from services.calculator_service import CalculatorService, calculator_service
+from services.shared_memory_cache import SharedMemoryTable, key_digest
+
+logger = logging.getLogger(__name__)
+
+# Shared-memory value layouts: a result is its mutation multiplier, base value,
+# weight ratio and final value (signed 128-bit); a multiplier is one double
+SHARED_RESULT = struct.Struct("<ddd16s")
+SHARED_MULTIPLIER = struct.Struct("<d")
+
+
+class CalculationCache:
+    """
+    Bounded result cache for /api/calculate. Keys are normalized to
+    (data version, plant ID, variant ID, weight, mutation bitmask, amount), so
+    reordered mutation lists share an entry. Misses are computed in the
+    threadpool behind a SingleFlight, so concurrent identical requests wait on
+    one computation instead of each running their own.
+    Optional shared-memory tables back the per-process caches, so results
+    computed by one worker are hits in every other worker.
+    """
+
+    def __init__(
+        self,
+        calculator: CalculatorService,
+        max_size: int = 10000,
+        shared_results: Optional[SharedMemoryTable] = None,
+        shared_multipliers: Optional[SharedMemoryTable] = None
+    ):
+        """Initialize empty result and mutation-multiplier caches."""
+        self.calculator = calculator
+        self.enabled = max_size > 0
+        self._results = LRUCache(max_size=max(max_size, 1))
+        self._multipliers = LRUCache(max_size=4096)
+        self.shared_results = shared_results
+        self.shared_multipliers = shared_multipliers
+        self._flight = SingleFlight()
+
+    def make_key(
+        self,
+        plant_name: str,
+        variant: str,
+        weight: float,
+        mutations: List[str],
+        plant_amount: int
+    ) -> Optional[Tuple]:
+        """
+        Normalize inputs into a cache key. Returns None for inputs the cache
+        can't represent (unknown plant or variant, repeated mutations).
+        """
+        plant_id = self.calculator.plant_ids.get(plant_name)
+        variant_id = self.calculator.variant_ids.get(variant)
+        if plant_id is None or variant_id is None:
+            return None
+        mask = self.calculator.mutation_bitmask(mutations)
+        if mask is None:
+            return None
+        return (
+            self.calculator.data_version,
+            plant_id,
+            variant_id,
+            float(weight),
+            mask,
+            int(plant_amount)
+        )
+
+    async def calculate(
+        self,
+        plant_name: str,
+        variant: str,
+        weight: float,
+        mutations: List[str],
+        plant_amount: int = 1
+    ) -> dict:
+        """Get a CalculationResponse-shaped dict, from cache when possible."""
+        key = None
+        if self.enabled:
+            key = self.make_key(plant_name, variant, weight, mutations, plant_amount)
+        if key is None:
+            with phase("calc"):
+                return self.calculator.calculate_full_value_dict(
+                    plant_name, variant, weight, mutations, plant_amount
+                )
+
+        cached = self._results.get(key)
+        if cached is None:
+            cached = await self._flight.do(
+                key, lambda: self._compute(key, plant_name, variant, weight, mutations, plant_amount)
+            )
+
+        # Echo the caller's mutation order; everything else is shared
+        result = dict(cached)
+        result["mutations"] = mutations
+        return result
+
+    async def _compute(
+        self,
+        key: Tuple,
+        plant_name: str,
+        variant: str,
+        weight: float,
+        mutations: List[str],
+        plant_amount: int
+    ) -> dict:
+        """Fill a result-cache miss from the shared table or a fresh calculation."""
+        digest = key_digest(key) if self.shared_results is not None else None
+        cached = self._get_shared_result(digest, plant_name, variant, weight, mutations, plant_amount)
+        if cached is None:
+            with phase("calc"):
+                cached = await run_in_threadpool(
+                    self._calculate_result, key[4], plant_name, variant, weight, mutations, plant_amount
+                )
+            self._set_shared_result(digest, cached)
+        self._results.set(key, cached)
+        return cached
+
+    def _calculate_result(
+        self,
+        mask: int,
+        plant_name: str,
+        variant: str,
+        weight: float,
+        mutations: List[str],
+        plant_amount: int
+    ) -> dict:
+        """Run the calculation for a miss, using the memoized mutation multiplier."""
+        return self.calculator.calculate_plant_value_dict(
+            plant_name,
+            variant,
+            weight,
+            self.get_mutation_multiplier(mask, mutations),
+            plant_amount,
+            list(mutations)
+        )
+
+    def mutation_multiplier(self, mutations: List[str]) -> float:
+        """Get the multiplier for a mutation list, from the memo when it can be keyed."""
+        mask = self.calculator.mutation_bitmask(mutations) if self.enabled else None
+        if mask is None:
+            return self.calculator.calculate_mutation_multiplier(mutations)
+        return self.get_mutation_multiplier(mask, mutations)
+
+    def get_mutation_multiplier(self, mask: int, mutations: List[str]) -> float:
+        """Get the multiplier for a mutation set, memoized by its bitmask."""
+        key = (self.calculator.data_version, mask)
+        multiplier = self._multipliers.get(key)
+        if multiplier is None:
+            digest = None
+            if self.shared_multipliers is not None:
+                digest = key_digest(key)
+                packed = self.shared_multipliers.get(digest)
+                if packed is not None:
+                    multiplier = SHARED_MULTIPLIER.unpack(packed)[0]
+            if multiplier is None:
+                multiplier = self.calculator.calculate_mutation_multiplier(mutations)
+                if digest is not None:
+                    self.shared_multipliers.set(digest, SHARED_MULTIPLIER.pack(multiplier))
+            self._multipliers.set(key, multiplier)
+        return multiplier
+
+    def _get_shared_result(
+        self,
+        digest: Optional[bytes],
+        plant_name: str,
+        variant: str,
+        weight: float,
+        mutations: List[str],
+        plant_amount: int
+    ) -> Optional[dict]:
+        """Rebuild a result from the shared table, or None on a miss."""
+        if digest is None:
+            return None
+        packed = self.shared_results.get(digest)
+        if packed is None:
+            return None
+        mutation_multi, base_value, weight_ratio, final_bytes = SHARED_RESULT.unpack(packed)
+        final_value = int.from_bytes(final_bytes, "little", signed=True)
+        return {
+            "plant_name": plant_name,
+            "variant": variant,
+            "weight": weight,
+            "mutations": list(mutations),
+            "mutation_multiplier": mutation_multi,
+            "base_value": base_value,
+            "weight_ratio": weight_ratio,
+            "final_value": final_value,
+            "plant_amount": plant_amount,
+            "total_value": final_value * plant_amount
+        }
+
+    def _set_shared_result(self, digest: Optional[bytes], fields: dict) -> None:
+        """Publish a computed result to the shared table."""
+        if digest is None:
+            return
+        try:
+            final_bytes = fields["final_value"].to_bytes(16, "little", signed=True)
+        except OverflowError:
+            # Doesn't fit the fixed-size slot; keep it process-local
+            return
+        self.shared_results.set(digest, SHARED_RESULT.pack(
+            fields["mutation_multiplier"], fields["base_value"], fields["weight_ratio"], final_bytes
+        ))
+
+    def open_shared(self, name: str, slots: int) -> bool:
+        """
+        Attach the shared-memory tables named after name; returns whether they
+        are in use. Call it in each worker after forking: the tables' write
+        locks are per open file, so a table opened before the fork would hand
+        every worker the same lock.
+        """
+        self.close_shared()
+        self.shared_results, self.shared_multipliers = open_shared_tables(name, slots)
+        return self.shared_results is not None
+
+    def close_shared(self) -> None:
+        """Detach from the shared-memory tables, leaving them for other workers."""
+        for table in (self.shared_results, self.shared_multipliers):
+            if table is not None:
+                table.close()
+        self.shared_results = self.shared_multipliers = None
+
+    def snapshot(self, limit: int) -> List[dict]:
+        """Inputs of up to limit cached results, most recently used first."""
+        return [
+            {
+                "plant_name": result["plant_name"],
+                "variant": result["variant"],
+                "weight": result["weight"],
+                "mutations": result["mutations"],
+                "plant_amount": result["plant_amount"]
+            }
+            for key, result in self._results.items(limit)
+        ]
+
+    def clear(self) -> None:
+        """Drop all memoized results and multipliers."""
+        self._results.clear()
+        self._multipliers.clear()
+
+    def stats(self) -> dict:
+        """Get hit/miss counters for the result and multiplier caches."""
+        return {
+            "enabled": self.enabled,
+            "data_version": self.calculator.data_version,
+            "results": self._results.stats(),
+            "coalesced": self._flight.coalesced,
+            "in_flight": self._flight.in_flight(),
+            "mutation_multipliers": self._multipliers.stats(),
+            "shared_results": self.shared_results.stats() if self.shared_results else None,
+            "shared_multipliers": self.shared_multipliers.stats() if self.shared_multipliers else None
+        }
+
+
+def open_shared_tables(name: str, slots: int) -> Tuple[Optional[SharedMemoryTable], Optional[SharedMemoryTable]]:
+    """
+    Create or attach the shared result and multiplier tables named after name.
+    Returns (None, None) when name is empty or shared memory is unavailable.
+    """
+    if not name:
+        return None, None
+    try:
+        return (
+            SharedMemoryTable(f"{name}_results", slots, SHARED_RESULT.size),
+            SharedMemoryTable(f"{name}_multipliers", max(slots // 16, 1024), SHARED_MULTIPLIER.size)
+        )
+    except (OSError, ValueError) as e:
+        logger.warning("Shared memory cache disabled: %s", e)
+        return None, None
+
+
+# Global cache instance; the app attaches the shared tables at startup
+calculation_cache = CalculationCache(calculator_service, max_size=config.CALCULATION_CACHE_SIZE)
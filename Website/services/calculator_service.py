@@ -1,64 +1,224 @@
 """
 Calculator service containing the core business logic.
 """
+import hashlib
 import json
 import os
-from typing import Dict, List
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 from pathlib import Path
 
+from metrics import metrics
 from models.calculator import PlantData, VariantData, MutationData, CalculationResponse
+from services.cache import LRUCache
+
+
+# Expected weight window as a fraction of base_weight
+WEIGHT_RANGE_MIN_RATIO = 0.7
+WEIGHT_RANGE_MAX_RATIO = 1.4
+
+# Game clamp applied to weight / base_weight before squaring
+MIN_WEIGHT_RATIO = 0.95
+MAX_WEIGHT_RATIO = 100000000
+
+# Engine work, so /metrics shows how much the caches in front of it save
+ENGINE_CALCULATIONS = metrics.counter(
+    "growcalc_engine_calculations_total", "Plant values computed by the engine", ("path",)
+)
+ENGINE_MULTIPLIERS = metrics.counter(
+    "growcalc_engine_mutation_multipliers_total", "Mutation multipliers computed by the engine"
+)
+
+
+class CatalogTables:
+    """The loaded data files and the lookup tables derived from them."""
+
+    def __init__(
+        self,
+        plants: Dict[str, PlantData],
+        variants: Dict[str, VariantData],
+        mutations: Dict[str, MutationData],
+        traits: Dict[str, List[str]],
+        data_version: str
+    ):
+        """Hold the data models and build the lookup tables for batch valuation."""
+        self.plants = plants
+        self.variants = variants
+        self.mutations = mutations
+        self.traits = traits
+        self.data_version = data_version
+
+        # Compact integer IDs for cache keys
+        self.plant_ids: Dict[str, int] = {
+            name: index for index, name in enumerate(sorted(plants))
+        }
+        self.variant_ids: Dict[str, int] = {
+            name: index for index, name in enumerate(variants)
+        }
+        self.plant_factors: Dict[str, Tuple[int, float]] = {
+            name: (plant.base_price, plant.base_weight)
+            for name, plant in plants.items()
+        }
+        self.variant_multipliers: Dict[str, int] = {
+            name: variant.multiplier for name, variant in variants.items()
+        }
+        # Each mutation contributes (ValueMulti - 1) to the additive total
+        self.mutation_bonuses: Dict[str, int] = {
+            name: mutation.value_multi - 1 for name, mutation in mutations.items()
+        }
+        # Stable bit per mutation so unordered mutation sets can key caches
+        self.mutation_bits: Dict[str, int] = {
+            name: 1 << index for index, name in enumerate(sorted(mutations))
+        }
+        # Ranking orders at base weight. Variant and mutation multipliers scale
+        # every plant by the same factor, so one order serves every combination.
+        self.ranking_index: Dict[str, List[str]] = {
+            "value": sorted(
+                plants,
+                key=lambda name: (-plants[name].base_price, name)
+            ),
+            "value_per_kg": sorted(
+                plants,
+                key=lambda name: (
+                    -plants[name].base_price / plants[name].base_weight,
+                    name
+                )
+            )
+        }
 
 
 class CalculatorService:
     """Service class for plant value calculations."""
     
     def __init__(self):
-        """Initialize the service by loading data files."""
+        """Initialize without loading; the data files are read on first use."""
         self.data_dir = Path(__file__).parent.parent / "data"
-        self.plants: Dict[str, PlantData] = {}
-        self.variants: Dict[str, VariantData] = {}
-        self.mutations: Dict[str, MutationData] = {}
-        self._load_data()
+        self._load_lock = threading.Lock()
+        self._tables: Optional[CatalogTables] = None
+        self._distribution_cache = LRUCache(max_size=4096)
+        self._catalog_json: Optional[bytes] = None
+    
+    @property
+    def loaded(self) -> bool:
+        """Whether the data files have been loaded."""
+        return self._tables is not None
+    
+    def ensure_loaded(self) -> CatalogTables:
+        """Load the data files and build the lookup tables, once; safe from any thread."""
+        tables = self._tables
+        if tables is None:
+            with self._load_lock:
+                if self._tables is None:
+                    self._tables = self._load_data()
+                tables = self._tables
+        return tables
+    
+    @property
+    def plants(self) -> Dict[str, PlantData]:
+        """Plant data by name, loading the data files on first use."""
+        return self.ensure_loaded().plants
+    
+    @property
+    def variants(self) -> Dict[str, VariantData]:
+        """Variant data by name, loading the data files on first use."""
+        return self.ensure_loaded().variants
     
-    def _load_data(self) -> None:
-        """Load plant, variant, and mutation data from JSON files."""
+    @property
+    def mutations(self) -> Dict[str, MutationData]:
+        """Mutation data by name, loading the data files on first use."""
+        return self.ensure_loaded().mutations
+    
+    @property
+    def traits(self) -> Dict[str, List[str]]:
+        """Plant names by trait, loading the data files on first use."""
+        return self.ensure_loaded().traits
+    
+    @property
+    def data_version(self) -> str:
+        """Short content hash of the data files, loading them on first use."""
+        return self.ensure_loaded().data_version
+    
+    @property
+    def plant_ids(self) -> Dict[str, int]:
+        """Compact integer plant IDs for cache keys."""
+        return self.ensure_loaded().plant_ids
+    
+    @property
+    def variant_ids(self) -> Dict[str, int]:
+        """Compact integer variant IDs for cache keys."""
+        return self.ensure_loaded().variant_ids
+    
+    def _load_data(self) -> CatalogTables:
+        """Load plant, variant, mutation, and trait data from JSON files."""
+        digest = hashlib.sha256()
+        
         # Load plants
-        plants_file = self.data_dir / "plants.json"
-        with open(plants_file, 'r', encoding='utf-8') as f:
-            plants_data = json.load(f)
-            for name, data in plants_data.items():
-                self.plants[name] = PlantData(
-                    name=name,
-                    base_weight=data["base_weight"],
-                    base_price=data["base_price"],
-                    rarity=data["rarity"]
-                )
+        plants_data = self._read_json("plants.json", digest)
+        plants = {}
+        for name, data in plants_data.items():
+            plants[name] = PlantData(
+                name=name,
+                base_weight=data["base_weight"],
+                base_price=data["base_price"],
+                rarity=data["rarity"]
+            )
         
         # Load variants
-        variants_file = self.data_dir / "variants.json"
-        with open(variants_file, 'r', encoding='utf-8') as f:
-            variants_data = json.load(f)
-            for name, data in variants_data.items():
-                self.variants[name] = VariantData(
-                    name=name,
-                    multiplier=data["multiplier"]
-                )
+        variants_data = self._read_json("variants.json", digest)
+        variants = {}
+        for name, data in variants_data.items():
+            variants[name] = VariantData(
+                name=name,
+                multiplier=data["multiplier"]
+            )
         
         # Load mutations
-        mutations_file = self.data_dir / "mutations.json"
-        with open(mutations_file, 'r', encoding='utf-8') as f:
-            mutations_data = json.load(f)
-            for name, data in mutations_data.items():
-                self.mutations[name] = MutationData(
-                    name=name,
-                    value_multi=data["value_multi"]
-                )
+        mutations_data = self._read_json("mutations.json", digest)
+        mutations = {}
+        for name, data in mutations_data.items():
+            mutations[name] = MutationData(
+                name=name,
+                value_multi=data["value_multi"]
+            )
+        
+        # Load traits
+        traits = self._read_json("traits.json", digest)
+        
+        # Short content hash of the data files; cache keys include it so cached
+        # results never outlive a data update. The tables are published whole,
+        # so readers on other threads never see a partial load
+        return CatalogTables(plants, variants, mutations, traits, digest.hexdigest()[:12])
+    
+    def _read_json(self, filename: str, digest) -> dict:
+        """Read a data file, folding its raw bytes into the data-version digest."""
+        with open(self.data_dir / filename, 'rb') as f:
+            raw = f.read()
+        digest.update(raw)
+        return json.loads(raw.decode('utf-8'))
+    
+    def mutation_bitmask(self, mutations: Sequence[str]) -> Optional[int]:
+        """
+        Encode a mutation list as a bitmask of known mutations.
+        Unknown names are dropped since they don't affect the multiplier; returns
+        None when a mutation repeats, which a bitmask can't represent.
+        """
+        mutation_bits = self.ensure_loaded().mutation_bits
+        mask = 0
+        for mutation_name in mutations:
+            bit = mutation_bits.get(mutation_name)
+            if bit is None:
+                continue
+            if mask & bit:
+                return None
+            mask |= bit
+        return mask
     
     def calculate_mutation_multiplier(self, selected_mutations: List[str]) -> float:
         """
         Calculate mutation multiplier using the additive game formula.
         Formula: total = 1 + (mut1-1) + (mut2-1) + (mut3-1) + ...
         """
+        ENGINE_MULTIPLIERS.inc()
         if not selected_mutations:
             return 1.0
         
@@ -86,6 +246,26 @@ class CalculatorService:
         """
         Calculate plant value using the exact formula from the game.
         """
+        return CalculationResponse(
+            **self.calculate_plant_value_dict(
+                plant_name, variant, weight, mutation_multi, plant_amount
+            )
+        )
+    
+    def calculate_plant_value_dict(
+        self,
+        plant_name: str,
+        variant: str,
+        weight: float,
+        mutation_multi: float,
+        plant_amount: int = 1,
+        mutations: Optional[List[str]] = None
+    ) -> dict:
+        """
+        Run the game formula and return the fields of a CalculationResponse, in
+        field order, as a plain dict.
+        """
+        ENGINE_CALCULATIONS.inc("single")
         plant_data = self.plants[plant_name]
         variant_data = self.variants[variant]
         
@@ -101,7 +281,7 @@ class CalculatorService:
         weight_ratio = weight / base_weight
         
         # Clamp weight ratio (minimum 0.95, maximum 100000000)
-        clamped_ratio = max(0.95, min(weight_ratio, 100000000))
+        clamped_ratio = max(MIN_WEIGHT_RATIO, min(weight_ratio, MAX_WEIGHT_RATIO))
         
         # Final value = base_value * (clamped_ratio^2)
         final_value = base_value * (clamped_ratio * clamped_ratio)
@@ -109,18 +289,18 @@ class CalculatorService:
         # Calculate bulk totals
         total_value = round(final_value) * plant_amount
         
-        return CalculationResponse(
-            plant_name=plant_name,
-            variant=variant,
-            weight=weight,
-            mutations=[],  # Will be filled by the calling function
-            mutation_multiplier=mutation_multi,
-            base_value=base_value,
-            weight_ratio=weight_ratio,
-            final_value=round(final_value),
-            plant_amount=plant_amount,
-            total_value=total_value
-        )
+        return {
+            "plant_name": plant_name,
+            "variant": variant,
+            "weight": weight,
+            "mutations": [] if mutations is None else mutations,
+            "mutation_multiplier": mutation_multi,
+            "base_value": base_value,
+            "weight_ratio": weight_ratio,
+            "final_value": round(final_value),
+            "plant_amount": plant_amount,
+            "total_value": total_value
+        }
     
     def calculate_full_value(
         self,
@@ -133,18 +313,147 @@ class CalculatorService:
         """
         Calculate full plant value including mutations.
         """
-        # Calculate mutation multiplier
+        return CalculationResponse(
+            **self.calculate_full_value_dict(
+                plant_name, variant, weight, mutations, plant_amount
+            )
+        )
+    
+    def calculate_full_value_dict(
+        self,
+        plant_name: str,
+        variant: str,
+        weight: float,
+        mutations: List[str],
+        plant_amount: int = 1
+    ) -> dict:
+        """
+        Calculate full plant value as a plain dict shaped like CalculationResponse.
+        Skips model construction for callers that serialize the result directly.
+        """
         mutation_multi = self.calculate_mutation_multiplier(mutations)
-        
-        # Calculate plant value
-        result = self.calculate_plant_value(
-            plant_name, variant, weight, mutation_multi, plant_amount
+        return self.calculate_plant_value_dict(
+            plant_name, variant, weight, mutation_multi, plant_amount, mutations
         )
+    
+    def calculate_batch(
+        self,
+        rows: Iterable[Tuple[str, str, float, Sequence[str], int]]
+    ) -> List[dict]:
+        """
+        Value many (plant_name, variant, weight, mutations, plant_amount) rows at once.
+        Uses the same formula as calculate_full_value but skips building response
+        models; rows that can't be valued get an "error" entry instead of raising.
+        """
+        tables = self.ensure_loaded()
+        plant_factors = tables.plant_factors
+        variant_multipliers = tables.variant_multipliers
+        mutation_bonuses = tables.mutation_bonuses
         
-        # Add mutations to response
-        result.mutations = mutations
+        results = []
+        for plant_name, variant, weight, mutations, plant_amount in rows:
+            factors = plant_factors.get(plant_name)
+            if factors is None:
+                results.append({"error": f"Unknown plant: {plant_name}"})
+                continue
+            variant_multiplier = variant_multipliers.get(variant)
+            if variant_multiplier is None:
+                results.append({"error": f"Unknown variant: {variant}"})
+                continue
+            
+            mutation_multi = 1.0
+            for mutation_name in mutations:
+                bonus = mutation_bonuses.get(mutation_name)
+                if bonus is not None:
+                    mutation_multi = mutation_multi + bonus
+            mutation_multi = max(1.0, mutation_multi)
+            
+            base_price, base_weight = factors
+            base_value = base_price * mutation_multi * variant_multiplier
+            weight_ratio = weight / base_weight
+            clamped_ratio = max(MIN_WEIGHT_RATIO, min(weight_ratio, MAX_WEIGHT_RATIO))
+            final_value = round(base_value * (clamped_ratio * clamped_ratio))
+            
+            results.append({
+                "mutation_multiplier": mutation_multi,
+                "base_value": base_value,
+                "weight_ratio": weight_ratio,
+                "final_value": final_value,
+                "total_value": final_value * plant_amount
+            })
         
-        return result
+        ENGINE_CALCULATIONS.inc("batch", amount=len(results))
+        return results
+    
+    def get_top_plants(
+        self,
+        metric: str,
+        variant: str,
+        mutations: List[str],
+        limit: int = 10
+    ) -> List[dict]:
+        """
+        Get the top plants at base weight by "value" or "value_per_kg".
+        Reads the precomputed ranking index, so only the returned rows are valued.
+        """
+        tables = self.ensure_loaded()
+        ranking = tables.ranking_index[metric]
+        variant_multiplier = tables.variants[variant].multiplier
+        mutation_multi = self.calculate_mutation_multiplier(mutations)
+        
+        top_plants = []
+        for rank, plant_name in enumerate(ranking[:limit], start=1):
+            base_price, base_weight = tables.plant_factors[plant_name]
+            # At base weight the ratio is exactly 1, so value is the base value
+            base_value = base_price * mutation_multi * variant_multiplier
+            top_plants.append({
+                "rank": rank,
+                "plant_name": plant_name,
+                "base_weight": base_weight,
+                "value": round(base_value),
+                "value_per_kg": round(base_value / base_weight, 2)
+            })
+        return top_plants
+    
+    def get_catalog(self) -> dict:
+        """
+        Get the whole dataset in a compact form for client-side calculation.
+        Plants are [base_weight, base_price, rarity, weight_min, weight_max].
+        """
+        return {
+            "version": self.data_version,
+            "weight_ratio_clamp": [MIN_WEIGHT_RATIO, MAX_WEIGHT_RATIO],
+            "plants": {
+                name: [
+                    plant.base_weight,
+                    plant.base_price,
+                    plant.rarity,
+                    round(plant.base_weight * WEIGHT_RANGE_MIN_RATIO, 4),
+                    round(plant.base_weight * WEIGHT_RANGE_MAX_RATIO, 4)
+                ]
+                for name, plant in sorted(self.plants.items())
+            },
+            "variants": {
+                name: variant.multiplier for name, variant in self.variants.items()
+            },
+            "mutations": {
+                name: mutation.value_multi
+                for name, mutation in sorted(self.mutations.items())
+            },
+            "traits": self.traits
+        }
+    
+    def get_catalog_json(self) -> bytes:
+        """Get the catalog encoded once as compact JSON bytes."""
+        if self._catalog_json is None:
+            self._catalog_json = json.dumps(
+                self.get_catalog(), separators=(",", ":"), ensure_ascii=False
+            ).encode("utf-8")
+        return self._catalog_json
+    
+    def get_distribution_cache_stats(self) -> dict:
+        """Get hit/miss counters for the value distribution cache."""
+        return self._distribution_cache.stats()
     
     def get_plants(self) -> List[PlantData]:
         """Get sorted list of all plant data objects."""
@@ -172,14 +481,76 @@ class CalculatorService:
             return {"min": 0.0, "max": 0.0}
         
         base_weight = plant_data.base_weight
-        min_weight = round(base_weight * 0.7, 4)
-        max_weight = round(base_weight * 1.4, 4)
+        min_weight = round(base_weight * WEIGHT_RANGE_MIN_RATIO, 4)
+        max_weight = round(base_weight * WEIGHT_RANGE_MAX_RATIO, 4)
         
         return {
             "min": min_weight,
             "max": max_weight,
             "base": base_weight
         }
+    
+    def get_value_distribution(
+        self,
+        plant_name: str,
+        variant: str,
+        mutations: List[str],
+        percentiles: Sequence[float] = (5, 25, 50, 75, 95)
+    ) -> dict:
+        """
+        Get the value spread over the expected weight range, assuming weights are
+        uniform between 0.7x and 1.4x base_weight. Value is monotonic in weight,
+        so percentiles map straight through the squared-ratio formula and the
+        expected value is integrated in closed form. Cached per
+        (plant, variant, mutation bitmask, percentiles).
+        """
+        mask = self.mutation_bitmask(mutations)
+        cache_key = None
+        if mask is not None:
+            cache_key = (plant_name, variant, mask, tuple(percentiles))
+            cached = self._distribution_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        plant_data = self.plants[plant_name]
+        variant_data = self.variants[variant]
+        mutation_multi = self.calculate_mutation_multiplier(mutations)
+        base_value = plant_data.base_price * mutation_multi * variant_data.multiplier
+        
+        low, high = WEIGHT_RANGE_MIN_RATIO, WEIGHT_RANGE_MAX_RATIO
+        
+        def value_at(ratio: float) -> int:
+            clamped_ratio = max(MIN_WEIGHT_RATIO, min(ratio, MAX_WEIGHT_RATIO))
+            return round(base_value * (clamped_ratio * clamped_ratio))
+        
+        # E[max(0.95, r)^2] for r ~ U(low, high): the clamped part is a flat
+        # 0.95^2 floor, the rest integrates r^2 dr
+        floor_span = max(0.0, min(MIN_WEIGHT_RATIO, high) - low)
+        curve_low = max(MIN_WEIGHT_RATIO, low)
+        expected_factor = (
+            floor_span * MIN_WEIGHT_RATIO * MIN_WEIGHT_RATIO
+            + (high ** 3 - curve_low ** 3) / 3
+        ) / (high - low)
+        
+        result = {
+            "plant_name": plant_name,
+            "variant": variant,
+            "mutation_multiplier": mutation_multi,
+            "weight_min": round(plant_data.base_weight * low, 4),
+            "weight_max": round(plant_data.base_weight * high, 4),
+            "min_value": value_at(low),
+            "max_value": value_at(high),
+            "expected_value": round(base_value * expected_factor, 2),
+            "floor_probability": round(floor_span / (high - low), 4),
+            "percentiles": {
+                f"p{p:g}": value_at(low + (high - low) * p / 100)
+                for p in percentiles
+            }
+        }
+        
+        if cache_key is not None:
+            self._distribution_cache.set(cache_key, result)
+        return result
 
 
 # Global service instance
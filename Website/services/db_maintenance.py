@@ -0,0 +1,176 @@
+"""
+Throttled maintenance of the shared results database: expiry cleanup, online
+backup, incremental vacuum, statistics refresh and integrity checks.
+"""
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Union
+
+from services.shared_results_service import SharedResultsService
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseMaintenance:
+    """
+    Maintenance operations that are safe to run against the live database.
+    Long writes work in small steps (step_pages pages or step_rows rows) and
+    sleep between them, so each write lock is held only briefly and
+    /api/share requests keep flowing.
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        step_pages: int = 256,
+        step_rows: int = 500,
+        sleep: float = 0.05,
+        busy_timeout_ms: int = 5000
+    ):
+        """Initialize with the database path and throttling settings."""
+        self.db_path = Path(db_path)
+        self.step_pages = step_pages
+        self.step_rows = step_rows
+        self.sleep = sleep
+        self.busy_timeout_ms = busy_timeout_ms
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open an autocommit connection that waits on locks instead of failing."""
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        return conn
+
+    def delete_expired(self) -> int:
+        """
+        Delete expired shared results step_rows at a time, taking each step out
+        of the popularity aggregates in the same transaction; return the count deleted.
+        """
+        conn = self._connect()
+        try:
+            now = datetime.utcnow().isoformat()
+            deleted = 0
+            while True:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                try:
+                    cursor.execute("""
+                        SELECT rowid, plant, variant, mutations FROM shared_results
+                        WHERE expires_at < ? LIMIT ?
+                    """, (now, self.step_rows))
+                    expired = cursor.fetchall()
+                    if expired:
+                        cursor.execute(f"""
+                            DELETE FROM shared_results
+                            WHERE rowid IN ({','.join('?' * len(expired))})
+                        """, [row[0] for row in expired])
+                        SharedResultsService.forget_popularity(cursor, [row[1:] for row in expired])
+                    cursor.execute("COMMIT")
+                except BaseException:
+                    cursor.execute("ROLLBACK")
+                    raise
+                deleted += len(expired)
+                if len(expired) < self.step_rows:
+                    break
+                time.sleep(self.sleep)
+            if deleted:
+                logger.info("Deleted %d expired shared results", deleted)
+            return deleted
+        finally:
+            conn.close()
+
+    def backup(self, destination: Union[str, Path]) -> None:
+        """
+        Write a consistent, compacted copy of the database to destination with
+        VACUUM INTO. It copies one read snapshot in a single pass, so unlike a
+        paged online backup, concurrent writes can't keep restarting it (and
+        under WAL it doesn't block them). The copy is written beside
+        destination and renamed into place, so a failed backup leaves no
+        partial file.
+        """
+        destination = Path(destination)
+        partial = destination.with_name(destination.name + ".partial")
+        partial.unlink(missing_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("VACUUM INTO ?", (str(partial),))
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+        finally:
+            conn.close()
+        os.replace(partial, destination)
+        logger.info("Backed up %s to %s", self.db_path, destination)
+
+    def incremental_vacuum(self, convert: bool = False) -> int:
+        """
+        Return free pages to the filesystem step_pages at a time; returns the
+        number of pages freed. Needs auto_vacuum=INCREMENTAL. When the database
+        isn't in that mode, convert=True switches it with a one-off full VACUUM
+        (which locks the database for its duration); otherwise nothing is done.
+        """
+        conn = self._connect()
+        try:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                if not convert:
+                    logger.warning(
+                        "auto_vacuum is not INCREMENTAL; skipping vacuum "
+                        "(use --convert-auto-vacuum to switch with a one-off full VACUUM)"
+                    )
+                    return 0
+                logger.info("Switching to auto_vacuum=INCREMENTAL with a full VACUUM")
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+
+            freed = 0
+            while True:
+                free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if free_pages == 0:
+                    break
+                step = min(free_pages, self.step_pages)
+                # execute() steps the pragma once, freeing a single page;
+                # executescript() runs it to completion
+                conn.executescript(f"PRAGMA incremental_vacuum({step});")
+                step_freed = free_pages - conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if step_freed <= 0:
+                    break
+                freed += step_freed
+                time.sleep(self.sleep)
+            if freed:
+                # Under WAL the file only shrinks once the freed pages are checkpointed
+                conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+                logger.info("Incremental vacuum freed %d pages", freed)
+            return freed
+        finally:
+            conn.close()
+
+    def optimize(self) -> None:
+        """Refresh query planner statistics with a bounded ANALYZE and PRAGMA optimize."""
+        conn = self._connect()
+        try:
+            # Sample at most ~1000 rows per index so ANALYZE stays fast on large tables
+            conn.execute("PRAGMA analysis_limit = 1000")
+            conn.execute("ANALYZE")
+            conn.execute("PRAGMA optimize")
+            logger.info("Refreshed query planner statistics")
+        finally:
+            conn.close()
+
+    def integrity_check(self, full: bool = False) -> bool:
+        """Run PRAGMA quick_check (or integrity_check when full); return True if OK."""
+        conn = self._connect()
+        try:
+            pragma = "integrity_check" if full else "quick_check"
+            problems = [row[0] for row in conn.execute(f"PRAGMA {pragma}").fetchall()]
+            if problems == ["ok"]:
+                logger.info("%s: ok", pragma)
+                return True
+            for problem in problems:
+                logger.error("%s: %s", pragma, problem)
+            return False
+        finally:
+            conn.close()
+
@@ -0,0 +1,277 @@
+"""
+Service for valuing large inventories streamed as NDJSON or CSV.
+"""
+import csv
+import json
+import math
+from typing import AsyncIterator, List, Optional, Tuple
+
+from services.calculator_service import CalculatorService, calculator_service
+
+
+class InventoryValuationService:
+    """Values inventory lines in fixed-size chunks so memory stays bounded."""
+
+    def __init__(
+        self,
+        calculator: CalculatorService,
+        chunk_size: int = 1000,
+        max_line_bytes: int = 64 * 1024
+    ):
+        """Initialize the service with the calculator engine and chunk limits."""
+        self.calculator = calculator
+        self.chunk_size = chunk_size
+        self.max_line_bytes = max_line_bytes
+
+    async def value_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        input_format: str = "ndjson",
+        max_bytes: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Value an inventory streamed in arbitrary byte chunks.
+        Yields NDJSON: one "result" or "error" record per input line, a "totals"
+        record after every valued chunk and a final "summary" record. A body
+        over max_bytes ends with an "error" record without a line number before
+        the summary; lines received up to that point are still valued.
+        """
+        if input_format == "csv":
+            parser = _CsvLineParser()
+        else:
+            parser = _NdjsonLineParser()
+
+        totals = {"lines": 0, "valued": 0, "errors": 0, "total_value": 0}
+        pending: List[Tuple[int, Optional[tuple], Optional[str]]] = []
+        lines = self._iter_lines(chunks, max_bytes)
+
+        async for line_no, text in lines:
+            if text is None:
+                pending.append((line_no, None, f"Line exceeds {self.max_line_bytes} bytes"))
+            else:
+                try:
+                    row = parser.parse(text)
+                except ValueError as e:
+                    pending.append((line_no, None, str(e)))
+                else:
+                    if row is None:
+                        continue
+                    pending.append((line_no, row, None))
+
+            if len(pending) >= self.chunk_size:
+                yield self._value_chunk(pending, totals)
+                pending = []
+
+        if pending:
+            yield self._value_chunk(pending, totals)
+
+        if lines.truncated:
+            yield _encode({
+                "type": "error",
+                "line": None,
+                "error": f"Inventory body exceeds {max_bytes} bytes"
+            })
+        yield _encode({"type": "summary", **totals})
+
+    def _value_chunk(
+        self,
+        pending: List[Tuple[int, Optional[tuple], Optional[str]]],
+        totals: dict
+    ) -> bytes:
+        """Value one chunk of parsed lines and encode its output records."""
+        valued = self.calculator.calculate_batch(
+            row for _, row, _ in pending if row is not None
+        )
+        valued_iter = iter(valued)
+
+        records = []
+        for line_no, row, error in pending:
+            totals["lines"] += 1
+            if row is not None:
+                result = next(valued_iter)
+                error = result.get("error")
+                if error is None:
+                    plant_name, variant, weight, mutations, plant_amount = row
+                    totals["valued"] += 1
+                    totals["total_value"] += result["total_value"]
+                    records.append({
+                        "type": "result",
+                        "line": line_no,
+                        "plant_name": plant_name,
+                        "variant": variant,
+                        "weight": weight,
+                        "mutations": mutations,
+                        "plant_amount": plant_amount,
+                        "mutation_multiplier": result["mutation_multiplier"],
+                        "final_value": result["final_value"],
+                        "total_value": result["total_value"]
+                    })
+                    continue
+            totals["errors"] += 1
+            records.append({"type": "error", "line": line_no, "error": error})
+
+        records.append({"type": "totals", **totals})
+        return b"".join(_encode(record) for record in records)
+
+    def _iter_lines(
+        self,
+        chunks: AsyncIterator[bytes],
+        max_bytes: Optional[int] = None
+    ) -> "_LineSplitter":
+        """Split a byte stream into numbered text lines without buffering the body."""
+        return _LineSplitter(chunks, self.max_line_bytes, max_bytes)
+
+
+class _LineSplitter:
+    """
+    Splits a byte stream into numbered text lines as chunks arrive.
+    Lines longer than max_line_bytes are reported once as None and skipped.
+    Reading stops once more than max_bytes have arrived; truncated is then set
+    and the incomplete trailing line is dropped.
+    """
+
+    def __init__(
+        self,
+        chunks: AsyncIterator[bytes],
+        max_line_bytes: int,
+        max_bytes: Optional[int] = None
+    ):
+        """Wrap a chunk stream with per-line and whole-body byte limits."""
+        self.chunks = chunks
+        self.max_line_bytes = max_line_bytes
+        self.max_bytes = max_bytes
+        self.truncated = False
+
+    async def __aiter__(self) -> AsyncIterator[Tuple[int, Optional[str]]]:
+        """Yield (line number, text) pairs, with None text for overlong lines."""
+        buffer = b""
+        line_no = 0
+        received = 0
+        overflowed = False
+
+        async for chunk in self.chunks:
+            if not chunk:
+                continue
+            received += len(chunk)
+            if self.max_bytes is not None and received > self.max_bytes:
+                # Only whole lines within the limit are kept
+                chunk = chunk[:len(chunk) - (received - self.max_bytes)]
+                self.truncated = True
+            buffer += chunk
+            start = 0
+            while True:
+                end = buffer.find(b"\n", start)
+                if end == -1:
+                    break
+                line = buffer[start:end]
+                start = end + 1
+                line_no += 1
+                if overflowed:
+                    overflowed = False
+                    continue
+                if len(line) > self.max_line_bytes:
+                    yield line_no, None
+                    continue
+                yield line_no, _decode(line)
+            buffer = buffer[start:]
+            if self.truncated:
+                return
+
+            if len(buffer) > self.max_line_bytes and not overflowed:
+                overflowed = True
+                yield line_no + 1, None
+            if overflowed:
+                buffer = b""
+
+        if buffer and not overflowed:
+            yield line_no + 1, _decode(buffer)
+
+
+class _NdjsonLineParser:
+    """Parses one JSON object per line into a batch row."""
+
+    def parse(self, text: str) -> Optional[tuple]:
+        """Parse a line, returning None for blank lines."""
+        if not text.strip():
+            return None
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e.msg}")
+        if not isinstance(data, dict):
+            raise ValueError("Expected a JSON object")
+        return _build_row(
+            data.get("plant_name"),
+            data.get("variant", "Normal"),
+            data.get("weight"),
+            data.get("mutations", []),
+            data.get("plant_amount", 1)
+        )
+
+
+class _CsvLineParser:
+    """Parses CSV lines into batch rows; the first non-blank line is the header."""
+
+    def __init__(self):
+        """Start without a header."""
+        self.columns: Optional[List[str]] = None
+
+    def parse(self, text: str) -> Optional[tuple]:
+        """Parse a line, returning None for blank lines and the header."""
+        if not text.strip():
+            return None
+        fields = next(csv.reader([text]))
+
+        if self.columns is None:
+            columns = [field.strip().lower() for field in fields]
+            if "plant_name" not in columns or "weight" not in columns:
+                raise ValueError("CSV header must include plant_name and weight columns")
+            self.columns = columns
+            return None
+
+        data = dict(zip(self.columns, (field.strip() for field in fields)))
+        mutations = data.get("mutations") or ""
+        return _build_row(
+            data.get("plant_name"),
+            data.get("variant") or "Normal",
+            data.get("weight"),
+            [name.strip() for name in mutations.split(";") if name.strip()],
+            data.get("plant_amount") or 1
+        )
+
+
+def _build_row(plant_name, variant, weight, mutations, plant_amount) -> tuple:
+    """Validate raw line fields with the same limits as CalculationRequest."""
+    if not isinstance(plant_name, str) or not plant_name:
+        raise ValueError("Missing plant_name")
+    if not isinstance(variant, str):
+        raise ValueError("Invalid variant")
+    try:
+        weight = float(weight)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid weight")
+    if not weight > 0 or not math.isfinite(weight):
+        raise ValueError("Weight must be a finite number greater than 0")
+    if not isinstance(mutations, list) or not all(isinstance(m, str) for m in mutations):
+        raise ValueError("Mutations must be a list of names")
+    try:
+        plant_amount = int(plant_amount)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid plant_amount")
+    if not 1 <= plant_amount <= 10000:
+        raise ValueError("plant_amount must be between 1 and 10000")
+    return plant_name, variant, weight, mutations, plant_amount
+
+
+def _decode(line: bytes) -> str:
+    """Decode a raw line, tolerating CRLF endings and bad bytes."""
+    return line.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+def _encode(record: dict) -> bytes:
+    """Encode a record as one compact NDJSON line."""
+    return json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+# Global service instance
+inventory_service = InventoryValuationService(calculator_service)
@@ -0,0 +1,120 @@
+"""
+Live calculation sessions driven by compact input deltas over a WebSocket.
+"""
+import asyncio
+import json
+import logging
+import math
+from typing import Optional
+
+from services.calculation_cache import CalculationCache, calculation_cache
+
+logger = logging.getLogger(__name__)
+
+# Compact delta keys sent by the client
+DELTA_FIELDS = {
+    "p": "plant_name",
+    "v": "variant",
+    "w": "weight",
+    "m": "mutations",
+    "a": "plant_amount",
+}
+
+
+class LiveCalculationSession:
+    """
+    Holds one client's calculator inputs and recalculates on every delta.
+    Only the newest input is ever answered: a delta that arrives while a
+    calculation is pending cancels it.
+    """
+
+    def __init__(self, cache: CalculationCache):
+        """Start from the calculator page defaults."""
+        self.cache = cache
+        self.state = {
+            "plant_name": "Carrot",
+            "variant": "Normal",
+            "weight": 0.24,
+            "mutations": [],
+            "plant_amount": 1,
+        }
+        self.latest_seq = 0
+        self.cancelled = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def apply_delta(self, delta: dict) -> None:
+        """
+        Merge a delta into the session state. Besides the DELTA_FIELDS keys,
+        "+m"/"-m" add or remove a single mutation. Raises ValueError on bad input.
+        """
+        state = dict(self.state)
+        for key, field in DELTA_FIELDS.items():
+            if key in delta:
+                state[field] = delta[key]
+        if "+m" in delta and delta["+m"] not in state["mutations"]:
+            state["mutations"] = state["mutations"] + [delta["+m"]]
+        if "-m" in delta:
+            state["mutations"] = [m for m in state["mutations"] if m != delta["-m"]]
+
+        if not isinstance(state["plant_name"], str) or not isinstance(state["variant"], str):
+            raise ValueError("Invalid plant or variant")
+        if not isinstance(state["mutations"], list) or not all(isinstance(m, str) for m in state["mutations"]):
+            raise ValueError("Mutations must be a list of names")
+        try:
+            state["weight"] = float(state["weight"])
+            state["plant_amount"] = int(state["plant_amount"])
+        except (TypeError, ValueError):
+            raise ValueError("Invalid weight or plant amount")
+        if not state["weight"] > 0 or not math.isfinite(state["weight"]):
+            raise ValueError("Weight must be a finite number greater than 0")
+        if not 1 <= state["plant_amount"] <= 10000:
+            raise ValueError("plant_amount must be between 1 and 10000")
+
+        self.state = state
+
+    async def handle_message(self, websocket, text: str) -> None:
+        """Apply one client message and schedule a recalculation for it."""
+        try:
+            delta = json.loads(text)
+            if not isinstance(delta, dict):
+                raise ValueError("Expected a JSON object")
+            seq = int(delta.get("s", self.latest_seq + 1))
+            self.latest_seq = seq
+            self.apply_delta(delta)
+        except (ValueError, TypeError) as e:
+            await websocket.send_text(_encode({"s": self.latest_seq, "e": str(e)}))
+            return
+
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            self.cancelled += 1
+        self._task = asyncio.create_task(self._calculate(websocket, seq, dict(self.state)))
+
+    async def _calculate(self, websocket, seq: int, state: dict) -> None:
+        """Calculate one input state and send it unless it has been superseded."""
+        try:
+            result = await self.cache.calculate(**state)
+            message = {"s": seq, "r": result}
+        except KeyError as e:
+            message = {"s": seq, "e": f"Invalid data: {str(e)}"}
+        except Exception as e:
+            # Answer with an error frame so the client isn't left waiting on seq
+            logger.exception("Live calculation %s failed for %s", seq, state)
+            message = {"s": seq, "e": f"Calculation error: {str(e)}"}
+        if seq == self.latest_seq:
+            await websocket.send_text(_encode(message))
+
+    def close(self) -> None:
+        """Cancel any pending calculation."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+
+def _encode(message: dict) -> str:
+    """Encode a message as compact JSON."""
+    return json.dumps(message, separators=(",", ":"))
+
+
+def create_session() -> LiveCalculationSession:
+    """Create a session backed by the shared calculation cache."""
+    return LiveCalculationSession(calculation_cache)
@@ -0,0 +1,54 @@
+"""
+Encoding of shared-result exports as NDJSON or CSV.
+"""
+import csv
+import io
+import json
+from typing import Iterable, Iterator
+
+from services.shared_results_service import SHARED_RESULT_COLUMNS
+
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    # Starlette appends "; charset=utf-8" to text/ types
+    "csv": "text/csv",
+}
+
+
+def export_chunks(
+    results: Iterable[dict],
+    export_format: str,
+    rows_per_chunk: int = 500
+) -> Iterator[bytes]:
+    """
+    Encode shared results in chunks of rows_per_chunk lines. CSV output starts
+    with a header row and joins mutations with ";"; NDJSON keeps them as a list.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if export_format == "csv":
+        writer.writerow(SHARED_RESULT_COLUMNS)
+
+    pending = 0
+    for result in results:
+        if export_format == "ndjson":
+            buffer.write(json.dumps(result, separators=(",", ":")))
+            buffer.write("\n")
+        else:
+            row = dict(result, mutations=";".join(result["mutations"]))
+            writer.writerow([row[column] for column in SHARED_RESULT_COLUMNS])
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
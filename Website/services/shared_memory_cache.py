@@ -0,0 +1,173 @@
+"""
+Fixed-size hash table in a named shared memory segment, so all worker
+processes on a host can share cached values.
+"""
+import hashlib
+import os
+import struct
+import tempfile
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Hashable, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Segment header: magic, slot count, value size
+HEADER = struct.Struct("<8sII")
+MAGIC = b"GCSHM001"
+
+# Slot header: sequence counter (odd while being written), key digest
+SLOT_HEADER = struct.Struct("<I4x16s")
+SEQUENCE = struct.Struct("<I")
+
+# Slots per bucket (set associativity)
+WAYS = 4
+
+# Read attempts per slot when a concurrent write is seen
+READ_RETRIES = 3
+
+_EMPTY_KEY = bytes(16)
+
+
+def key_digest(key: Hashable) -> bytes:
+    """16-byte digest of a normalized cache key; repr() round-trips floats exactly."""
+    return hashlib.blake2b(repr(key).encode("utf-8"), digest_size=16).digest()
+
+
+class SharedMemoryTable:
+    """
+    Set-associative table of fixed-size byte values in shared memory.
+
+    Reads take no lock. Each slot has a sequence counter that a writer makes
+    odd before updating the slot and even again afterwards (a seqlock); a
+    reader that sees an odd or changed counter retries, then treats the slot
+    as a miss. Writers serialize across processes with flock() on a lock file.
+    Python's memory writes are not fenced, so this relies on the store
+    ordering of x86-64 and the GIL within a process; on a torn read the worst
+    case is a retry.
+    """
+
+    def __init__(self, name: str, slots: int, value_size: int):
+        """Create the named segment, or attach to it if another worker already has."""
+        if fcntl is None:
+            raise OSError("Shared memory cache requires fcntl (POSIX)")
+
+        self.name = name
+        self.slots = max(WAYS, slots - slots % WAYS)
+        self.value_size = value_size
+        # Keep slots 8-byte aligned
+        self.slot_size = (SLOT_HEADER.size + value_size + 7) // 8 * 8
+        size = HEADER.size + self.slots * self.slot_size
+
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            HEADER.pack_into(self._shm.buf, 0, MAGIC, self.slots, value_size)
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(name=name)
+            self._check_header(size)
+        # The segment outlives any one worker; don't let this process's
+        # resource tracker unlink it at exit
+        resource_tracker.unregister(self._shm._name, "shared_memory")
+
+        self.buf = self._shm.buf
+        self._lock_file = open(os.path.join(tempfile.gettempdir(), f"{name}.lock"), "a+b")
+        self._thread_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.retries = 0
+        self.writes = 0
+
+    def _check_header(self, size: int) -> None:
+        """Verify an attached segment has this table's layout."""
+        # The creating worker may still be writing the header
+        for _ in range(100):
+            magic, slots, value_size = HEADER.unpack_from(self._shm.buf, 0)
+            if magic == MAGIC:
+                break
+            time.sleep(0.001)
+        if magic != MAGIC or slots != self.slots or value_size != self.value_size or self._shm.size < size:
+            self._shm.close()
+            raise ValueError(
+                f"Shared memory segment {self.name} has a different layout; "
+                f"unlink it (or change its name) to resize"
+            )
+
+    def _bucket_offsets(self, digest: bytes):
+        """Byte offsets of the slots a digest may occupy."""
+        first = int.from_bytes(digest[:8], "little") % (self.slots // WAYS) * WAYS
+        return [HEADER.size + (first + way) * self.slot_size for way in range(WAYS)]
+
+    def get(self, digest: bytes) -> Optional[bytes]:
+        """Return the value stored for digest, or None."""
+        buf = self.buf
+        for offset in self._bucket_offsets(digest):
+            for _ in range(READ_RETRIES):
+                sequence, key = SLOT_HEADER.unpack_from(buf, offset)
+                if sequence & 1:
+                    self.retries += 1
+                    continue
+                if key != digest:
+                    break
+                start = offset + SLOT_HEADER.size
+                value = bytes(buf[start:start + self.value_size])
+                if SEQUENCE.unpack_from(buf, offset)[0] == sequence:
+                    self.hits += 1
+                    return value
+                self.retries += 1
+        self.misses += 1
+        return None
+
+    def set(self, digest: bytes, value: bytes) -> None:
+        """Store value (exactly value_size bytes) for digest, evicting within its bucket."""
+        buf = self.buf
+        offsets = self._bucket_offsets(digest)
+        with self._thread_lock:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            try:
+                target = None
+                for offset in offsets:
+                    key = SLOT_HEADER.unpack_from(buf, offset)[1]
+                    if key == digest or key == _EMPTY_KEY:
+                        target = offset
+                        break
+                if target is None:
+                    target = offsets[digest[15] % WAYS]
+
+                sequence = SEQUENCE.unpack_from(buf, target)[0]
+                SEQUENCE.pack_into(buf, target, (sequence + 1) & 0xFFFFFFFF)
+                SLOT_HEADER.pack_into(buf, target, (sequence + 1) & 0xFFFFFFFF, digest)
+                start = target + SLOT_HEADER.size
+                buf[start:start + self.value_size] = value
+                SEQUENCE.pack_into(buf, target, (sequence + 2) & 0xFFFFFFFF)
+                self.writes += 1
+            finally:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def stats(self) -> dict:
+        """Get this process's hit/miss counters for the table."""
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "slots": self.slots,
+            "hits": self.hits,
+            "misses": self.misses,
+            "retries": self.retries,
+            "writes": self.writes,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+    def close(self) -> None:
+        """Detach from the segment (it stays available to other workers)."""
+        self.buf = None
+        self._shm.close()
+        self._lock_file.close()
+
+    def unlink(self) -> None:
+        """Remove the segment, e.g. to resize it; attached workers keep their mapping."""
+        # SharedMemory.unlink() unregisters the name, which __init__ already did
+        resource_tracker.register(self._shm._name, "shared_memory")
+        self._shm.unlink()
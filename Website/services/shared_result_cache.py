@@ -0,0 +1,138 @@
+"""
+Read-through cache of shared results and their rendered share pages.
+"""
+import time
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+import config
+from services.cache import SingleFlight, TTLCache
+from services.shared_results_service import SharedResultsService, shared_results_service
+
+
+def share_expiry(result: dict) -> datetime:
+    """A shared result's expires_at as an aware UTC datetime."""
+    expires_at = result["expires_at"]
+    if not isinstance(expires_at, datetime):
+        expires_at = datetime.fromisoformat(expires_at)
+    if expires_at.tzinfo is None:
+        # Stored timestamps are naive UTC (datetime.utcnow())
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return expires_at
+
+
+class SharedResultCache:
+    """
+    Caches shared results and rendered share pages until the share expires.
+    Concurrent misses for one share ID are coalesced into a single database
+    lookup, which runs in the threadpool so it doesn't block the event loop.
+    A share may be deleted through another worker, so a cached copy last
+    confirmed more than revalidate_after seconds ago is served only after a
+    primary-key existence check (0 checks on every hit).
+    """
+
+    def __init__(
+        self,
+        results_service: SharedResultsService,
+        max_size: int = 1000,
+        revalidate_after: float = 5.0
+    ):
+        """Initialize empty result and page caches."""
+        self.results_service = results_service
+        self.revalidate_after = revalidate_after
+        self._results = TTLCache(max_size=max_size)
+        self._pages = TTLCache(max_size=max_size)
+        self._confirmed = TTLCache(max_size=max_size)
+        self._flight = SingleFlight()
+        self.revalidations = 0
+        self.revalidation_evictions = 0
+
+    async def get(self, share_id: str) -> Optional[dict]:
+        """Get a shared result, or None if it doesn't exist or has expired."""
+        result = self._results.get(share_id)
+        if result is not None and await self._still_exists(share_id):
+            return result
+
+        async def lookup():
+            found = await run_in_threadpool(self.results_service.get_shared_result, share_id)
+            if found is not None:
+                self._results.set(share_id, found, share_expiry(found).timestamp())
+                self._confirm(share_id)
+            return found
+
+        return await self._flight.do(share_id, lookup)
+
+    async def get_page(
+        self,
+        share_id: str,
+        render: Callable[[dict], str]
+    ) -> Optional[Tuple[str, dict]]:
+        """
+        Get (html, shared result) for a share, calling render(result) on a
+        miss. Returns None if the share doesn't exist or has expired.
+        """
+        page = self._pages.get(share_id)
+        if page is not None and await self._still_exists(share_id):
+            return page
+
+        result = await self.get(share_id)
+        if result is None:
+            return None
+        page = (render(result), result)
+        self._pages.set(share_id, page, share_expiry(result).timestamp())
+        return page
+
+    async def _still_exists(self, share_id: str) -> bool:
+        """
+        Whether a cached share may still be served: recently confirmed, or
+        found by an existence check now. A share that is gone is invalidated.
+        """
+        if self._confirmed.get(share_id) is not None:
+            return True
+
+        async def check():
+            self.revalidations += 1
+            return await run_in_threadpool(self.results_service.share_exists, share_id)
+
+        if await self._flight.do(("exists", share_id), check):
+            self._confirm(share_id)
+            return True
+        self.revalidation_evictions += 1
+        self.invalidate(share_id)
+        return False
+
+    def _confirm(self, share_id: str) -> None:
+        """Record that share_id was just seen in the database."""
+        if self.revalidate_after > 0:
+            self._confirmed.set(share_id, True, time.time() + self.revalidate_after)
+
+    def snapshot(self, limit: int) -> List[str]:
+        """IDs of up to limit cached share pages, most recently used first."""
+        return [share_id for share_id, page in self._pages.items(limit)]
+
+    def invalidate(self, share_id: str) -> None:
+        """Forget a share, e.g. after it has been deleted."""
+        self._results.delete(share_id)
+        self._pages.delete(share_id)
+        self._confirmed.delete(share_id)
+
+    def stats(self) -> dict:
+        """Get hit/miss counters for the result and page caches."""
+        return {
+            "results": self._results.stats(),
+            "pages": self._pages.stats(),
+            "revalidations": self.revalidations,
+            "revalidation_evictions": self.revalidation_evictions,
+            "coalesced": self._flight.coalesced,
+            "in_flight": self._flight.in_flight()
+        }
+
+
+# Global cache instance
+shared_result_cache = SharedResultCache(
+    shared_results_service,
+    max_size=config.SHARE_CACHE_SIZE,
+    revalidate_after=config.SHARE_CACHE_REVALIDATE
+)
@@ -3,30 +3,118 @@ Service for managing shared calculation results in the database.
 """
 import sqlite3
 import json
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Dict, Iterator, Optional, List, Tuple
 from pathlib import Path
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+import config
+from metrics import QUERY_BUCKETS, metrics
+from timing import phase
+
 logger = logging.getLogger(__name__)
 
+# Column order for inserts; matches _share_row()
+INSERT_SHARED_RESULT_SQL = """
+    INSERT INTO shared_results (
+        share_id, plant, variant, mutations, weight, amount,
+        result_value, final_sheckles, total_value, total_multiplier,
+        mutation_breakdown, weight_min, weight_max, created_at, expires_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Share IDs bound per "IN (...)" query, below SQLite's default 999-variable limit
+SHARE_ID_CHUNK_SIZE = 500
+
+# Capacity of the Space-Saving sketch of most shared (plant, variant, mutations) combos
+COMBO_SKETCH_SIZE = 256
+
+# Share operations by outcome; "expired" lookups are the lazy deletes in get_shared_result()
+SHARE_OPERATIONS = metrics.counter(
+    "growcalc_share_operations_total", "Shared result operations by outcome", ("operation", "outcome")
+)
+
+# Wall time per database operation, including connecting and waiting on locks
+SQLITE_SECONDS = metrics.histogram(
+    "growcalc_sqlite_operation_seconds", "SQLite time per shared result operation",
+    ("operation",), buckets=QUERY_BUCKETS
+)
+
+# Columns in table order
+SHARED_RESULT_COLUMNS = [
+    "share_id", "plant", "variant", "mutations", "weight", "amount",
+    "result_value", "final_sheckles", "total_value", "total_multiplier",
+    "mutation_breakdown", "weight_min", "weight_max", "created_at", "expires_at"
+]
+
+
+@contextmanager
+def _db_timer(operation: str):
+    """Time a database operation for /metrics and the request's Server-Timing "db" phase."""
+    with SQLITE_SECONDS.time(operation), phase("db"):
+        yield
+
+
+def _popularity_deltas(shares: List[tuple]) -> Tuple[Dict[tuple, int], Dict[str, int]]:
+    """
+    Count (plant, variant, mutations JSON) tuples per share_counts key and per
+    combo, the form both recording and forgetting shares apply.
+    """
+    counts: Dict[tuple, int] = {("total", ""): len(shares)}
+    combos: Dict[str, int] = {}
+    for plant, variant, mutations_json in shares:
+        mutations = json.loads(mutations_json)
+        mutations = sorted({str(m) for m in mutations}) if isinstance(mutations, list) else []
+        for key in [("plant", plant), ("variant", variant)] + [("mutation", m) for m in mutations]:
+            counts[key] = counts.get(key, 0) + 1
+        combo = json.dumps([plant, variant, mutations], separators=(",", ":"))
+        combos[combo] = combos.get(combo, 0) + 1
+    return counts, combos
+
 
 class SharedResultsService:
     """Service for managing shared results in SQLite database."""
     
     def __init__(self, db_path: str = "shared_results.db"):
-        """Initialize the service with database path."""
+        """Initialize with the database path; tables are created on first use."""
         self.db_path = Path(db_path)
-        self.init_database()
+        self._initialized = False
+        self._init_lock = threading.Lock()
+    
+    def _connect(self, **kwargs) -> sqlite3.Connection:
+        """Open a connection, creating the tables first if this is the first one."""
+        if not self._initialized:
+            self.init_database()
+        return sqlite3.connect(self.db_path, **kwargs)
     
     def init_database(self):
-        """Initialize the database and create tables if they don't exist."""
+        """Initialize the database and create tables if they don't exist; runs once."""
+        with self._init_lock:
+            if not self._initialized:
+                self._create_tables()
+                self._initialized = True
+    
+    def _create_tables(self):
+        """Create the tables and indexes, backfilling popularity counts for new ones."""
         try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
+                # Let maintenance return freed pages in small steps (new databases only;
+                # existing ones switch with cleanup_expired_shares.py --convert-auto-vacuum)
+                cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                
+                # WAL lets readers (exports, lookups) run alongside writers
+                cursor.execute("PRAGMA journal_mode=WAL")
+                
+                # Hold the write lock from here to commit: otherwise two workers
+                # starting together can both find share_counts missing and both
+                # backfill it, doubling every count
+                cursor.execute("BEGIN IMMEDIATE")
+                
                 # Create shared results table
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS shared_results (
@@ -54,58 +142,133 @@ class SharedResultsService:
                     ON shared_results(expires_at)
                 """)
                 
+                # Create index on (created_at, share_id) for keyset-paginated exports
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_created_at_share_id
+                    ON shared_results(created_at, share_id)
+                """)
+                
+                # Create popularity aggregates, maintained on every insert and delete
+                cursor.execute("""
+                    SELECT name FROM sqlite_master
+                    WHERE type = 'table' AND name = 'share_counts'
+                """)
+                backfill = cursor.fetchone() is None
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS share_counts (
+                        kind TEXT NOT NULL,  -- total, plant, variant or mutation
+                        name TEXT NOT NULL,
+                        count INTEGER NOT NULL,
+                        PRIMARY KEY (kind, name)
+                    )
+                """)
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS share_combo_sketch (
+                        combo TEXT PRIMARY KEY,  -- JSON [plant, variant, sorted mutations]
+                        count INTEGER NOT NULL,
+                        error INTEGER NOT NULL  -- overestimate inherited from an evicted combo
+                    )
+                """)
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_combo_sketch_count
+                    ON share_combo_sketch(count)
+                """)
+                if backfill:
+                    cursor.execute("SELECT plant, variant, mutations FROM shared_results")
+                    self._record_popularity(cursor, cursor.fetchall())
+                
                 conn.commit()
                 logger.info("Database initialized successfully")
                 
         except Exception as e:
-            logger.error(f"Error initializing database: {e}")
+            logger.error("Error initializing database: %s", e)
             raise
     
     def create_shared_result(self, share_data: dict) -> bool:
         """Create a new shared result entry."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with _db_timer("create"), self._connect() as conn:
                 cursor = conn.cursor()
                 
-                # Convert mutations list to JSON string
-                mutations_json = json.dumps(share_data.get('mutations', []))
-                
-                cursor.execute("""
-                    INSERT INTO shared_results (
-                        share_id, plant, variant, mutations, weight, amount,
-                        result_value, final_sheckles, total_value, total_multiplier,
-                        mutation_breakdown, weight_min, weight_max, created_at, expires_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    share_data['share_id'],
-                    share_data['plant'],
-                    share_data['variant'],
-                    mutations_json,
-                    float(share_data['weight']),
-                    int(share_data['amount']),
-                    share_data['result_value'],
-                    share_data['final_sheckles'],
-                    share_data['total_value'],
-                    share_data['total_multiplier'],
-                    share_data['mutation_breakdown'],
-                    share_data['weight_min'],
-                    share_data['weight_max'],
-                    share_data['created_at'],
-                    share_data['expires_at']
-                ))
+                row = self._share_row(share_data)
+                cursor.execute(INSERT_SHARED_RESULT_SQL, row)
+                self._record_popularity(cursor, [row[1:4]])
                 
                 conn.commit()
-                logger.info(f"Created shared result: {share_data['share_id']}")
+                logger.info(
+                    "Created shared result: %s", share_data['share_id'],
+                    extra={"event": "share_created", "share_id": share_data['share_id']}
+                )
+                SHARE_OPERATIONS.inc("create", "ok")
                 return True
                 
         except Exception as e:
-            logger.error(f"Error creating shared result: {e}")
+            logger.error("Error creating shared result: %s", e)
+            SHARE_OPERATIONS.inc("create", "error")
             return False
     
+    def create_shared_results(self, shares: List[dict]) -> List[dict]:
+        """
+        Create many shared results in a single transaction. Returns one status
+        dict ({"share_id", "success", "error"}) per input, in order. Malformed
+        items, IDs repeated within the batch and IDs that already exist fail
+        individually without affecting the rest.
+        """
+        statuses = []
+        rows = {}
+        for share_data in shares:
+            share_id = share_data.get('share_id') if isinstance(share_data, dict) else None
+            try:
+                row = self._share_row(share_data)
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                statuses.append({'share_id': share_id, 'success': False, 'error': f"Invalid share data: {e}"})
+                continue
+            if row[0] in rows:
+                statuses.append({'share_id': row[0], 'success': False, 'error': "Duplicate share_id in request"})
+                continue
+            rows[row[0]] = row
+            statuses.append({'share_id': row[0], 'success': True, 'error': None})
+
+        if not rows:
+            return statuses
+
+        try:
+            with _db_timer("create_bulk"), self._connect() as conn:
+                cursor = conn.cursor()
+                # Take the write lock up front so the existence check and insert are atomic
+                cursor.execute("BEGIN IMMEDIATE")
+                existing = set()
+                for chunk in self._chunks(list(rows)):
+                    cursor.execute(f"""
+                        SELECT share_id FROM shared_results
+                        WHERE share_id IN ({','.join('?' * len(chunk))})
+                    """, chunk)
+                    existing.update(row[0] for row in cursor.fetchall())
+
+                new_rows = [row for share_id, row in rows.items() if share_id not in existing]
+                cursor.executemany(INSERT_SHARED_RESULT_SQL, new_rows)
+                self._record_popularity(cursor, [row[1:4] for row in new_rows])
+                conn.commit()
+                logger.info("Created %d shared results in bulk", len(new_rows))
+                SHARE_OPERATIONS.inc("create_bulk", "ok", amount=len(new_rows))
+
+        except Exception as e:
+            logger.error("Error creating shared results in bulk: %s", e)
+            SHARE_OPERATIONS.inc("create_bulk", "error", amount=len(rows))
+            existing = set()
+            for status in statuses:
+                if status['success']:
+                    status.update(success=False, error="Failed to create shared result")
+
+        for status in statuses:
+            if status['success'] and status['share_id'] in existing:
+                status.update(success=False, error="Share ID already exists")
+        return statuses
+
     def get_shared_result(self, share_id: str) -> Optional[dict]:
-        """Retrieve a shared result by ID."""
+        """Retrieve a shared result by ID; None if it is missing, expired or unreadable."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with _db_timer("get"), self._connect() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -114,6 +277,7 @@ class SharedResultsService:
                 
                 row = cursor.fetchone()
                 if not row:
+                    SHARE_OPERATIONS.inc("get", "miss")
                     return None
                 
                 # Convert row to dictionary
@@ -126,68 +290,328 @@ class SharedResultsService:
                 # Check if expired
                 expires_at = datetime.fromisoformat(result['expires_at'])
                 if datetime.utcnow() > expires_at:
-                    logger.info(f"Shared result expired: {share_id}")
+                    logger.info(
+                        "Shared result expired: %s", share_id,
+                        extra={"event": "share_expired", "share_id": share_id}
+                    )
+                    SHARE_OPERATIONS.inc("get", "expired")
                     self.delete_shared_result(share_id)
                     return None
                 
+                SHARE_OPERATIONS.inc("get", "hit")
                 return result
                 
         except Exception as e:
-            logger.error(f"Error retrieving shared result: {e}")
+            logger.error("Error retrieving shared result: %s", e)
+            SHARE_OPERATIONS.inc("get", "error")
             return None
     
+    def share_exists(self, share_id: str) -> bool:
+        """
+        Whether an unexpired share is stored under share_id: a primary-key probe
+        for revalidating cached copies. Errors count as existing, so a database
+        hiccup doesn't evict every cached share.
+        """
+        try:
+            with _db_timer("exists"), self._connect() as conn:
+                row = conn.execute("""
+                    SELECT 1 FROM shared_results WHERE share_id = ? AND expires_at >= ?
+                """, (share_id, datetime.utcnow().isoformat())).fetchone()
+                SHARE_OPERATIONS.inc("exists", "hit" if row else "miss")
+                return row is not None
+        except Exception as e:
+            logger.error("Error checking shared result: %s", e)
+            SHARE_OPERATIONS.inc("exists", "error")
+            return True
+    
+    def get_shared_results(self, share_ids: List[str]) -> Dict[str, Optional[dict]]:
+        """
+        Retrieve many shared results by ID, in chunks of SHARE_ID_CHUNK_SIZE.
+        Returns {share_id: result or None}, with None under the same conditions
+        as get_shared_result(), including database errors; expired results are
+        left for cleanup_expired_results() to delete.
+        """
+        results: Dict[str, Optional[dict]] = {share_id: None for share_id in share_ids}
+        now = datetime.utcnow()
+        try:
+            with _db_timer("get_bulk"), self._connect() as conn:
+                cursor = conn.cursor()
+                for chunk in self._chunks(list(results)):
+                    cursor.execute(f"""
+                        SELECT * FROM shared_results
+                        WHERE share_id IN ({','.join('?' * len(chunk))})
+                    """, chunk)
+                    columns = [description[0] for description in cursor.description]
+                    for row in cursor.fetchall():
+                        result = dict(zip(columns, row))
+                        if datetime.fromisoformat(result['expires_at']) < now:
+                            continue
+                        result['mutations'] = json.loads(result['mutations'])
+                        results[result['share_id']] = result
+                
+                found = sum(result is not None for result in results.values())
+                SHARE_OPERATIONS.inc("get_bulk", "hit", amount=found)
+                SHARE_OPERATIONS.inc("get_bulk", "miss", amount=len(results) - found)
+                return results
+                
+        except Exception as e:
+            logger.error("Error retrieving shared results in bulk: %s", e)
+            SHARE_OPERATIONS.inc("get_bulk", "error", amount=len(results))
+            return {share_id: None for share_id in results}
+
+    def iter_active_results(self, batch_size: int = 500) -> Iterator[dict]:
+        """
+        Yield every unexpired shared result ordered by (created_at, share_id).
+        Pages are fetched with keyset pagination, each in its own short read
+        transaction, so the export holds at most batch_size rows in memory and
+        never pins a snapshot for its whole run (which would stall WAL
+        checkpoints). Each row is yielded at most once; shares created or
+        deleted during the export may or may not be included.
+        """
+        # The generator may be resumed from different threadpool threads
+        conn = self._connect(check_same_thread=False)
+        try:
+            now = datetime.utcnow().isoformat()
+            columns = ", ".join(SHARED_RESULT_COLUMNS)
+            last = None
+            while True:
+                if last is None:
+                    cursor = conn.execute(f"""
+                        SELECT {columns} FROM shared_results
+                        WHERE expires_at >= ?
+                        ORDER BY created_at, share_id
+                        LIMIT ?
+                    """, (now, batch_size))
+                else:
+                    cursor = conn.execute(f"""
+                        SELECT {columns} FROM shared_results
+                        WHERE expires_at >= ? AND (created_at, share_id) > (?, ?)
+                        ORDER BY created_at, share_id
+                        LIMIT ?
+                    """, (now, last[13], last[0], batch_size))
+                # Reading the page to the end finishes its read transaction
+                # before any row is handed out
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                for row in rows:
+                    result = dict(zip(SHARED_RESULT_COLUMNS, row))
+                    result['mutations'] = json.loads(result['mutations'])
+                    yield result
+                last = rows[-1]
+        finally:
+            conn.close()
+
     def delete_shared_result(self, share_id: str) -> bool:
         """Delete a shared result by ID."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with _db_timer("delete"), self._connect() as conn:
                 cursor = conn.cursor()
                 
+                # Read the row and delete it in one write transaction, so
+                # concurrent deletes of the same share uncount it only once
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute("""
+                    SELECT plant, variant, mutations FROM shared_results WHERE share_id = ?
+                """, (share_id,))
+                row = cursor.fetchone()
                 cursor.execute("""
                     DELETE FROM shared_results WHERE share_id = ?
                 """, (share_id,))
+                if row:
+                    self.forget_popularity(cursor, [row])
                 
                 conn.commit()
-                logger.info(f"Deleted shared result: {share_id}")
+                logger.info(
+                    "Deleted shared result: %s", share_id,
+                    extra={"event": "share_deleted", "share_id": share_id}
+                )
+                SHARE_OPERATIONS.inc("delete", "ok")
                 return True
                 
         except Exception as e:
-            logger.error(f"Error deleting shared result: {e}")
+            logger.error("Error deleting shared result: %s", e)
+            SHARE_OPERATIONS.inc("delete", "error")
             return False
     
     def cleanup_expired_results(self) -> int:
         """Remove all expired shared results and return count of deleted items."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with _db_timer("cleanup"), self._connect() as conn:
                 cursor = conn.cursor()
+                now = datetime.utcnow().isoformat()
                 
-                # Get count of expired results
-                cursor.execute("""
-                    SELECT COUNT(*) FROM shared_results 
-                    WHERE expires_at < ?
-                """, (datetime.utcnow().isoformat(),))
-                
-                expired_count = cursor.fetchone()[0]
+                # Delete expired results a chunk at a time, taking each one out
+                # of the popularity aggregates in the same transaction
+                cursor.execute("BEGIN IMMEDIATE")
+                expired_count = 0
+                while True:
+                    cursor.execute("""
+                        SELECT rowid, plant, variant, mutations FROM shared_results
+                        WHERE expires_at < ? LIMIT ?
+                    """, (now, SHARE_ID_CHUNK_SIZE))
+                    expired = cursor.fetchall()
+                    if not expired:
+                        break
+                    cursor.execute(f"""
+                        DELETE FROM shared_results
+                        WHERE rowid IN ({','.join('?' * len(expired))})
+                    """, [row[0] for row in expired])
+                    self.forget_popularity(cursor, [row[1:] for row in expired])
+                    expired_count += len(expired)
+                conn.commit()
                 
                 if expired_count > 0:
-                    # Delete expired results
-                    cursor.execute("""
-                        DELETE FROM shared_results 
-                        WHERE expires_at < ?
-                    """, (datetime.utcnow().isoformat(),))
-                    
-                    conn.commit()
-                    logger.info(f"Cleaned up {expired_count} expired shared results")
+                    logger.info("Cleaned up %d expired shared results", expired_count)
+                    SHARE_OPERATIONS.inc("cleanup", "ok", amount=expired_count)
                 
                 return expired_count
                 
         except Exception as e:
-            logger.error(f"Error cleaning up expired results: {e}")
+            logger.error("Error cleaning up expired results: %s", e)
             return 0
     
+    def get_popularity(self, limit: int = 10) -> dict:
+        """
+        Get the most shared plants, variants, mutations and (plant, variant,
+        mutations) combos from the aggregate tables. Combo counts come from a
+        Space-Saving sketch: each may be overestimated by at most its "error".
+        """
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                
+                popularity = {}
+                for kind in ("plant", "variant", "mutation"):
+                    cursor.execute("""
+                        SELECT name, count FROM share_counts
+                        WHERE kind = ? ORDER BY count DESC, name LIMIT ?
+                    """, (kind, limit))
+                    popularity[kind + "s"] = [
+                        {"name": name, "count": count} for name, count in cursor.fetchall()
+                    ]
+                
+                cursor.execute("SELECT count FROM share_counts WHERE kind = 'total'")
+                total = cursor.fetchone()
+                popularity["total_shares"] = total[0] if total else 0
+                
+                cursor.execute("""
+                    SELECT combo, count, error FROM share_combo_sketch
+                    ORDER BY count DESC, combo LIMIT ?
+                """, (limit,))
+                popularity["combos"] = []
+                for combo, count, error in cursor.fetchall():
+                    plant, variant, mutations = json.loads(combo)
+                    popularity["combos"].append({
+                        "plant": plant,
+                        "variant": variant,
+                        "mutations": mutations,
+                        "count": count,
+                        "error": error
+                    })
+                
+                return popularity
+                
+        except Exception as e:
+            logger.error("Error getting share popularity: %s", e)
+            raise
+
+    @staticmethod
+    def _record_popularity(cursor: sqlite3.Cursor, shares: List[tuple]) -> None:
+        """
+        Fold (plant, variant, mutations JSON) tuples into the popularity
+        aggregates, on the caller's cursor so it shares the insert's transaction.
+        """
+        if not shares:
+            return
+        
+        counts, combos = _popularity_deltas(shares)
+        cursor.executemany("""
+            INSERT INTO share_counts (kind, name, count) VALUES (?, ?, ?)
+            ON CONFLICT (kind, name) DO UPDATE SET count = count + excluded.count
+        """, [(kind, name, count) for (kind, name), count in counts.items()])
+        
+        # Space-Saving: count tracked combos; a new combo takes a free slot or
+        # replaces the minimum, inheriting its count as the error bound
+        for combo, count in combos.items():
+            cursor.execute("""
+                UPDATE share_combo_sketch SET count = count + ? WHERE combo = ?
+            """, (count, combo))
+            if cursor.rowcount:
+                continue
+            cursor.execute("SELECT COUNT(*) FROM share_combo_sketch")
+            if cursor.fetchone()[0] < COMBO_SKETCH_SIZE:
+                cursor.execute("""
+                    INSERT INTO share_combo_sketch (combo, count, error) VALUES (?, ?, 0)
+                """, (combo, count))
+                continue
+            cursor.execute("""
+                SELECT combo, count FROM share_combo_sketch ORDER BY count LIMIT 1
+            """)
+            evicted, minimum = cursor.fetchone()
+            cursor.execute("""
+                UPDATE share_combo_sketch SET combo = ?, count = ?, error = ? WHERE combo = ?
+            """, (combo, minimum + count, minimum, evicted))
+
+    @staticmethod
+    def forget_popularity(cursor: sqlite3.Cursor, shares: List[tuple]) -> None:
+        """
+        Take deleted shares' (plant, variant, mutations JSON) tuples back out of
+        the popularity aggregates, on the caller's cursor so it shares the
+        delete's transaction. Every path that deletes shares must call it.
+        Counts that reach zero are dropped. A tracked combo's sketch count drops
+        too and frees its slot at zero; untracked combos have nothing to undo.
+        """
+        if not shares:
+            return
+        
+        counts, combos = _popularity_deltas(shares)
+        cursor.executemany("""
+            UPDATE share_counts SET count = MAX(count - ?, 0) WHERE kind = ? AND name = ?
+        """, [(count, kind, name) for (kind, name), count in counts.items()])
+        cursor.execute("DELETE FROM share_counts WHERE count <= 0")
+        
+        # The error bound can't exceed the count it is part of
+        cursor.executemany("""
+            UPDATE share_combo_sketch
+            SET count = MAX(count - ?, 0), error = MIN(error, MAX(count - ?, 0))
+            WHERE combo = ?
+        """, [(count, count, combo) for combo, count in combos.items()])
+        cursor.execute("DELETE FROM share_combo_sketch WHERE count <= 0")
+
+    @staticmethod
+    def _share_row(share_data: dict) -> tuple:
+        """Convert share data into an INSERT_SHARED_RESULT_SQL parameter tuple."""
+        return (
+            share_data['share_id'],
+            share_data['plant'],
+            share_data['variant'],
+            json.dumps(share_data.get('mutations', [])),
+            float(share_data['weight']),
+            int(share_data['amount']),
+            share_data['result_value'],
+            share_data['final_sheckles'],
+            share_data['total_value'],
+            share_data['total_multiplier'],
+            share_data['mutation_breakdown'],
+            share_data['weight_min'],
+            share_data['weight_max'],
+            share_data['created_at'],
+            share_data['expires_at']
+        )
+
+    @staticmethod
+    def _chunks(items: list) -> List[list]:
+        """Split items into lists of at most SHARE_ID_CHUNK_SIZE."""
+        return [
+            items[i:i + SHARE_ID_CHUNK_SIZE]
+            for i in range(0, len(items), SHARE_ID_CHUNK_SIZE)
+        ]
+
     def get_database_stats(self) -> dict:
         """Get database statistics."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 # Total shared results
@@ -211,9 +635,9 @@ class SharedResultsService:
                 }
                 
         except Exception as e:
-            logger.error(f"Error getting database stats: {e}")
+            logger.error("Error getting database stats: %s", e)
             return {'total_count': 0, 'active_count': 0, 'expired_count': 0}
 
 
 # Global instance
-shared_results_service = SharedResultsService()
+shared_results_service = SharedResultsService(config.SHARED_RESULTS_DB)
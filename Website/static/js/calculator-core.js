@@ -0,0 +1,109 @@
+/**
+ * Reference implementation of the plant value formula for client-side calculation.
+ * Mirrors services/calculator_service.py step for step (same operation order and
+ * Python's round-half-even) so results match /api/calculate exactly. Above
+ * Number.MAX_SAFE_INTEGER the server's integers are exact and these are doubles,
+ * but each is the double nearest the server's value, i.e. exactly what
+ * JSON.parse makes of the API response. tests/test_js_parity.py checks this.
+ * Works in the browser (window.GrowCalcCore) and in Node (module.exports).
+ */
+(function (root) {
+    'use strict';
+
+    const hasOwn = Object.prototype.hasOwnProperty;
+
+    /**
+     * A catalog table's entry for name, or undefined. Only own keys count, so
+     * names like "constructor" or "__proto__" aren't found on the prototype.
+     */
+    function lookup(table, name) {
+        return hasOwn.call(table, name) ? table[name] : undefined;
+    }
+
+    /**
+     * Round to the nearest integer, ties to even, like Python's round().
+     */
+    function roundHalfEven(x) {
+        const floor = Math.floor(x);
+        const diff = x - floor;
+        if (diff > 0.5) return floor + 1;
+        if (diff < 0.5) return floor;
+        return floor % 2 === 0 ? floor : floor + 1;
+    }
+
+    /**
+     * Additive mutation multiplier: 1 + (mut1-1) + (mut2-1) + ..., minimum 1.
+     * Unknown mutation names are ignored.
+     */
+    function calculateMutationMultiplier(catalog, mutations) {
+        if (!mutations || mutations.length === 0) return 1.0;
+
+        let total = 1.0;
+        for (const name of mutations) {
+            const valueMulti = lookup(catalog.mutations, name);
+            if (valueMulti === undefined) continue;
+            total = total + (valueMulti - 1);
+        }
+        return Math.max(1.0, total);
+    }
+
+    /**
+     * Calculate full plant value, returning the same fields as /api/calculate.
+     * Throws for unknown plants or variants, and, like the server's round(), when
+     * the value overflows to infinity.
+     */
+    function calculateFullValue(catalog, plantName, variant, weight, mutations, plantAmount) {
+        const plant = lookup(catalog.plants, plantName);
+        const variantMultiplier = lookup(catalog.variants, variant);
+        if (plant === undefined) throw new Error(`Unknown plant: ${plantName}`);
+        if (variantMultiplier === undefined) throw new Error(`Unknown variant: ${variant}`);
+
+        const [minRatio, maxRatio] = catalog.weight_ratio_clamp;
+        const basePrice = plant[1];
+        const baseWeight = plant[0];
+        const amount = plantAmount === undefined ? 1 : plantAmount;
+        const mutationMulti = calculateMutationMultiplier(catalog, mutations);
+
+        const baseValue = basePrice * mutationMulti * variantMultiplier;
+        const weightRatio = weight / baseWeight;
+        const clampedRatio = Math.max(minRatio, Math.min(weightRatio, maxRatio));
+        const finalValue = roundHalfEven(baseValue * (clampedRatio * clampedRatio));
+        if (!Number.isFinite(finalValue)) throw new RangeError('Plant value is too large to calculate');
+
+        return {
+            plant_name: plantName,
+            variant: variant,
+            weight: weight,
+            mutations: mutations || [],
+            mutation_multiplier: mutationMulti,
+            base_value: baseValue,
+            weight_ratio: weightRatio,
+            final_value: finalValue,
+            plant_amount: amount,
+            total_value: finalValue * amount
+        };
+    }
+
+    /**
+     * Expected weight range, same shape as /api/weight-range/{plant}.
+     */
+    function getWeightRange(catalog, plantName) {
+        const plant = lookup(catalog.plants, plantName);
+        if (plant === undefined) return { min: 0.0, max: 0.0 };
+        return { min: plant[3], max: plant[4], base: plant[0] };
+    }
+
+    const GrowCalcCore = {
+        lookup,
+        roundHalfEven,
+        calculateMutationMultiplier,
+        calculateFullValue,
+        getWeightRange
+    };
+
+    if (typeof module !== 'undefined' && module.exports) {
+        module.exports = GrowCalcCore;
+    } else {
+        root.GrowCalcCore = GrowCalcCore;
+    }
+})(typeof window !== 'undefined' ? window : this);
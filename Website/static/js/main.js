@@ -13,6 +13,88 @@ let allVariants = [];
 // API endpoints
 const API_BASE = '/api';
 
+// Versioned data catalog for local calculation (null until loaded or if unavailable)
+let catalog = null;
+const catalogReady = loadCatalog();
+
+/**
+ * Load the versioned data catalog so calculations run locally instead of per-input API calls
+ */
+async function loadCatalog() {
+    if (typeof GrowCalcCore === 'undefined') return null;
+    
+    const meta = document.querySelector('meta[name="catalog-url"]');
+    const url = meta && meta.content ? meta.content : `${API_BASE}/catalog`;
+    
+    try {
+        const response = await fetch(url);
+        
+        if (!response.ok) {
+            throw new Error('Failed to load catalog');
+        }
+        
+        catalog = await response.json();
+        console.log('Loaded data catalog version', catalog.version);
+    } catch (error) {
+        console.warn('Catalog unavailable, falling back to API calculations:', error);
+        catalog = null;
+        liveChannel.connect();
+    }
+    
+    return catalog;
+}
+
+/**
+ * Live calculation channel used when the catalog is unavailable or doesn't know
+ * the selected plant or variant (e.g. data updated since it loaded). Sends only the
+ * inputs that changed and shows only the answer to the newest message; the
+ * server drops calculations that a newer message supersedes.
+ */
+const liveChannel = {
+    socket: null,
+    seq: 0,
+    lastSent: {},
+    
+    connect() {
+        if (this.socket || typeof WebSocket === 'undefined') return;
+        
+        const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+        this.socket = new WebSocket(`${protocol}//${window.location.host}${API_BASE}/ws/calculate`);
+        
+        this.socket.addEventListener('message', (event) => {
+            const message = JSON.parse(event.data);
+            if (message.s !== this.seq) return;
+            if (message.r) {
+                displayResults(message.r);
+            } else {
+                console.error('Live calculation error:', message.e);
+                hideResults();
+            }
+        });
+        
+        this.socket.addEventListener('close', () => {
+            // Fall back to POST requests until the next catalog miss reconnects
+            this.socket = null;
+            this.lastSent = {};
+        });
+    },
+    
+    isOpen() {
+        return this.socket !== null && this.socket.readyState === WebSocket.OPEN;
+    },
+    
+    send(inputs) {
+        const delta = { s: ++this.seq };
+        for (const [key, value] of Object.entries(inputs)) {
+            if (JSON.stringify(this.lastSent[key]) !== JSON.stringify(value)) {
+                delta[key] = value;
+            }
+        }
+        this.lastSent = inputs;
+        this.socket.send(JSON.stringify(delta));
+    }
+};
+
 /**
  * Initialize the calculator form
  */
@@ -28,16 +110,25 @@ function initializeCalculatorForm() {
         });
     });
 
-    // Auto-calculate on input changes
+    // Auto-calculate on input changes. Local and live-channel calculations are
+    // cheap, so only the POST fallback is debounced.
     const weightInput = document.getElementById('plant-weight');
     const amountInput = document.getElementById('plant-amount');
+    const debouncedCalculation = debounce(updateCalculationIfReady, 500);
+    const onInputChanged = () => {
+        if (catalog || liveChannel.isOpen()) {
+            updateCalculationIfReady();
+        } else {
+            debouncedCalculation();
+        }
+    };
     
     if (weightInput) {
-        weightInput.addEventListener('input', debounce(updateCalculationIfReady, 500));
+        weightInput.addEventListener('input', onInputChanged);
     }
     
     if (amountInput) {
-        amountInput.addEventListener('input', debounce(updateCalculationIfReady, 500));
+        amountInput.addEventListener('input', onInputChanged);
     }
     
     // Initialize plant grid functionality
@@ -164,9 +255,6 @@ function initializePlantGrid() {
     } else {
         console.warn('Default plant (Carrot) not found');
     }
-    
-    // Preload all plant images
-    preloadPlantImages();
 }
 
 /**
@@ -681,6 +769,29 @@ async function calculatePlantValue() {
         return;
     }
 
+    await catalogReady;
+    if (catalog && GrowCalcCore.lookup(catalog.plants, plantName) !== undefined
+            && GrowCalcCore.lookup(catalog.variants, currentVariant) !== undefined) {
+        displayResults(GrowCalcCore.calculateFullValue(
+            catalog, plantName, currentVariant, weight, [...selectedMutations], amount
+        ));
+        return;
+    }
+
+    // Open the live channel for later inputs; this one still goes over POST
+    // if the socket isn't up yet
+    liveChannel.connect();
+    if (liveChannel.isOpen()) {
+        liveChannel.send({
+            p: plantName,
+            v: currentVariant,
+            w: weight,
+            m: [...selectedMutations],
+            a: amount
+        });
+        return;
+    }
+
     try {
         const response = await fetch(`${API_BASE}/calculate`, {
             method: 'POST',
@@ -868,14 +979,21 @@ async function updateWeightRange() {
     }
     
     try {
-        const response = await fetch(`${API_BASE}/weight-range/${encodeURIComponent(plantName)}`);
+        await catalogReady;
+        let weightRange;
         
-        if (!response.ok) {
-            throw new Error('Failed to fetch weight range');
+        if (catalog && GrowCalcCore.lookup(catalog.plants, plantName) !== undefined) {
+            weightRange = GrowCalcCore.getWeightRange(catalog, plantName);
+        } else {
+            const response = await fetch(`${API_BASE}/weight-range/${encodeURIComponent(plantName)}`);
+            
+            if (!response.ok) {
+                throw new Error('Failed to fetch weight range');
+            }
+            
+            weightRange = await response.json();
         }
         
-        const weightRange = await response.json();
-        
         // Update the display
         weightMinSpan.textContent = weightRange.min;
         weightMaxSpan.textContent = weightRange.max;
@@ -910,9 +1028,9 @@ function updatePlantImage(plantName) {
     
     if (!plantImage || !plantPlaceholder) return;
     
-    // Convert plant name to filename format (lowercase, replace spaces with hyphens, remove apostrophes)
-    const filename = plantName.toLowerCase().replace(/\s+/g, '-').replace(/'/g, '');
-    const imagePath = `/static/img/crop-${filename}.webp`;
+    // Image paths are resolved server-side from the asset manifest
+    const plantButton = document.querySelector(`[data-plant="${CSS.escape(plantName)}"]`);
+    const imagePath = plantButton ? plantButton.dataset.image : `/images/plants/${encodeURIComponent(plantName)}`;
     
     // Set the image source
     plantImage.src = imagePath;
@@ -933,42 +1051,6 @@ function updatePlantImage(plantName) {
     };
 }
 
-/**
- * Preload all plant images for better performance
- */
-function preloadPlantImages() {
-    const plantButtons = document.querySelectorAll('[data-plant]');
-    plantButtons.forEach(button => {
-        const plantName = button.dataset.plant;
-        const cropImage = button.querySelector('.crop-image');
-        const cropPlaceholder = button.querySelector('.crop-placeholder');
-        
-        if (cropImage && cropPlaceholder) {
-            // Convert plant name to filename format (lowercase, replace spaces with hyphens, remove apostrophes)
-            const filename = plantName.toLowerCase().replace(/\s+/g, '-').replace(/'/g, '');
-            const imagePath = `/static/img/crop-${filename}.webp`;
-            
-            // Set the image source
-            cropImage.src = imagePath;
-            cropImage.alt = plantName;
-            
-            // Handle image load errors by showing fallback placeholder image
-            cropImage.onerror = function() {
-                console.warn(`Image not found for ${plantName}, using fallback placeholder`);
-                this.style.display = 'none';
-                cropPlaceholder.style.display = 'block';
-            };
-            
-            // Handle successful image load
-            cropImage.onload = function() {
-                console.log(`Successfully loaded image for ${plantName}`);
-                this.style.display = 'block';
-                cropPlaceholder.style.display = 'none';
-            };
-        }
-    });
-}
-
 /**
  * Update calculation if inputs are ready
  */
@@ -1064,19 +1146,30 @@ function initializeMutationCalculator() {
 
     async function calculateMutationMultiplier() {
         try {
-            const response = await fetch(`${API_BASE}/mutation-multiplier`, {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify(selectedMutations)
-            });
+            await catalogReady;
+            let result;
+            
+            if (catalog) {
+                result = {
+                    mutations: [...selectedMutations],
+                    multiplier: GrowCalcCore.calculateMutationMultiplier(catalog, selectedMutations),
+                    total_mutations: selectedMutations.length
+                };
+            } else {
+                const response = await fetch(`${API_BASE}/mutation-multiplier`, {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                    },
+                    body: JSON.stringify(selectedMutations)
+                });
 
-            if (!response.ok) {
-                throw new Error('Failed to calculate multiplier');
-            }
+                if (!response.ok) {
+                    throw new Error('Failed to calculate multiplier');
+                }
 
-            const result = await response.json();
+                result = await response.json();
+            }
             
             if (multiplierDisplay) {
                 multiplierDisplay.textContent = `x${result.multiplier.toFixed(2)}`;
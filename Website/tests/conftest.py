@@ -0,0 +1,44 @@
+"""
+Run the tests the way the app runs: from the Website directory, with its
+modules importable at top level, against a throwaway database.
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+import pytest
+
+WEBSITE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(WEBSITE_DIR)
+
+os.chdir(WEBSITE_DIR)
+sys.path.insert(0, WEBSITE_DIR)
+# The desktop app (GrowCalculatorUI, core_logic) and the benchmark scripts live
+# outside Website; appended so Website modules win any name clash
+sys.path.append(REPO_DIR)
+sys.path.append(os.path.join(REPO_DIR, "benchmarks"))
+# Tests make many requests from one client, which admission control would throttle
+os.environ.setdefault("GROWCALC_ADMISSION", "0")
+os.environ.setdefault("GROWCALC_DATA_DIR", tempfile.mkdtemp(prefix="growcalc_tests_"))
+
+
+@pytest.fixture
+def client():
+    """A test client for a fresh app; services load lazily on first use."""
+    from fastapi.testclient import TestClient
+
+    import main
+    return TestClient(main.create_app())
+
+
+@pytest.fixture
+def desktop_calculator(monkeypatch):
+    """The desktop app's PlantCalculator, loaded from the root data/ files."""
+    from core_logic.plant_calculator import PlantCalculator
+
+    monkeypatch.chdir(REPO_DIR)
+    # The constructor prints a line per data file
+    with contextlib.redirect_stdout(io.StringIO()):
+        return PlantCalculator()
@@ -0,0 +1,72 @@
+"""
+Content negotiation for precompressed static assets.
+"""
+import gzip
+import json
+import os
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from assets import AssetManifest, AssetStaticFiles, choose_encoding, parse_accept_encoding
+
+BOTH = ["br", "gzip"]
+
+
+def test_parse_accept_encoding_reads_q_values():
+    assert parse_accept_encoding("gzip, deflate;q=0.5, br;q=0,  *;Q=0.1") == {
+        "gzip": 1.0, "deflate": 0.5, "br": 0.0, "*": 0.1
+    }
+    assert parse_accept_encoding("gzip;q=abc, br;q=2") == {"gzip": 0.0, "br": 0.0}
+    assert parse_accept_encoding("") == {}
+
+
+@pytest.mark.parametrize("header, available, expected", [
+    ("gzip, deflate, br", BOTH, "br"),
+    ("gzip", BOTH, "gzip"),
+    ("gzip;q=0", BOTH, None),
+    ("gzip;q=0, br;q=0", BOTH, None),
+    ("br;q=0.5, gzip", BOTH, "gzip"),
+    ("br;q=0.8, gzip;q=0.8", BOTH, "br"),
+    ("*", BOTH, "br"),
+    ("*;q=0.5, br;q=0", BOTH, "gzip"),
+    ("gzip, *;q=0", ["br"], None),
+    ("xgzip, gzipped", BOTH, None),
+    ("", BOTH, None),
+    ("br, gzip", [], None),
+])
+def test_choose_encoding(header, available, expected):
+    assert choose_encoding(header, available) == expected
+
+
+@pytest.fixture
+def static_client(tmp_path):
+    """Serve a dist/ tree holding one script with a .gz variant."""
+    dist = tmp_path / "dist"
+    dist.mkdir()
+    source = b"console.log('hello');\n" * 50
+    (dist / "main.abc.js").write_bytes(source)
+    (dist / "main.abc.js.gz").write_bytes(gzip.compress(source))
+    manifest_file = dist / "manifest.json"
+    manifest_file.write_text(json.dumps({"precompressed": {"main.abc.js": ["gzip"]}}))
+
+    files = AssetStaticFiles(directory=str(tmp_path), manifest=AssetManifest(manifest_file))
+    files.dist_dir = os.path.realpath(dist)
+    app = Starlette(routes=[Mount("/static", app=files)])
+    return TestClient(app), source
+
+
+def test_gzip_variant_is_served_only_when_accepted(static_client):
+    client, source = static_client
+
+    accepted = client.get("/static/dist/main.abc.js", headers={"Accept-Encoding": "gzip"})
+    assert accepted.headers["content-encoding"] == "gzip"
+    assert accepted.content == source
+    assert accepted.headers["vary"] == "Accept-Encoding"
+    assert "immutable" in accepted.headers["cache-control"]
+
+    refused = client.get("/static/dist/main.abc.js", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in refused.headers
+    assert refused.content == source
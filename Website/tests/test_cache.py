@@ -0,0 +1,79 @@
+"""
+SingleFlight coalescing and failure propagation, through the shared result cache.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from services.cache import LeaderCancelled, SingleFlight
+from services.shared_result_cache import SharedResultCache
+
+
+class SlowResultsService:
+    """Stands in for the database: each lookup blocks a worker thread for a while."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get_shared_result(self, share_id):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return {"share_id": share_id, "expires_at": "2999-01-01T00:00:00"}
+
+
+def test_concurrent_misses_share_one_lookup():
+    service = SlowResultsService()
+    cache = SharedResultCache(service)
+
+    async def run():
+        return await asyncio.gather(*(cache.get("abc") for _ in range(50)))
+
+    results = asyncio.run(run())
+    assert service.calls == 1
+    assert all(result["share_id"] == "abc" for result in results)
+    stats = cache.stats()
+    assert stats["coalesced"] == 49
+    assert stats["in_flight"] == 0
+
+
+def test_waiters_get_the_leaders_exception():
+    flight = SingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        raise ValueError("lookup failed")
+
+    async def run():
+        return await asyncio.gather(*(flight.do("k", compute) for _ in range(5)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.coalesced == 4
+    assert flight.in_flight() == 0
+
+
+def test_cancelled_leader_fails_waiters_without_cancelling_them():
+    flight = SingleFlight()
+
+    async def compute():
+        await asyncio.sleep(10)
+
+    async def run():
+        leader = asyncio.create_task(flight.do("k", compute))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do("k", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        with pytest.raises(LeaderCancelled):
+            await waiter
+        assert not waiter.cancelled()
+
+    asyncio.run(run())
+    assert flight.in_flight() == 0
@@ -0,0 +1,45 @@
+"""
+Cache warm-up snapshots and the caches they fill.
+"""
+import json
+
+from services.cache_warmer import CacheWarmer
+from services.calculation_cache import calculation_cache
+from services.shared_result_cache import shared_result_cache
+from services.shared_results_service import shared_results_service
+
+
+def make_warmer(tmp_path) -> CacheWarmer:
+    return CacheWarmer(
+        calculation_cache, shared_result_cache, shared_results_service,
+        snapshot_file=str(tmp_path / "state" / "cache_snapshot.json")
+    )
+
+
+def test_snapshot_round_trip(tmp_path):
+    warmer = make_warmer(tmp_path)
+    calculation_cache.calculator.ensure_loaded()
+    warmer.save_snapshot()
+    snapshot = warmer.load_snapshot()
+    assert snapshot["data_version"] == calculation_cache.calculator.data_version
+
+
+def test_snapshot_from_another_data_version_is_skipped(tmp_path):
+    warmer = make_warmer(tmp_path)
+    warmer.snapshot_file.parent.mkdir(parents=True)
+    warmer.snapshot_file.write_text(json.dumps({
+        "data_version": "stale",
+        "calculations": [{"plant_name": "Carrot", "variant": "Normal", "weight": 0.3,
+                          "mutations": [], "plant_amount": 1}],
+        "shares": [],
+    }))
+    assert warmer.load_snapshot() == {}
+
+
+def test_mutation_multiplier_route_uses_the_memo(client):
+    mutations = ["Wet", "Shocked"]
+    first = client.post("/api/mutation-multiplier", json=mutations).json()
+    hits = calculation_cache.stats()["mutation_multipliers"]["hits"]
+    second = client.post("/api/mutation-multiplier", json=list(reversed(mutations))).json()
+    assert second["multiplier"] == first["multiplier"]
+    assert calculation_cache.stats()["mutation_multipliers"]["hits"] == hits + 1
@@ -0,0 +1,79 @@
+"""
+/api/calculate memoization: key normalization, coalescing and the stats endpoint.
+"""
+import asyncio
+
+from services.calculation_cache import CalculationCache
+from services.calculator_service import calculator_service
+
+REQUEST = {
+    "plant_name": "Carrot", "variant": "Gold", "weight": 0.3,
+    "mutations": ["Wet", "Chilled"], "plant_amount": 2,
+}
+
+
+def test_hits_and_misses_are_counted_and_mutation_order_is_normalized():
+    cache = CalculationCache(calculator_service)
+
+    async def run():
+        first = await cache.calculate(**REQUEST)
+        again = await cache.calculate(**REQUEST)
+        reordered = await cache.calculate(**dict(REQUEST, mutations=["Chilled", "Wet"]))
+        return first, again, reordered
+
+    first, again, reordered = asyncio.run(run())
+    assert first == again
+    assert reordered["total_value"] == first["total_value"]
+    assert reordered["mutations"] == ["Chilled", "Wet"]
+
+    expected = calculator_service.calculate_full_value_dict(
+        REQUEST["plant_name"], REQUEST["variant"], REQUEST["weight"],
+        REQUEST["mutations"], REQUEST["plant_amount"]
+    )
+    assert first["total_value"] == expected["total_value"]
+
+    stats = cache.stats()["results"]
+    assert (stats["misses"], stats["hits"], stats["size"]) == (1, 2, 1)
+
+
+def test_concurrent_identical_misses_compute_once():
+    cache = CalculationCache(calculator_service)
+    calls = []
+    compute = cache._calculate_result
+
+    def counting(*args):
+        calls.append(args)
+        return compute(*args)
+
+    cache._calculate_result = counting
+
+    async def run():
+        return await asyncio.gather(*(cache.calculate(**REQUEST) for _ in range(20)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert len({result["total_value"] for result in results}) == 1
+    stats = cache.stats()
+    assert stats["coalesced"] == 19
+    assert stats["in_flight"] == 0
+
+
+def test_unkeyable_inputs_bypass_the_cache():
+    cache = CalculationCache(calculator_service)
+    asyncio.run(cache.calculate(**dict(REQUEST, mutations=["Wet", "Wet"])))
+    assert cache.stats()["results"]["size"] == 0
+
+
+def test_cache_stats_endpoint_reflects_calculations(client):
+    def calculation_stats():
+        return client.get("/api/cache/stats").json()["calculations"]
+
+    before = calculation_stats()
+    body = dict(REQUEST, weight=0.2975)
+    assert client.post("/api/calculate", json=body).status_code == 200
+    assert client.post("/api/calculate", json=body).status_code == 200
+    after = calculation_stats()
+
+    assert after["results"]["misses"] == before["results"]["misses"] + 1
+    assert after["results"]["hits"] == before["results"]["hits"] + 1
+    assert {"enabled", "data_version", "coalesced", "in_flight"} <= after.keys()
@@ -0,0 +1,51 @@
+"""
+CalculatorService: lazy loading of the data files.
+"""
+import threading
+
+import pytest
+
+from services.calculator_service import CalculatorService
+
+
+def test_construction_reads_nothing_until_data_is_used(monkeypatch):
+    service = CalculatorService()
+    loads = []
+    original = service._load_data
+    monkeypatch.setattr(service, "_load_data", lambda: loads.append(1) or original())
+
+    assert not service.loaded
+    assert "Carrot" in service.plants
+    assert service.loaded
+    assert service.data_version == service.ensure_loaded().data_version
+    assert service.plant_ids and service.variant_ids
+    assert loads == [1]
+
+
+def test_concurrent_first_use_loads_once(monkeypatch):
+    service = CalculatorService()
+    loads = []
+    original = service._load_data
+    monkeypatch.setattr(service, "_load_data", lambda: loads.append(1) or original())
+
+    barrier = threading.Barrier(8)
+    seen = []
+
+    def use():
+        barrier.wait()
+        seen.append(service.mutation_bitmask(["Wet"]))
+
+    threads = [threading.Thread(target=use) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert loads == [1]
+    assert len(set(seen)) == 1
+
+
+def test_unknown_attributes_still_raise():
+    service = CalculatorService()
+    with pytest.raises(AttributeError):
+        service.not_an_attribute
+    assert not service.loaded
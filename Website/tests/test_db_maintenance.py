@@ -0,0 +1,41 @@
+"""
+Database maintenance against a live, concurrently written database.
+"""
+import sqlite3
+import threading
+
+from services.db_maintenance import DatabaseMaintenance
+
+
+def test_backup_completes_under_constant_writes(tmp_path):
+    source = tmp_path / "live.db"
+    conn = sqlite3.connect(source)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, payload TEXT)")
+    conn.executemany("INSERT INTO items (payload) VALUES (?)", [("x" * 500,)] * 5000)
+    conn.commit()
+    conn.close()
+
+    stop = threading.Event()
+
+    def write():
+        writer = sqlite3.connect(source, isolation_level=None)
+        writer.execute("PRAGMA busy_timeout = 5000")
+        while not stop.is_set():
+            writer.execute("INSERT INTO items (payload) VALUES ('y')")
+        writer.close()
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        destination = tmp_path / "backup.db"
+        DatabaseMaintenance(source).backup(destination)
+    finally:
+        stop.set()
+        writer.join()
+
+    copy = sqlite3.connect(destination)
+    assert copy.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    assert copy.execute("SELECT COUNT(*) FROM items").fetchone()[0] >= 5000
+    copy.close()
+    assert not (tmp_path / "backup.db.partial").exists()
@@ -0,0 +1,126 @@
+"""
+The desktop app's batch valuation: the vectorized engine path and the
+inventory parser behind CSV import and paste.
+"""
+import csv
+import random
+import warnings
+from types import SimpleNamespace
+
+import pytest
+
+from GrowCalculatorUI import BatchWindow, InventoryParser
+
+
+def test_calculate_batch_matches_the_scalar_formula(desktop_calculator):
+    calculator = desktop_calculator
+    rng = random.Random(1234)
+    plants = sorted(calculator.plants)
+    variants = sorted(calculator.variants)
+    mutations = sorted(calculator.mutations)
+
+    rows = []
+    for _ in range(2000):
+        plant = rng.choice(plants)
+        base_weight = calculator.plants[plant]["base_weight"]
+        chosen = rng.sample(mutations, rng.randint(0, 6)) + rng.choice([[], ["Not A Mutation"]])
+        # Weights from below the 0.95 clamp up to far above base weight
+        weight = base_weight * rng.choice([0.1, 0.5, 0.96, 1.0, rng.uniform(0.7, 1.4), 37.5])
+        rows.append((plant, rng.choice(variants), weight, chosen, rng.randint(1, 500)))
+
+    for row, result in zip(rows, calculator.calculate_batch(rows)):
+        plant, variant, weight, chosen, amount = row
+        multiplier = calculator.calculate_mutation_multiplier(chosen)
+        value = calculator.calculate_plant_value(plant, variant, weight, multiplier)
+        assert result["mutation_multiplier"] == multiplier
+        assert result["final_value"] == value
+        assert result["total_value"] == value * amount
+
+
+def test_calculate_batch_reports_unknown_plants_and_variants(desktop_calculator):
+    results = desktop_calculator.calculate_batch([
+        ("Not A Plant", "Normal", 1.0, [], 1),
+        ("Carrot", "Not A Variant", 1.0, [], 1),
+        ("Carrot", "Normal", 0.3, [], 2),
+    ])
+    assert results[0] == {"error": "Unknown plant: Not A Plant"}
+    assert results[1] == {"error": "Unknown variant: Not A Variant"}
+    assert results[2]["total_value"] == 2 * results[2]["final_value"]
+
+
+def parse_all(calculator, text):
+    """Parse text the way BatchWindow does: header detection, then each line."""
+    lines = text.splitlines()
+    parser = InventoryParser(calculator, lines[0])
+    start = 1 if parser.has_header else 0
+    return parser, [parser.parse(cells) for cells in csv.reader(lines[start:], delimiter=parser.delimiter)]
+
+
+def test_header_columns_in_any_order_with_aliases(desktop_calculator):
+    parser, parsed = parse_all(desktop_calculator, "\n".join([
+        "Quantity,KG,Mutation,Plant Name,Variant",
+        '3,0.3,"wet; chilled",carrot,gold',
+        "1,2.5,,Carrot,",
+    ]))
+    assert parser.has_header
+    assert parsed == [
+        (("Carrot", "Gold", 0.3, ["Wet", "Chilled"], 3), None),
+        (("Carrot", "Normal", 2.5, [], 1), None),
+    ]
+
+
+def test_headerless_rows_are_positional_and_tabs_are_detected(desktop_calculator):
+    parser, parsed = parse_all(desktop_calculator, "\n".join([
+        "Carrot\tGold\t0.3\tWet|Chilled+Shocked\t2",
+        "carrot\tnormal\t1",
+        "\t\t\t\t",
+    ]))
+    assert not parser.has_header
+    assert parser.delimiter == "\t"
+    assert parsed == [
+        (("Carrot", "Gold", 0.3, ["Wet", "Chilled", "Shocked"], 2), None),
+        (("Carrot", "Normal", 1.0, [], 1), None),
+        (None, None),
+    ]
+
+
+@pytest.mark.parametrize("line, error", [
+    ("Pineapple Pizza,Normal,1,,1", "Unknown plant: Pineapple Pizza"),
+    ("Carrot,Shiny,1,,1", "Unknown variant: Shiny"),
+    ("Carrot,Normal,1,Wet;Sparkly,1", "Unknown mutation: Sparkly"),
+    ("Carrot,Normal,heavy,,1", "Invalid weight or amount"),
+    ("Carrot,Normal,1,,two", "Invalid weight or amount"),
+    ("Carrot,Normal,,,1", "Invalid weight or amount"),
+    ("Carrot,Normal,0,,1", "finite number greater than 0"),
+    ("Carrot,Normal,-2,,1", "finite number greater than 0"),
+    ("Carrot,Normal,nan,,1", "finite number greater than 0"),
+    ("Carrot,Normal,inf,,1", "finite number greater than 0"),
+    ("Carrot,Normal,-inf,,1", "finite number greater than 0"),
+    ("Carrot,Normal,1,,0", "amount at least 1"),
+])
+def test_error_rows(desktop_calculator, line, error):
+    _, parsed = parse_all(desktop_calculator, "plant,variant,weight,mutations,amount\n" + line)
+    row, message = parsed[0]
+    assert row is None
+    assert error in message
+
+
+def test_batch_valuation_keeps_going_past_bad_rows(desktop_calculator):
+    text = "\n".join(["Carrot,Gold,0.3,Wet,2", "Carrot,Normal,nan,,1", "Carrot,Normal,0.3,,1"] * 3)
+    window = SimpleNamespace(calculator=desktop_calculator, CHUNK=2)
+    progress = []
+    records, totals = BatchWindow._value(window, text, lambda value: progress.append(value) or True)
+
+    assert len(records) == 9
+    assert totals["rows"] == 6 and totals["errors"] == 3 and totals["fruits"] == 9
+    assert records[1][3].startswith("⚠ Line 2:")
+    assert totals["value"] == sum(record[6] for record in records if record[6] is not None)
+    assert progress[-1] == (10, 9)
+
+
+def test_file_import_reads_without_leaking_the_handle(tmp_path):
+    path = tmp_path / "inventory.csv"
+    path.write_bytes("﻿plant,weight\nCarrot,0.3\n".encode("utf-8"))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", ResourceWarning)
+        assert BatchWindow._read_file(str(path)) == "plant,weight\nCarrot,0.3\n"
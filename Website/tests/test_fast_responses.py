@@ -0,0 +1,47 @@
+"""
+/api/calculate's fast serialization path against the response model path.
+"""
+import json
+
+import pytest
+
+import config
+
+REQUESTS = [
+    {"plant_name": "Carrot", "weight": 0.3},
+    {"plant_name": "Carrot", "variant": "Gold", "weight": 0.01, "mutations": ["Wet", "Chilled"]},
+    {"plant_name": "Ackee", "variant": "Rainbow", "weight": 1e6, "mutations": ["Shocked"], "plant_amount": 10000},
+    {"plant_name": "Aloe Vera", "weight": 2, "mutations": ["Wet", "Wet", "Pétale ☃"], "plant_amount": 3},
+]
+
+
+def typed(body):
+    """Field names, order and JSON types, so 1 and 1.0 don't compare equal."""
+    return [(key, type(value).__name__, value) for key, value in json.loads(body).items()]
+
+
+def calculate(client, monkeypatch, fast, payload):
+    monkeypatch.setattr(config, "FAST_RESPONSES", fast)
+    return client.post("/api/calculate", json=payload)
+
+
+@pytest.mark.parametrize("payload", REQUESTS)
+def test_fast_path_encodes_the_same_document_as_the_model(client, monkeypatch, payload):
+    fast = calculate(client, monkeypatch, True, payload)
+    model = calculate(client, monkeypatch, False, payload)
+
+    assert fast.status_code == model.status_code == 200
+    assert fast.headers["content-type"] == model.headers["content-type"]
+    assert typed(fast.content) == typed(model.content)
+
+
+@pytest.mark.parametrize("payload", [
+    {"plant_name": "Not A Plant", "weight": 1},
+    {"plant_name": "Carrot", "variant": "Shiny", "weight": 1},
+    {"plant_name": "Carrot", "weight": -1},
+])
+def test_errors_are_unchanged(client, monkeypatch, payload):
+    fast = calculate(client, monkeypatch, True, payload)
+    model = calculate(client, monkeypatch, False, payload)
+    assert fast.status_code == model.status_code
+    assert fast.json() == model.json()
@@ -0,0 +1,113 @@
+"""
+Streaming inventory valuation: line splitting, size limits and per-line errors.
+"""
+import asyncio
+import json
+
+import config
+
+
+def value(body: bytes, chunk_size: int, input_format: str = "ndjson", **kwargs):
+    """Run the valuation over body split into chunk_size pieces; return its records."""
+    from services.inventory_service import inventory_service
+
+    async def chunks():
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+
+    async def collect():
+        output = b""
+        async for part in inventory_service.value_stream(chunks(), input_format, **kwargs):
+            output += part
+        return output
+
+    return [json.loads(line) for line in asyncio.run(collect()).splitlines()]
+
+
+def ndjson(*rows) -> bytes:
+    return b"".join(json.dumps(row).encode() + b"\n" for row in rows)
+
+
+ROWS = [
+    {"plant_name": "Carrot", "weight": 0.3},
+    {"plant_name": "Carrot", "variant": "Gold", "weight": 0.25, "mutations": ["Wet"]},
+    {"plant_name": "Carrot", "weight": 0.2, "plant_amount": 3},
+]
+
+
+def test_lines_split_across_chunk_boundaries_value_the_same():
+    body = ndjson(*ROWS)
+    whole = value(body, len(body))
+    for chunk_size in (1, 2, 7, 13):
+        assert value(body, chunk_size) == whole
+    results = [record for record in whole if record["type"] == "result"]
+    assert [record["line"] for record in results] == [1, 2, 3]
+    assert whole[-1] == {"type": "summary", "lines": 3, "valued": 3, "errors": 0,
+                         "total_value": sum(r["total_value"] for r in results)}
+
+
+def test_crlf_csv_split_inside_the_line_ending():
+    body = b"plant_name,weight,mutations\r\nCarrot,0.3,Wet;Chilled\r\nCarrot,0.2,\r\n"
+    for chunk_size in (1, 3, len(body)):
+        records = value(body, chunk_size, "csv")
+        assert [r["type"] for r in records] == ["result", "result", "totals", "summary"]
+        assert records[0]["mutations"] == ["Wet", "Chilled"]
+
+
+def test_bad_lines_are_reported_and_the_rest_still_valued():
+    body = ndjson(ROWS[0]) + b"{not json\n" + ndjson(
+        {"plant_name": "Carrot", "weight": -1},
+        {"plant_name": "Nonexistent Plant", "weight": 1},
+        ROWS[1],
+    )
+    records = value(body, 5)
+    by_line = {r["line"]: r for r in records if r["type"] in ("result", "error")}
+    assert by_line[1]["type"] == "result"
+    assert by_line[2]["type"] == "error" and "Invalid JSON" in by_line[2]["error"]
+    assert by_line[3]["type"] == "error" and "greater than 0" in by_line[3]["error"]
+    assert by_line[4]["type"] == "error"
+    assert by_line[5]["type"] == "result"
+    assert records[-1]["valued"] == 2 and records[-1]["errors"] == 3
+
+
+def test_overlong_line_is_skipped_once():
+    body = ndjson(ROWS[0]) + b'{"plant_name": "' + b"x" * 200 + b'"}\n' + ndjson(ROWS[1])
+    from services.inventory_service import inventory_service
+    original = inventory_service.max_line_bytes
+    inventory_service.max_line_bytes = 100
+    try:
+        records = value(body, 16)
+    finally:
+        inventory_service.max_line_bytes = original
+    errors = [r for r in records if r["type"] == "error"]
+    assert len(errors) == 1 and errors[0]["line"] == 2
+    assert [r["line"] for r in records if r["type"] == "result"] == [1, 3]
+
+
+def test_body_over_the_limit_stops_with_an_error_record():
+    body = ndjson(*ROWS)
+    first_line = len(ndjson(ROWS[0]))
+    # The limit falls inside the second line: only the first is valued
+    records = value(body, 4, max_bytes=first_line + 5)
+    assert [r["type"] for r in records] == ["result", "totals", "error", "summary"]
+    assert records[2]["line"] is None and "exceeds" in records[2]["error"]
+    assert records[-1]["lines"] == 1
+
+
+def test_declared_oversize_body_is_rejected_with_413(client, monkeypatch):
+    monkeypatch.setattr(config, "INVENTORY_MAX_BYTES", 32)
+    response = client.post(
+        "/api/calculate/stream", content=ndjson(*ROWS),
+        headers={"content-type": "application/x-ndjson"}
+    )
+    assert response.status_code == 413
+
+
+def test_stream_endpoint_returns_ndjson(client):
+    response = client.post(
+        "/api/calculate/stream?format=ndjson", content=ndjson(*ROWS) + b"oops\n"
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert records[-1]["valued"] == 3 and records[-1]["errors"] == 1
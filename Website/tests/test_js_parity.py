@@ -0,0 +1,102 @@
+"""
+static/js/calculator-core.js against CalculatorService: the same grid of inputs
+runs through both, the JS under node, and every field must agree.
+"""
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from services.calculator_service import calculator_service
+
+NODE = shutil.which("node")
+CORE_JS = os.path.join("static", "js", "calculator-core.js")
+
+# Reads {"catalog", "cases"} on stdin and writes one result (or error) per case
+RUNNER = """
+const core = require(process.argv[1]);
+let input = '';
+process.stdin.on('data', chunk => { input += chunk; });
+process.stdin.on('end', () => {
+    const { catalog, cases } = JSON.parse(input);
+    const results = cases.map(([plant, variant, weight, mutations, amount]) => {
+        try {
+            return core.calculateFullValue(catalog, plant, variant, weight, mutations, amount);
+        } catch (e) {
+            return { error: e.message };
+        }
+    });
+    process.stdout.write(JSON.stringify(results));
+});
+"""
+
+NUMERIC_FIELDS = ("mutation_multiplier", "base_value", "weight_ratio", "final_value", "total_value")
+
+
+def input_grid():
+    """Every plant and variant, across weights from below the clamp to far above it."""
+    mutation_names = sorted(calculator_service.mutations)
+    mutation_sets = [
+        [],
+        mutation_names[:1],
+        mutation_names[:3],
+        mutation_names[::7],
+        mutation_names,
+        # Unknown names are ignored on both sides, including ones on Object.prototype
+        ["NotAMutation", "constructor", "__proto__", "toString"] + mutation_names[1:2],
+    ]
+    cases = []
+    for plant_name, plant in sorted(calculator_service.plants.items()):
+        for variant in sorted(calculator_service.variants):
+            for scale in (0.01, 0.5, 0.95, 1, 1.37, 2.5, 1e3, 1e9):
+                for i, mutations in enumerate(mutation_sets):
+                    # Vary the amount with the mutation set to keep the grid small
+                    amount = (1, 7, 10000)[i % 3]
+                    cases.append([plant_name, variant, plant.base_weight * scale, mutations, amount])
+    return cases
+
+
+def run_js(cases):
+    """Calculate each case with calculator-core.js under node, against the served catalog."""
+    catalog = json.loads(calculator_service.get_catalog_json())
+    completed = subprocess.run(
+        [NODE, "-e", RUNNER, os.path.abspath(CORE_JS)],
+        input=json.dumps({"catalog": catalog, "cases": cases}),
+        capture_output=True, text=True, check=True
+    )
+    results = json.loads(completed.stdout)
+    assert len(results) == len(cases)
+    return results
+
+
+@pytest.mark.skipif(NODE is None, reason="node is not installed")
+def test_js_matches_server():
+    cases = input_grid()
+    js_results = run_js(cases)
+
+    unsafe = 0
+    for case, js in zip(cases, js_results):
+        server = calculator_service.calculate_full_value_dict(*case)
+        assert "error" not in js, (case, js)
+        for field in ("plant_name", "variant", "mutations", "plant_amount"):
+            assert js[field] == server[field], (case, field)
+        for field in NUMERIC_FIELDS:
+            expected = server[field]
+            if isinstance(expected, int) and abs(expected) > 2 ** 53 - 1:
+                # The client sees JSON.parse of the exact integer: the nearest double
+                unsafe += 1
+                assert float(js[field]) == float(expected), (case, field, js[field], expected)
+            else:
+                assert js[field] == expected, (case, field, js[field], expected)
+    # The grid must reach past Number.MAX_SAFE_INTEGER for the check above to mean anything
+    assert unsafe > 0
+
+
+@pytest.mark.skipif(NODE is None, reason="node is not installed")
+def test_js_rejects_prototype_names():
+    cases = [["constructor", "Normal", 1.0, [], 1], [next(iter(calculator_service.plants)), "__proto__", 1.0, [], 1]]
+    errors = [result.get("error", "") for result in run_js(cases)]
+    assert errors[0].startswith("Unknown plant")
+    assert errors[1].startswith("Unknown variant")
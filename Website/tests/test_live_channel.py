@@ -0,0 +1,90 @@
+"""
+The live calculation WebSocket: deltas, error frames and superseded inputs.
+"""
+import asyncio
+import json
+
+from services.calculator_service import calculator_service
+from services.live_service import LiveCalculationSession
+
+
+class RecordingSocket:
+    """Collects the frames a session sends."""
+
+    def __init__(self):
+        self.frames = []
+
+    async def send_text(self, text):
+        self.frames.append(json.loads(text))
+
+
+class FailingCache:
+    async def calculate(self, **state):
+        raise RuntimeError("engine exploded")
+
+
+class SlowCache:
+    """Answers after a delay, so a newer delta can supersede a pending one."""
+
+    def __init__(self):
+        self.started = []
+
+    async def calculate(self, **state):
+        self.started.append(state)
+        await asyncio.sleep(0.05)
+        return {"weight": state["weight"]}
+
+
+def test_deltas_update_the_session_and_return_results(client):
+    with client.websocket_connect("/api/ws/calculate") as socket:
+        socket.send_text(json.dumps({"s": 1, "p": "Carrot", "v": "Gold", "w": 0.3, "m": ["Wet"]}))
+        first = json.loads(socket.receive_text())
+        socket.send_text(json.dumps({"s": 2, "+m": "Chilled", "a": 2}))
+        second = json.loads(socket.receive_text())
+
+    assert first["s"] == 1 and first["r"]["mutations"] == ["Wet"]
+    expected = calculator_service.calculate_full_value_dict("Carrot", "Gold", 0.3, ["Wet", "Chilled"], 2)
+    assert second["s"] == 2
+    assert second["r"]["mutations"] == ["Wet", "Chilled"]
+    assert second["r"]["total_value"] == expected["total_value"]
+
+
+def test_invalid_deltas_get_an_error_frame(client):
+    with client.websocket_connect("/api/ws/calculate") as socket:
+        socket.send_text("not json")
+        assert "e" in json.loads(socket.receive_text())
+        socket.send_text(json.dumps({"s": 5, "w": -1}))
+        assert json.loads(socket.receive_text()) == {
+            "s": 5, "e": "Weight must be a finite number greater than 0"
+        }
+        socket.send_text(json.dumps({"s": 6, "p": "Not A Plant"}))
+        frame = json.loads(socket.receive_text())
+        assert frame["s"] == 6 and "e" in frame and "r" not in frame
+
+
+def test_calculation_failures_get_an_error_frame():
+    session = LiveCalculationSession(FailingCache())
+    socket = RecordingSocket()
+
+    async def run():
+        await session.handle_message(socket, json.dumps({"s": 1, "w": 1.0}))
+        await session._task
+
+    asyncio.run(run())
+    assert socket.frames == [{"s": 1, "e": "Calculation error: engine exploded"}]
+
+
+def test_only_the_newest_input_is_answered():
+    cache = SlowCache()
+    session = LiveCalculationSession(cache)
+    socket = RecordingSocket()
+
+    async def run():
+        for seq, weight in enumerate((1.0, 2.0, 3.0), start=1):
+            await session.handle_message(socket, json.dumps({"s": seq, "w": weight}))
+            await asyncio.sleep(0)
+        await session._task
+
+    asyncio.run(run())
+    assert socket.frames == [{"s": 3, "r": {"weight": 3.0}}]
+    assert session.cancelled == 2
@@ -0,0 +1,94 @@
+"""
+The load-test harness (benchmarks/load_test.py): its statistics, its traffic
+model, and a short run against the app in-process.
+"""
+import asyncio
+import json
+
+import pytest
+
+from load_test import NON_2XX, AsgiTransport, DEFAULT_MIX, Stats, TrafficModel, parse_mix, run_load
+from services.calculator_service import calculator_service
+
+
+def test_percentiles_and_the_non_2xx_split():
+    stats = Stats()
+    for ms in range(1, 101):
+        stats.record("GET /a", 200, ms / 1000)
+    stats.record("GET /a", 404, 0.0001)
+    stats.record("GET /a", None, 5.0)
+    report = stats.report(elapsed=2.0)
+
+    assert report["GET /a"] == {
+        "requests": 100, "rps": 50.0,
+        "p50_ms": 50.0, "p90_ms": 90.0, "p99_ms": 99.0, "p99.9_ms": 100.0, "max_ms": 100.0,
+        "statuses": {"2xx": 100},
+    }
+    # Fast rejections and failures are reported apart instead of pulling p50 down
+    assert report["GET /a" + NON_2XX]["statuses"] == {"4xx": 1, "failed": 1}
+    assert report["GET /a" + NON_2XX]["max_ms"] == 5000.0
+    assert report["all"]["requests"] == 100
+    assert report["all" + NON_2XX]["requests"] == 2
+
+
+def test_report_without_errors_has_no_non_2xx_rows():
+    stats = Stats()
+    stats.record("GET /a", 204, 0.002)
+    assert set(stats.report(1.0)) == {"GET /a", "all"}
+    assert set(Stats().report(1.0)) == {"all"}
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return json.loads(calculator_service.get_catalog_json())
+
+
+def test_traffic_model_is_seeded_and_follows_the_mix(catalog):
+    mix = parse_mix("calculate=1,asset=1,page=0,catalog=0,weight_range=0,mutation_multiplier=0,share_create=0,share_view=0")
+    model, again = TrafficModel(catalog, mix, seed=7), TrafficModel(catalog, mix, seed=7)
+    requests = [model.next_request() for _ in range(500)]
+    assert [again.next_request() for _ in range(500)] == requests
+    assert {route for route, _, _, _ in requests} == {"POST /api/calculate", "GET /static"}
+
+    for route, method, path, body in requests:
+        if route != "POST /api/calculate":
+            continue
+        fruit = json.loads(body)
+        _, _, _, weight_min, weight_max = catalog["plants"][fruit["plant_name"]]
+        assert weight_min - 0.01 <= fruit["weight"] <= weight_max + 0.01
+        assert fruit["variant"] in catalog["variants"]
+        assert len(set(fruit["mutations"])) == len(fruit["mutations"])
+        assert set(fruit["mutations"]) <= set(catalog["mutations"])
+
+
+def test_share_views_open_recorded_shares(catalog):
+    model = TrafficModel(catalog, parse_mix(",".join(f"{kind}=0" for kind in DEFAULT_MIX if kind != "share_view")))
+    assert all(path.startswith("/share/missing") for _, _, path, _ in (model.next_request() for _ in range(20)))
+
+    model.record_share(json.dumps({"success": True, "data": {"share_id": "abc123"}}).encode())
+    model.record_share(b"not json")
+    paths = [model.next_request()[2] for _ in range(400)]
+    assert paths.count("/share/abc123") > 300
+
+
+def test_unknown_request_kinds_are_rejected():
+    with pytest.raises(ValueError):
+        parse_mix("calculate=1,checkout=5")
+
+
+def test_short_run_against_the_app(catalog):
+    import main
+    app = main.create_app()
+
+    async def run():
+        model = TrafficModel(catalog, DEFAULT_MIX, seed=1)
+        closed = await run_load(lambda client: AsgiTransport(app, client), model, 4, 0.5, warmup=0.1)
+        # Open loop: 50/s for 0.4s schedules exactly 20 measured requests
+        model = TrafficModel(catalog, DEFAULT_MIX, seed=2)
+        opened = await run_load(lambda client: AsgiTransport(app, client), model, 4, 0.4, rate=50, warmup=0)
+        return closed, opened
+
+    closed, opened = asyncio.run(run())
+    assert closed["all"]["requests"] > 20
+    assert closed["POST /api/calculate"]["statuses"] == {"2xx": closed["POST /api/calculate"]["requests"]}
+    assert opened["all"]["requests"] + opened.get("all" + NON_2XX, {"requests": 0})["requests"] == 20
@@ -0,0 +1,77 @@
+"""
+Sampling and rate caps in the log pipeline's filter.
+"""
+import io
+import logging
+import threading
+
+import log_pipeline as log_pipeline_module
+from log_pipeline import LogPipeline, SamplingFilter
+
+
+def make_record(name: str, msg: str, *args) -> logging.LogRecord:
+    return logging.LogRecord(name, logging.INFO, __file__, 0, msg, args, None)
+
+
+def test_rate_cap_applies_per_message_type():
+    log_filter = SamplingFilter(rate_limit=50)
+    kept = sum(log_filter.filter(make_record("services.share", "Created %s", i)) for i in range(500))
+    assert 50 <= kept < 60
+
+
+def test_access_log_is_not_rate_capped():
+    log_filter = SamplingFilter(rate_limit=50)
+    access = '%s - "%s %s HTTP/%s" %d'
+    kept = sum(
+        log_filter.filter(make_record("uvicorn.access", access, "127.0.0.1", "GET", f"/share/{i}", "1.1", 200))
+        for i in range(500)
+    )
+    assert kept == 500
+
+
+def test_access_log_can_still_be_sampled():
+    log_filter = SamplingFilter({"uvicorn.access": 0.1}, rate_limit=50)
+    kept = sum(log_filter.filter(make_record("uvicorn.access", "%s", i)) for i in range(500))
+    assert kept == 50
+
+
+def test_message_types_are_bounded():
+    log_filter = SamplingFilter(rate_limit=50, max_types=100)
+    for i in range(1000):
+        log_filter.filter(make_record("services.share", f"Created share {i}"))
+    assert len(log_filter._types) == 100
+
+
+class BlockedStream(io.TextIOBase):
+    """A sink that blocks every write until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def write(self, text: str) -> int:
+        self.release.wait()
+        return len(text)
+
+
+def test_uninstall_with_a_full_queue(monkeypatch):
+    monkeypatch.setattr(log_pipeline_module, "STOP_TIMEOUT", 0.05)
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    stream = BlockedStream()
+    pipeline = LogPipeline()
+    try:
+        pipeline.install(stream=stream, queue_size=10, routed_loggers=())
+        logger = logging.getLogger("tests.log_pipeline")
+        for i in range(100):
+            logger.info("Overload %d", i)
+        assert pipeline.handler.queue.full()
+        # The listener is stuck on the sink; let it go only after stop() has dropped records
+        threading.Timer(0.2, stream.release.set).start()
+        pipeline.flush()
+        pipeline.uninstall()
+    finally:
+        stream.release.set()
+        pipeline.uninstall()
+        for handler in handlers:
+            root.addHandler(handler)
+        root.setLevel(level)
@@ -0,0 +1,78 @@
+"""
+/metrics: the text exposition format, per-route request metrics, and the
+token gate in front of it.
+"""
+import pytest
+
+import config
+from metrics import MetricsRegistry
+
+
+def test_registry_renders_the_text_format():
+    registry = MetricsRegistry()
+    requests = registry.counter("app_requests_total", "Requests", ("route",))
+    requests.inc('/a"b\\c')
+    requests.inc('/a"b\\c', amount=2)
+    latency = registry.histogram("app_latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        latency.observe(value)
+    registry.register_callback("app_entries", "Entries", "gauge", lambda: [({"cache": "x"}, 2.5)])
+
+    assert registry.render().splitlines() == [
+        "# HELP app_requests_total Requests",
+        "# TYPE app_requests_total counter",
+        'app_requests_total{route="/a\\"b\\\\c"} 3',
+        "# HELP app_latency_seconds Latency",
+        "# TYPE app_latency_seconds histogram",
+        'app_latency_seconds_bucket{le="0.1"} 1',
+        'app_latency_seconds_bucket{le="1.0"} 3',
+        'app_latency_seconds_bucket{le="+Inf"} 4',
+        "app_latency_seconds_sum 4.05",
+        "app_latency_seconds_count 4",
+        "# HELP app_entries Entries",
+        "# TYPE app_entries gauge",
+        'app_entries{cache="x"} 2.5',
+    ]
+
+
+def samples(body):
+    """{series: value} for the sample lines of an exposition body."""
+    lines = [line for line in body.splitlines() if line and not line.startswith("#")]
+    return {line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1]) for line in lines}
+
+
+def test_requests_are_labelled_by_route_template(client):
+    series = 'growcalc_http_requests_total{method="GET",route="/api/share/{share_id}",status="200"}'
+    before = samples(client.get("/metrics").text).get(series, 0)
+    client.get("/api/share/does_not_exist")
+    client.get("/api/share/another_one")
+    client.get("/no/such/page")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/plain; version=0.0.4; charset=utf-8"
+    found = samples(response.text)
+    assert found[series] == before + 2
+    assert found['growcalc_http_requests_total{method="GET",route="unmatched",status="404"}'] >= 1
+    assert found['growcalc_http_requests_in_flight{method="GET",route="/metrics"}'] == 1
+    assert 'growcalc_cache_hits_total{cache="calculations"}' in found
+    assert not any("does_not_exist" in name for name in found)
+
+
+def test_metrics_can_be_turned_off(client, monkeypatch):
+    monkeypatch.setattr(config, "METRICS_ENABLED", False)
+    assert client.get("/metrics").status_code == 404
+
+
+@pytest.mark.parametrize("headers, status", [
+    ({}, 403),
+    ({"Authorization": "Bearer wrong"}, 403),
+    ({"Authorization": "scrape-secret"}, 403),
+    ({"Authorization": "Bearer scrape-secret"}, 200),
+])
+def test_token_gate(client, monkeypatch, headers, status):
+    monkeypatch.setattr(config, "METRICS_TOKEN", "scrape-secret")
+    response = client.get("/metrics", headers=headers)
+    assert response.status_code == status
+    if status == 403:
+        assert "growcalc_" not in response.text
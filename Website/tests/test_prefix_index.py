@@ -0,0 +1,70 @@
+"""
+The desktop app's PrefixIndex: word-start search over plant and mutation names.
+"""
+import random
+import re
+
+import pytest
+
+from GrowCalculatorUI import PrefixIndex
+
+
+def brute_force(names, query):
+    """Names with a word whose run to the end of the name starts with the query."""
+    def key(text):
+        return re.sub(r"[\s_-]+", "", text).lower()
+
+    query = key(query)
+    matches = []
+    for name in names:
+        starts = [0] + [
+            i for i in range(1, len(name))
+            if name[i - 1] in " _-" or (name[i - 1].islower() and name[i].isupper())
+        ]
+        if any(key(name[start:]).startswith(query) for start in starts):
+            matches.append(name)
+    return matches
+
+
+@pytest.fixture
+def names(desktop_calculator):
+    """Mutation and plant names, as the desktop app lists them."""
+    return list(desktop_calculator.mutations) + list(desktop_calculator.plants)
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("chakra", ["AscendedChakra", "Chakra", "CorruptChakra", "CorruptFoxfireChakra", "FoxfireChakra",
+                "HarmonisedChakra", "HarmonisedFoxfireChakra"]),
+    ("foxfire ch", ["CorruptFoxfireChakra", "FoxfireChakra", "HarmonisedFoxfireChakra"]),
+    ("ANCIENT amber", ["AncientAmber"]),
+    ("akra", []),
+    ("zzz", []),
+])
+def test_word_start_matches(names, query, expected):
+    assert PrefixIndex(names).search(query) == expected
+
+
+def test_spaced_names_match_from_any_word(names):
+    index = PrefixIndex(names)
+    assert "Aloe Vera" in index.search("vera")
+    assert "Aloe Vera" in index.search("aloev")
+    assert "Aloe Vera" in index.search("aloe-vera")
+    assert "Aloe Vera" not in index.search("lovera")
+
+
+def test_empty_query_returns_everything_in_order(names):
+    index = PrefixIndex(names)
+    assert index.search("") == names
+    assert index.search("  _-") == names
+
+
+def test_matches_brute_force_on_random_queries(names):
+    index = PrefixIndex(names)
+    rng = random.Random(48)
+    for _ in range(500):
+        name = rng.choice(names)
+        start = rng.randrange(len(name))
+        query = name[start:start + rng.randint(1, 6)]
+        if rng.random() < 0.5:
+            query = query.swapcase()
+        assert index.search(query) == brute_force(names, query), query
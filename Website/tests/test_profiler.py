@@ -0,0 +1,77 @@
+"""
+The sampling profiler and the admin endpoint that runs it.
+"""
+import re
+import threading
+
+import pytest
+
+import config
+from profiling import MAX_PROFILE_SECONDS, SamplingProfiler, sampling_profiler
+
+ADMIN = {"X-Admin-Token": "admin-secret"}
+
+
+def spin_until(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profile_returns_collapsed_stacks_of_busy_threads():
+    stop = threading.Event()
+    worker = threading.Thread(target=spin_until, args=(stop,), name="busy-worker")
+    worker.start()
+    try:
+        stacks = SamplingProfiler().profile(0.2, 0.002)
+    finally:
+        stop.set()
+        worker.join()
+
+    lines = stacks.splitlines()
+    assert all(re.fullmatch(r"[^ ].*;.* \d+", line) for line in lines)
+    busy = [line for line in lines if line.startswith("busy-worker;")]
+    assert busy and all("spin_until (test_profiler.py:" in line for line in busy)
+    # The sampling thread leaves itself out
+    assert not any("_sample (profiling.py:" in line for line in lines)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in busy) >= 10
+
+
+def test_one_profile_at_a_time():
+    profiler = SamplingProfiler()
+    thread = threading.Thread(target=profiler.profile, args=(0.3,))
+    thread.start()
+    while not profiler.running:
+        pass
+    with pytest.raises(RuntimeError):
+        profiler.profile(0.01)
+    thread.join()
+    assert profiler.profile(0.01, 0.005) is not None
+
+
+def test_endpoint_is_hidden_without_a_configured_token(client, monkeypatch):
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "")
+    assert client.post("/admin/profile?seconds=0.01", headers=ADMIN).status_code == 404
+
+
+def test_endpoint_requires_the_token(client, monkeypatch):
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "admin-secret")
+    assert client.post("/admin/profile?seconds=0.01").status_code == 403
+    assert client.post("/admin/profile?seconds=0.01", headers={"X-Admin-Token": "nope"}).status_code == 403
+
+
+def test_endpoint_returns_a_folded_download(client, monkeypatch):
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "admin-secret")
+    response = client.post("/admin/profile?seconds=0.05&interval=0.005", headers=ADMIN)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/plain; charset=utf-8"
+    assert re.fullmatch(r'attachment; filename="profile-\d+-\d+\.folded"', response.headers["content-disposition"])
+    assert response.text.strip()
+
+
+def test_endpoint_validates_and_refuses_overlapping_profiles(client, monkeypatch):
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "admin-secret")
+    assert client.post(f"/admin/profile?seconds={MAX_PROFILE_SECONDS + 1}", headers=ADMIN).status_code == 422
+    assert client.post("/admin/profile?seconds=1&interval=0", headers=ADMIN).status_code == 422
+
+    monkeypatch.setattr(sampling_profiler, "running", True)
+    assert client.post("/admin/profile?seconds=0.01", headers=ADMIN).status_code == 409
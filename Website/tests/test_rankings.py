@@ -0,0 +1,64 @@
+"""
+Plant rankings: the precomputed order against valuing every plant.
+"""
+import pytest
+
+from services.calculator_service import CalculatorService
+
+
+@pytest.fixture(scope="module")
+def service():
+    return CalculatorService()
+
+
+def brute_force(service, metric, variant, mutations):
+    """Value every plant at base weight and sort by the metric, best first."""
+    multiplier = service.calculate_mutation_multiplier(mutations)
+    rows = []
+    for name, plant in service.plants.items():
+        value = service.calculate_plant_value_dict(name, variant, plant.base_weight, multiplier)
+        score = value["base_value"] if metric == "value" else value["base_value"] / plant.base_weight
+        rows.append((score, name, value["final_value"]))
+    rows.sort(key=lambda row: (-row[0], row[1]))
+    return rows
+
+
+@pytest.mark.parametrize("metric", ["value", "value_per_kg"])
+@pytest.mark.parametrize("variant, mutations", [
+    ("Normal", []),
+    ("Gold", ["Wet", "Chilled"]),
+    ("Rainbow", ["Shocked", "Wet", "Wet"]),
+])
+def test_top_plants_match_valuing_every_plant(service, metric, variant, mutations):
+    everything = brute_force(service, metric, variant, mutations)
+    expected = everything[:25]
+    top = service.get_top_plants(metric, variant, mutations, limit=25)
+
+    assert [row["rank"] for row in top] == list(range(1, 26))
+    assert [row[metric] for row in top] == [
+        round(score) if metric == "value" else round(score, 2) for score, _, _ in expected
+    ]
+    # Plants tied on the metric may come back in either order
+    final_values = {name: final_value for _, name, final_value in everything}
+    assert all(row["value"] == final_values[row["plant_name"]] for row in top)
+
+
+def test_limit_beyond_the_catalog_returns_every_plant(service):
+    top = service.get_top_plants("value", "Normal", [], limit=len(service.plants) + 10)
+    assert sorted(row["plant_name"] for row in top) == sorted(service.plants)
+
+
+def test_endpoint(client):
+    response = client.get("/api/rankings", params={
+        "metric": "value_per_kg", "variant": "Gold", "mutations": ["Wet", "Chilled"], "limit": 3
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["mutations"] == ["Wet", "Chilled"]
+    assert [plant["rank"] for plant in body["plants"]] == [1, 2, 3]
+    per_kg = [plant["value_per_kg"] for plant in body["plants"]]
+    assert per_kg == sorted(per_kg, reverse=True)
+
+    assert client.get("/api/rankings", params={"metric": "rarity"}).status_code == 400
+    assert client.get("/api/rankings", params={"variant": "Shiny"}).status_code == 400
+    assert client.get("/api/rankings", params={"limit": 0}).status_code == 422
@@ -0,0 +1,29 @@
+"""
+Share creation through the API.
+"""
+
+SHARE = {
+    "plant": "Carrot", "variant": "Gold", "mutations": ["Wet"], "weight": "0.3",
+    "amount": "1", "result_value": "1,234", "final_sheckles": "1,234", "total_value": "1,234",
+    "total_multiplier": "x1", "mutation_breakdown": "Default", "weight_min": "0.17",
+    "weight_max": "0.38", "created_at": "2026-01-01T00:00:00",
+}
+
+
+def test_bulk_create_generates_distinct_ids(client):
+    response = client.post("/api/share/bulk", json={"shares": [dict(SHARE) for _ in range(500)]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["failed"] == 0
+    share_ids = [result["share_id"] for result in body["results"]]
+    assert len(set(share_ids)) == 500
+
+    lookup = client.post("/api/share/lookup", json={"share_ids": share_ids[:100]})
+    assert lookup.json()["succeeded"] == 100
+
+
+def test_identical_single_creates_get_distinct_ids(client):
+    responses = [client.post("/api/share", json=SHARE) for _ in range(20)]
+    assert [response.status_code for response in responses] == [200] * 20, responses[-1].text
+    share_ids = {response.json()["data"]["share_id"] for response in responses}
+    assert len(share_ids) == 20
@@ -0,0 +1,99 @@
+"""
+Share caching across workers: deleted shares stop being served everywhere.
+"""
+import asyncio
+
+from services.shared_result_cache import SharedResultCache
+from services.shared_results_service import SharedResultsService
+
+SHARE = {
+    "share_id": "share_cached", "plant": "Carrot", "variant": "Gold", "mutations": ["Wet"],
+    "weight": 0.3, "amount": 1, "result_value": "1", "final_sheckles": "1", "total_value": "1",
+    "total_multiplier": "x1", "mutation_breakdown": "", "weight_min": "0.1", "weight_max": "0.4",
+    "created_at": "2026-01-01T00:00:00", "expires_at": "2999-01-01T00:00:00",
+}
+
+
+class CountingService(SharedResultsService):
+    """A results service that counts existence checks."""
+
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.checks = 0
+
+    def share_exists(self, share_id):
+        self.checks += 1
+        return super().share_exists(share_id)
+
+
+def render(result):
+    return f"<p>{result['plant']}</p>"
+
+
+def test_delete_in_one_worker_reaches_the_others_within_the_window(tmp_path):
+    service = CountingService(tmp_path / "shares.db")
+    service.create_shared_result(dict(SHARE))
+    # Two workers: separate caches over the same database
+    reader = SharedResultCache(service, revalidate_after=0.2)
+    deleter = SharedResultCache(service, revalidate_after=0.2)
+
+    async def run():
+        assert (await reader.get_page("share_cached", render))[0] == "<p>Carrot</p>"
+        assert await reader.get("share_cached") is not None
+        assert service.checks == 0
+
+        assert service.delete_shared_result("share_cached")
+        deleter.invalidate("share_cached")
+        assert await deleter.get("share_cached") is None
+
+        # Still inside the reader's window: the confirmed copy is served
+        assert await reader.get_page("share_cached", render) is not None
+        await asyncio.sleep(0.3)
+        assert await reader.get_page("share_cached", render) is None
+        assert await reader.get("share_cached") is None
+
+    asyncio.run(run())
+    assert service.checks == 1
+    stats = reader.stats()
+    assert stats["revalidations"] == 1 and stats["revalidation_evictions"] == 1
+
+
+def test_zero_window_checks_every_hit(tmp_path):
+    service = CountingService(tmp_path / "shares.db")
+    service.create_shared_result(dict(SHARE))
+    cache = SharedResultCache(service, revalidate_after=0)
+
+    async def run():
+        await cache.get_page("share_cached", render)
+        for _ in range(3):
+            assert await cache.get_page("share_cached", render) is not None
+        service.delete_shared_result("share_cached")
+        assert await cache.get_page("share_cached", render) is None
+
+    asyncio.run(run())
+    assert service.checks == 4
+
+
+def test_confirmed_shares_are_served_without_checks(tmp_path):
+    service = CountingService(tmp_path / "shares.db")
+    service.create_shared_result(dict(SHARE))
+    cache = SharedResultCache(service, revalidate_after=60)
+
+    async def run():
+        for _ in range(50):
+            await cache.get_page("share_cached", render)
+
+    asyncio.run(run())
+    assert service.checks == 0
+
+
+def test_delete_then_get_through_the_api(client):
+    created = client.post("/api/share", json={
+        key: SHARE[key] for key in SHARE if key not in ("share_id", "expires_at")
+    }).json()["data"]["share_id"]
+    assert client.get(f"/share/{created}").status_code == 200
+    assert client.get(f"/api/share/{created}").json()["success"]
+
+    assert client.delete(f"/api/share/{created}").status_code == 200
+    assert client.get(f"/share/{created}").status_code == 404
+    assert not client.get(f"/api/share/{created}").json()["success"]
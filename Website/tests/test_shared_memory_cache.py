@@ -0,0 +1,135 @@
+"""
+The shared-memory hash table: lookups, eviction, and the seqlock that lets
+readers in one process skip slots another process is writing.
+"""
+import multiprocessing
+import os
+import struct
+import tempfile
+import time
+import uuid
+
+import pytest
+
+from services.shared_memory_cache import READ_RETRIES, SEQUENCE, SharedMemoryTable, WAYS, key_digest
+
+VALUE = struct.Struct("<QQQQ")
+
+
+@pytest.fixture
+def open_table():
+    """Open tables on a segment unique to the test; it and its lock file are removed afterwards."""
+    name = f"growcalc_test_{uuid.uuid4().hex[:12]}"
+    tables = []
+    yield lambda slots=1024: tables.append(SharedMemoryTable(name, slots, VALUE.size)) or tables[-1]
+    if tables:
+        tables[0].unlink()
+    for table in tables:
+        table.close()
+    if tables:
+        os.remove(os.path.join(tempfile.gettempdir(), f"{name}.lock"))
+
+
+def pack(n):
+    return VALUE.pack(n, n, n, n)
+
+
+def test_set_get_and_miss(open_table):
+    table = open_table()
+    table.set(key_digest(("Carrot", 0.3)), pack(7))
+
+    assert table.get(key_digest(("Carrot", 0.3))) == pack(7)
+    assert table.get(key_digest(("Carrot", 0.30000000000000004))) is None
+    table.set(key_digest(("Carrot", 0.3)), pack(8))
+    assert table.get(key_digest(("Carrot", 0.3))) == pack(8)
+
+    stats = table.stats()
+    assert (stats["hits"], stats["misses"], stats["writes"]) == (2, 1, 2)
+
+
+def test_second_handle_sees_the_same_segment(open_table):
+    writer = open_table()
+    reader = open_table()
+    writer.set(key_digest("shared"), pack(3))
+    assert reader.get(key_digest("shared")) == pack(3)
+
+
+def test_attaching_with_another_layout_fails(open_table):
+    open_table(1024)
+    with pytest.raises(ValueError):
+        open_table(2048)
+
+
+def test_full_bucket_evicts_within_the_bucket(open_table):
+    table = open_table(WAYS)
+    digests = [key_digest(n) for n in range(WAYS + 1)]
+    for n, digest in enumerate(digests):
+        table.set(digest, pack(n))
+
+    found = [table.get(digest) for digest in digests]
+    assert found[-1] == pack(WAYS)
+    assert sum(value is None for value in found) == 1
+
+
+def test_slot_being_written_reads_as_a_miss(open_table):
+    table = open_table(WAYS)
+    digest = key_digest("busy")
+    table.set(digest, pack(1))
+    offset = next(o for o in table._bucket_offsets(digest) if bytes(table.buf[o + 8:o + 24]) == digest)
+
+    # A writer in another process stopped between the two counter updates
+    sequence = SEQUENCE.unpack_from(table.buf, offset)[0]
+    SEQUENCE.pack_into(table.buf, offset, sequence + 1)
+    assert table.get(digest) is None
+    assert table.stats()["retries"] == READ_RETRIES
+
+    SEQUENCE.pack_into(table.buf, offset, sequence + 2)
+    assert table.get(digest) == pack(1)
+
+
+def _write_range(name, start, count):
+    table = SharedMemoryTable(name, 4096, VALUE.size)
+    for n in range(start, start + count):
+        table.set(key_digest(n), pack(n))
+    table.close()
+
+
+def _rewrite(name, seconds):
+    table = SharedMemoryTable(name, 4096, VALUE.size)
+    deadline = time.monotonic() + seconds
+    n = 0
+    while time.monotonic() < deadline:
+        n += 1
+        table.set(key_digest("hot"), pack(n))
+    table.close()
+
+
+def test_writers_in_several_processes(open_table):
+    table = open_table(4096)
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_write_range, args=(table.name, i * 100, 100)) for i in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    assert all(table.get(key_digest(n)) == pack(n) for n in range(400))
+
+
+def test_reads_never_see_a_torn_value(open_table):
+    table = open_table(4096)
+    table.set(key_digest("hot"), pack(0))
+    writer = multiprocessing.get_context("fork").Process(target=_rewrite, args=(table.name, 0.5))
+    writer.start()
+
+    seen = set()
+    while writer.is_alive():
+        value = table.get(key_digest("hot"))
+        if value is not None:
+            fields = VALUE.unpack(value)
+            assert len(set(fields)) == 1, fields
+            seen.add(fields[0])
+    writer.join()
+    assert writer.exitcode == 0
+    assert len(seen) > 1
@@ -0,0 +1,207 @@
+"""
+Shared results storage: schema setup across workers and lookups.
+"""
+import json
+import sqlite3
+import threading
+
+import config
+from services.shared_results_service import SharedResultsService
+
+
+def test_concurrent_startup_backfills_popularity_once(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    # A database from before popularity counts: shared results but no share_counts
+    SharedResultsService(db_path).init_database()
+    conn = sqlite3.connect(db_path)
+    conn.executescript("DROP TABLE share_counts; DROP TABLE share_combo_sketch;")
+    conn.executemany("""
+        INSERT INTO shared_results VALUES (?, 'Carrot', 'Gold', '["Wet"]', 0.3, 1,
+            '1', '1', '1', 'x1', '', '0.1', '0.4', '2026-01-01T00:00:00', '2999-01-01T00:00:00')
+    """, [(f"legacy_{i}",) for i in range(2000)])
+    conn.commit()
+    conn.close()
+
+    workers = 8
+    barrier = threading.Barrier(workers)
+
+    def start_worker():
+        service = SharedResultsService(db_path)
+        barrier.wait()
+        service.init_database()
+
+    threads = [threading.Thread(target=start_worker) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    conn = sqlite3.connect(db_path)
+    counts = dict(conn.execute("SELECT kind || ':' || name, count FROM share_counts").fetchall())
+    conn.close()
+    assert counts["total:"] == 2000
+    assert counts["plant:Carrot"] == 2000
+
+
+def share(share_id, plant="Carrot", variant="Gold", mutations=("Wet",), expires_at="2999-01-01T00:00:00"):
+    return {
+        "share_id": share_id, "plant": plant, "variant": variant, "mutations": list(mutations),
+        "weight": 0.3, "amount": 1, "result_value": "1", "final_sheckles": "1", "total_value": "1",
+        "total_multiplier": "x1", "mutation_breakdown": "", "weight_min": "0.1", "weight_max": "0.4",
+        "created_at": "2026-01-01T00:00:00", "expires_at": expires_at,
+    }
+
+
+def test_single_and_bulk_lookups_agree_on_missing_and_expired_ids(tmp_path):
+    service = SharedResultsService(tmp_path / "shares.db")
+    service.init_database()
+    service.create_shared_results([
+        share("share_live"), share("share_old", expires_at="2000-01-01T00:00:00")
+    ])
+
+    ids = ["share_live", "share_old", "share_missing"]
+    bulk = service.get_shared_results(ids)
+    single = {share_id: service.get_shared_result(share_id) for share_id in ids}
+    assert bulk == single
+    assert bulk["share_live"]["mutations"] == ["Wet"]
+    assert bulk["share_old"] is None and bulk["share_missing"] is None
+
+
+def test_single_and_bulk_lookups_agree_on_database_errors(tmp_path):
+    service = SharedResultsService(tmp_path / "shares.db")
+    service.init_database()
+    conn = sqlite3.connect(tmp_path / "shares.db")
+    conn.execute("DROP TABLE shared_results")
+    conn.commit()
+    conn.close()
+
+    assert service.get_shared_result("share_a") is None
+    assert service.get_shared_results(["share_a", "share_b"]) == {"share_a": None, "share_b": None}
+
+
+def recount(db_path):
+    """share_counts as they should be, recomputed from the shares table."""
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT plant, variant, mutations FROM shared_results").fetchall()
+    conn.close()
+    counts = {"total:": len(rows)} if rows else {}
+    for plant, variant, mutations in rows:
+        for key in [f"plant:{plant}", f"variant:{variant}"] + [f"mutation:{m}" for m in json.loads(mutations)]:
+            counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def stored_counts(db_path):
+    conn = sqlite3.connect(db_path)
+    counts = dict(conn.execute("SELECT kind || ':' || name, count FROM share_counts").fetchall())
+    conn.close()
+    return counts
+
+
+def test_deletes_and_expiry_are_taken_out_of_the_aggregates(tmp_path):
+    db_path = tmp_path / "shares.db"
+    service = SharedResultsService(db_path)
+    service.create_shared_results(
+        [share(f"share_{i}", mutations=("Wet",) if i % 2 else ("Wet", "Chilled")) for i in range(6)]
+        + [share("share_tomato", plant="Tomato", variant="Normal", mutations=())]
+        + [share(f"share_old_{i}", plant="Corn", expires_at="2000-01-01T00:00:00") for i in range(3)]
+    )
+    assert stored_counts(db_path) == recount(db_path)
+    assert stored_counts(db_path)["plant:Corn"] == 3
+
+    service.delete_shared_result("share_tomato")
+    service.delete_shared_result("share_tomato")
+    service.delete_shared_result("share_0")
+    counts = stored_counts(db_path)
+    assert counts == recount(db_path)
+    assert "plant:Tomato" not in counts and "variant:Normal" not in counts
+
+    assert service.cleanup_expired_results() == 3
+    assert stored_counts(db_path) == recount(db_path)
+
+    popularity = service.get_popularity()
+    assert popularity["total_shares"] == 5
+    assert [p["name"] for p in popularity["plants"]] == ["Carrot"]
+    combos = {(c["plant"], tuple(c["mutations"])): c["count"] for c in popularity["combos"]}
+    assert combos == {("Carrot", ("Wet",)): 3, ("Carrot", ("Chilled", "Wet")): 2}
+
+
+def test_maintenance_expiry_updates_the_aggregates(tmp_path):
+    from services.db_maintenance import DatabaseMaintenance
+
+    db_path = tmp_path / "shares.db"
+    service = SharedResultsService(db_path)
+    service.create_shared_results(
+        [share(f"share_old_{i}", plant="Corn", expires_at="2000-01-01T00:00:00") for i in range(7)]
+        + [share("share_live")]
+    )
+    assert DatabaseMaintenance(db_path, step_rows=3, sleep=0).delete_expired() == 7
+    assert stored_counts(db_path) == recount(db_path) == {
+        "total:": 1, "plant:Carrot": 1, "variant:Gold": 1, "mutation:Wet": 1
+    }
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM share_combo_sketch WHERE combo LIKE '[\"Corn\"%'").fetchone() == (0,)
+    conn.close()
+
+
+def test_combo_sketch_keeps_heavy_hitters_within_its_error_bounds(tmp_path, monkeypatch):
+    import services.shared_results_service as module
+
+    monkeypatch.setattr(module, "COMBO_SKETCH_SIZE", 4)
+    service = SharedResultsService(tmp_path / "shares.db")
+    plants = ["Carrot"] * 40 + ["Tomato"] * 25 + ["Corn"] * 15 + [f"Rare{i}" for i in range(12)]
+    true_counts = {}
+    for i, plant in enumerate(plants):
+        service.create_shared_result(share(f"share_{i}", plant=plant, mutations=()))
+        true_counts[plant] = true_counts.get(plant, 0) + 1
+
+    combos = service.get_popularity(limit=10)["combos"]
+    assert len(combos) == 4
+    assert [c["plant"] for c in combos[:3]] == ["Carrot", "Tomato", "Corn"]
+    for combo in combos:
+        assert combo["count"] - combo["error"] <= true_counts[combo["plant"]] <= combo["count"]
+
+    for i in range(40):
+        service.delete_shared_result(f"share_{i}")
+    combos = service.get_popularity(limit=10)["combos"]
+    assert "Carrot" not in [c["plant"] for c in combos]
+    assert combos[0]["plant"] == "Tomato"
+    for combo in combos:
+        assert 0 <= combo["error"] <= combo["count"]
+
+
+def test_paused_export_does_not_hold_back_wal_checkpoints(tmp_path):
+    db_path = tmp_path / "shares.db"
+    service = SharedResultsService(db_path)
+    service.create_shared_results([
+        dict(share(f"share_{i:04d}"), created_at=f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}")
+        for i in range(1200)
+    ])
+
+    export = service.iter_active_results(batch_size=500)
+    first = [next(export) for _ in range(10)]
+
+    # Writes made while the export is paused: one later share, one deletion ahead of it
+    service.create_shared_result(dict(share("share_late"), created_at="2027-01-01T00:00:00"))
+    service.delete_shared_result("share_1100")
+
+    conn = sqlite3.connect(db_path)
+    busy, _, _ = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    conn.close()
+    assert busy == 0
+
+    share_ids = [result["share_id"] for result in first + list(export)]
+    assert len(share_ids) == len(set(share_ids)) == 1200
+    assert share_ids[0] == "share_0000" and share_ids[-1] == "share_late"
+    assert "share_1100" not in share_ids
+
+
+def test_export_content_types(client, monkeypatch):
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "admin-secret")
+    headers = {"X-Admin-Token": "admin-secret"}
+
+    csv_export = client.get("/api/share/export?format=csv", headers=headers)
+    assert csv_export.headers["content-type"] == "text/csv; charset=utf-8"
+    assert csv_export.text.splitlines()[0].startswith("share_id,")
+    ndjson_export = client.get("/api/share/export", headers=headers)
+    assert ndjson_export.headers["content-type"] == "application/x-ndjson"
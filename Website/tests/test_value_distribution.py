@@ -0,0 +1,75 @@
+"""
+The value distribution: the closed form against brute-force sampling of the
+game formula over the expected weight range.
+"""
+import pytest
+
+from services.calculator_service import CalculatorService
+
+SAMPLES = 20001
+PERCENTILES = (0, 5, 12.5, 25, 50, 75, 95, 99.9, 100)
+
+
+@pytest.fixture(scope="module")
+def service():
+    return CalculatorService()
+
+
+def sampled_values(service, plant_name, variant, mutations):
+    """Value the plant at evenly spaced weights from 0.7x to 1.4x base_weight."""
+    base_weight = service.plants[plant_name].base_weight
+    multiplier = service.calculate_mutation_multiplier(mutations)
+    return [
+        service.calculate_plant_value_dict(
+            plant_name, variant, base_weight * (0.7 + 0.7 * i / (SAMPLES - 1)), multiplier
+        )["final_value"]
+        for i in range(SAMPLES)
+    ]
+
+
+@pytest.mark.parametrize("plant_name, variant, mutations", [
+    ("Carrot", "Normal", []),
+    ("Carrot", "Gold", ["Wet", "Chilled"]),
+    ("Ackee", "Rainbow", ["Shocked"]),
+    ("Aloe Vera", "Normal", ["Wet", "Wet"]),
+])
+def test_closed_form_matches_sampling(service, plant_name, variant, mutations):
+    values = sampled_values(service, plant_name, variant, mutations)
+    distribution = service.get_value_distribution(plant_name, variant, mutations, PERCENTILES)
+
+    assert distribution["min_value"] == values[0]
+    assert distribution["max_value"] == values[-1]
+    for p in PERCENTILES:
+        index = round(p / 100 * (SAMPLES - 1))
+        assert distribution["percentiles"][f"p{p:g}"] == pytest.approx(values[index], abs=1)
+
+    # Rounding each sample shifts the mean by at most half a sheckle
+    assert distribution["expected_value"] == pytest.approx(sum(values) / SAMPLES, rel=1e-4, abs=0.5)
+    floor = sum(1 for i in range(SAMPLES) if 0.7 + 0.7 * i / (SAMPLES - 1) <= 0.95) / SAMPLES
+    assert distribution["floor_probability"] == pytest.approx(floor, abs=1e-3)
+
+
+def test_repeated_requests_are_cached(service):
+    first = service.get_value_distribution("Carrot", "Gold", ["Wet", "Chilled"])
+    hits = service.get_distribution_cache_stats()["hits"]
+    again = service.get_value_distribution("Carrot", "Gold", ["Chilled", "Wet"])
+    assert again == first
+    assert service.get_distribution_cache_stats()["hits"] == hits + 1
+
+
+def test_endpoint(client):
+    response = client.post("/api/value-distribution", json={
+        "plant_name": "Carrot", "variant": "Gold", "mutations": ["Wet"], "percentiles": [50]
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["mutations"] == ["Wet"]
+    assert set(body["percentiles"]) == {"p50"}
+    assert body["min_value"] <= body["percentiles"]["p50"] <= body["max_value"]
+
+    assert client.post("/api/value-distribution", json={
+        "plant_name": "Carrot", "percentiles": [101]
+    }).status_code == 400
+    assert client.post("/api/value-distribution", json={
+        "plant_name": "Not A Plant"
+    }).status_code == 400
@@ -0,0 +1,60 @@
+"""
+Per-request phase timing, for the Server-Timing header. Kept free of web
+framework imports so services can time their phases without pulling FastAPI in.
+"""
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+# Phase durations (seconds) of the request being handled, or None outside a request
+request_phases: ContextVar[Optional[Dict[str, float]]] = ContextVar("growcalc_phases", default=None)
+
+
+class _Phase:
+    """Adds the duration of a with-block to one phase of the current request."""
+
+    __slots__ = ("phases", "name", "start")
+
+    def __init__(self, phases: Dict[str, float], name: str):
+        self.phases = phases
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        self.phases[self.name] = self.phases.get(self.name, 0.0) + elapsed
+        return False
+
+
+class _NoPhase:
+    """Stand-in outside a timed request, so phase() costs one context lookup."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+def phase(name: str):
+    """
+    Time a with-block as a Server-Timing phase of the current request; repeated
+    phases accumulate. Outside a request (or with timing disabled) it does nothing.
+    """
+    phases = request_phases.get()
+    if phases is None:
+        return _NO_PHASE
+    return _Phase(phases, name)
+
+
+def format_server_timing(phases: Dict[str, float]) -> str:
+    """Render phases as a Server-Timing header value, in milliseconds."""
+    return ", ".join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in phases.items())
@@ -0,0 +1,230 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+WEBSITE_DIR = ROOT_DIR / "Website"
+
+
+def use_website(rate_limits: bool = False) -> None:
+    """
+    Make the Website modules importable the way uvicorn runs them (cwd = Website).
+    Shared results and the warm-up snapshot go to scratch locations, never the
+    checked-in database. Admission control is on so its cost is measured; its
+    per-client rate limits are off unless rate_limits, since benchmarks send
+    every request from one address.
+    """
+    os.environ.setdefault("GROWCALC_DB_PATH", str(Path(tempfile.gettempdir()) / "growcalc_bench.db"))
+    os.environ.setdefault("GROWCALC_DATA_DIR", str(Path(tempfile.gettempdir()) / "growcalc_bench"))
+    os.environ.setdefault("GROWCALC_ADMISSION", "true")
+    # Requests without the header fall back to the connection's address
+    os.environ.setdefault("GROWCALC_ADMISSION_CLIENT_HEADER", "x-forwarded-for")
+    if not rate_limits:
+        os.environ.setdefault("GROWCALC_ADMISSION_LIMITS", '{"*": {"rate": 0}}')
+    if str(WEBSITE_DIR) not in sys.path:
+        sys.path.insert(0, str(WEBSITE_DIR))
+    os.chdir(WEBSITE_DIR)
+
+
+def use_root() -> None:
+    """Make core_logic importable with the repo root as cwd, like the desktop app."""
+    if str(ROOT_DIR) not in sys.path:
+        sys.path.insert(0, str(ROOT_DIR))
+    os.chdir(ROOT_DIR)
+
+
+def measure(
+    func: Callable[[], object],
+    repeat: int = 5,
+    min_time: float = 0.2,
+    quick: bool = False
+) -> dict:
+    """
+    Time func per call. The loop count is calibrated so each repeat runs for at
+    least min_time; reports wall and CPU time in microseconds per call.
+    """
+    if quick:
+        repeat, min_time = 2, 0.05
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 4:
+            break
+        number *= 4
+    number = max(1, int(number * (min_time / max(elapsed, 1e-9))))
+
+    wall_times = []
+    cpu_times = []
+    for _ in range(repeat):
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        wall_times.append((time.perf_counter() - start) / number)
+        cpu_times.append((time.process_time() - cpu_start) / number)
+
+    wall_times.sort()
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min_us": round(wall_times[0] * 1e6, 3),
+        "median_us": round(wall_times[len(wall_times) // 2] * 1e6, 3),
+        "cpu_us": round(min(cpu_times) * 1e6, 3)
+    }
+
+
+def memory_kb() -> Dict[str, int]:
+    """
+    This process's RSS, proportional set size (shared pages split between the
+    processes sharing them) and unique set size (private pages) in KiB.
+    """
+    usage = {"rss_kb": 0, "pss_kb": 0, "uss_kb": 0}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    usage["rss_kb"] = int(line.split()[1])
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    usage["pss_kb"] = int(line.split()[1])
+                elif line.startswith(("Private_Clean:", "Private_Dirty:")):
+                    usage["uss_kb"] += int(line.split()[1])
+    except OSError:
+        pass
+    return usage
+
+
+async def call_asgi(
+    app,
+    method: str,
+    path: str,
+    body: bytes = b"",
+    headers: Iterable[Tuple[str, str]] = (),
+    client: Tuple[str, int] = ("127.0.0.1", 50000)
+) -> Tuple[int, Dict[str, str], bytes]:
+    """Drive an ASGI app in-process with a single HTTP request."""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "query_string": query.encode("utf-8"),
+        "root_path": "",
+        "headers": [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in headers
+        ] + [(b"host", b"testserver"), (b"content-length", str(len(body)).encode())],
+        "client": client,
+        "server": ("testserver", 80),
+    }
+    request_sent = False
+    response_done = asyncio.Event()
+    status = 500
+    response_headers: Dict[str, str] = {}
+    chunks = []
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            for name, value in message.get("headers", []):
+                response_headers[name.decode("latin-1")] = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                response_done.set()
+
+    await app(scope, receive, send)
+    return status, response_headers, b"".join(chunks)
+
+
+class AsgiWebSocket:
+    """In-process WebSocket client for an ASGI app."""
+
+    def __init__(self, app, path: str):
+        """Prepare a connection to path; call connect() to open it."""
+        self.app = app
+        self.path = path
+        self._to_app: asyncio.Queue = asyncio.Queue()
+        self._from_app: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        """Run the WebSocket handshake."""
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "scheme": "ws",
+            "path": self.path,
+            "raw_path": self.path.encode("utf-8"),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"testserver")],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+            "subprotocols": [],
+        }
+        self._task = asyncio.create_task(self.app(scope, self._to_app.get, self._from_app.put))
+        await self._to_app.put({"type": "websocket.connect"})
+        message = await self._from_app.get()
+        if message["type"] != "websocket.accept":
+            raise RuntimeError(f"WebSocket rejected: {message}")
+
+    async def send_text(self, text: str) -> None:
+        """Send a text frame to the app."""
+        await self._to_app.put({"type": "websocket.receive", "text": text})
+
+    async def receive_text(self) -> str:
+        """Wait for the next text frame from the app."""
+        message = await self._from_app.get()
+        return message["text"]
+
+    async def close(self) -> None:
+        """Disconnect and wait for the handler to finish."""
+        await self._to_app.put({"type": "websocket.disconnect", "code": 1000})
+        if self._task is not None:
+            await self._task
+
+
+def json_body(data) -> bytes:
+    """Encode a request payload."""
+    return json.dumps(data).encode("utf-8")
+
+
+def print_results(results: Dict[str, dict], title: Optional[str] = None) -> None:
+    """Print benchmark results as an aligned table."""
+    if title:
+        print(title)
+    width = max((len(name) for name in results), default=10)
+    print(f"{'benchmark':<{width}}  {'median_us':>12}  {'min_us':>12}  {'cpu_us':>12}")
+    for name, stats in results.items():
+        print(
+            f"{name:<{width}}  {stats.get('median_us', 0):>12.3f}  "
+            f"{stats.get('min_us', 0):>12.3f}  {stats.get('cpu_us', 0):>12.3f}"
+        )
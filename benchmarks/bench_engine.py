@@ -0,0 +1,105 @@
+"""
+Value engine cost: the scalar formula and mutation multiplier in core_logic
+and in the web CalculatorService, the batch paths, and catalog loading.
+
+Usage: python benchmarks/bench_engine.py [--quick]
+"""
+import contextlib
+import io
+import sys
+from typing import Dict
+
+from _common import measure, print_results, use_root, use_website
+
+
+PLANT = "Carrot"
+VARIANT = "Gold"
+WEIGHT = 0.5
+MUTATIONS = ["Wet", "Shocked", "Chilled"]
+
+# Rows per batch call
+BATCH_SIZE = 1000
+
+
+def batch_rows(plants: list, variants: list, mutations: list, count: int) -> list:
+    """Deterministic mixed (plant, variant, weight, mutations, amount) rows."""
+    return [
+        (
+            plants[index % len(plants)],
+            variants[index % len(variants)],
+            0.5 + (index % 40) / 10,
+            mutations[index % 7:index % 7 + index % 4],
+            1 + index % 3
+        )
+        for index in range(count)
+    ]
+
+
+def run_core(quick: bool = False) -> Dict[str, dict]:
+    """Benchmark core_logic.PlantCalculator as the desktop app uses it."""
+    use_root()
+    from core_logic.plant_calculator import PlantCalculator
+
+    def load():
+        # The constructor prints a line per data file
+        with contextlib.redirect_stdout(io.StringIO()):
+            return PlantCalculator()
+
+    calculator = load()
+    multiplier = calculator.calculate_mutation_multiplier(MUTATIONS)
+    results = {
+        "core.load": measure(load, quick=quick),
+        "core.calculate_mutation_multiplier": measure(
+            lambda: calculator.calculate_mutation_multiplier(MUTATIONS), quick=quick
+        ),
+        "core.calculate_plant_value": measure(
+            lambda: calculator.calculate_plant_value(PLANT, VARIANT, WEIGHT, multiplier), quick=quick
+        ),
+    }
+    if hasattr(calculator, "calculate_batch"):
+        rows = batch_rows(
+            calculator.get_plant_names(), calculator.get_variant_names(),
+            calculator.get_mutation_names(), BATCH_SIZE
+        )
+        results[f"core.calculate_batch.{BATCH_SIZE}"] = measure(
+            lambda: calculator.calculate_batch(rows), quick=quick
+        )
+    return results
+
+
+def run_service(quick: bool = False) -> Dict[str, dict]:
+    """Benchmark the web CalculatorService."""
+    use_website()
+    from services.calculator_service import CalculatorService, calculator_service
+
+    multiplier = calculator_service.calculate_mutation_multiplier(MUTATIONS)
+    rows = batch_rows(
+        sorted(calculator_service.plants), sorted(calculator_service.variants),
+        sorted(calculator_service.mutations), BATCH_SIZE
+    )
+
+    return {
+        "service.load": measure(lambda: CalculatorService().ensure_loaded(), quick=quick),
+        "service.get_catalog": measure(calculator_service.get_catalog, quick=quick),
+        "service.calculate_mutation_multiplier": measure(
+            lambda: calculator_service.calculate_mutation_multiplier(MUTATIONS), quick=quick
+        ),
+        "service.calculate_plant_value": measure(
+            lambda: calculator_service.calculate_plant_value(PLANT, VARIANT, WEIGHT, multiplier), quick=quick
+        ),
+        "service.calculate_plant_value_dict": measure(
+            lambda: calculator_service.calculate_plant_value_dict(PLANT, VARIANT, WEIGHT, multiplier), quick=quick
+        ),
+        f"service.calculate_batch.{BATCH_SIZE}": measure(
+            lambda: calculator_service.calculate_batch(rows), quick=quick
+        ),
+    }
+
+
+def run(quick: bool = False) -> Dict[str, dict]:
+    """Benchmark both engines."""
+    return {**run_core(quick), **run_service(quick)}
+
+
+if __name__ == "__main__":
+    print_results(run(quick="--quick" in sys.argv), "Value engine")
@@ -0,0 +1,68 @@
+"""
+Per-interaction latency and CPU of the live WebSocket channel against POST /api/calculate.
+Each interaction is one weight edit, as sent by the calculator page.
+
+Usage: python benchmarks/bench_live_channel.py [--quick]
+"""
+import asyncio
+import itertools
+import json
+import sys
+from typing import Dict
+
+from _common import AsgiWebSocket, call_asgi, json_body, measure, print_results, use_website
+
+
+def run(quick: bool = False) -> Dict[str, dict]:
+    """Benchmark one weight edit over POST and over the live channel."""
+    use_website()
+    from main import app
+
+    loop = asyncio.new_event_loop()
+    counter = itertools.count()
+    payload = {
+        "plant_name": "Carrot",
+        "variant": "Gold",
+        "weight": 0.24,
+        "mutations": ["Wet", "Shocked"],
+        "plant_amount": 1
+    }
+    headers = [("content-type", "application/json")]
+
+    def post_interaction():
+        payload["weight"] = 0.2 + next(counter) % 1000 / 1000
+        status, _, _ = loop.run_until_complete(
+            call_asgi(app, "POST", "/api/calculate", json_body(payload), headers)
+        )
+        assert status == 200, status
+
+    websocket = AsgiWebSocket(app, "/api/ws/calculate")
+
+    async def open_channel():
+        await websocket.connect()
+        await websocket.send_text(json.dumps({
+            "s": 0, "p": payload["plant_name"], "v": payload["variant"],
+            "w": payload["weight"], "m": payload["mutations"], "a": 1
+        }))
+        await websocket.receive_text()
+
+    async def send_edit(seq: int, weight: float):
+        await websocket.send_text(json.dumps({"s": seq, "w": weight}))
+        return await websocket.receive_text()
+
+    def live_interaction():
+        seq = next(counter)
+        loop.run_until_complete(send_edit(seq, 0.2 + seq % 1000 / 1000))
+
+    try:
+        results = {"post.calculate": measure(post_interaction, quick=quick)}
+        loop.run_until_complete(open_channel())
+        results["ws.calculate"] = measure(live_interaction, quick=quick)
+        loop.run_until_complete(websocket.close())
+    finally:
+        loop.close()
+    return results
+
+
+if __name__ == "__main__":
+    print_results(run(quick="--quick" in sys.argv), "Live channel vs POST per interaction (in-process)")
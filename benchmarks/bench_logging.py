@@ -0,0 +1,190 @@
+"""
+Cost of a log call in the request path: disabled, written synchronously, and
+handed to the queued, sampled pipeline; plus POST /api/share end to end with
+logging off, synchronous to a slow sink, and queued.
+
+The share modes run interleaved, in rotating order, each time on a fresh
+database, so they see the same table sizes and the same drift. Each mode's raw
+timings are reported. The cost of logging is reported separately, as the
+ratio to logging off within each round, with its spread across rounds. Ratio
+entries carry no *_us keys, so run.py doesn't gate on them.
+
+Usage: python benchmarks/bench_logging.py [--quick]
+"""
+import asyncio
+import io
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from _common import call_asgi, json_body, measure, print_results, use_website
+
+# A sink that takes this long per write, like a congested pipe or log shipper
+SLOW_WRITE_SECONDS = 0.0002
+
+SHARE = {
+    "plant": "Carrot", "variant": "Gold", "mutations": ["Wet"], "weight": "0.3",
+    "amount": "1", "result_value": "1,234", "final_sheckles": "1,234", "total_value": "1,234",
+    "total_multiplier": "x1", "mutation_breakdown": "Default", "weight_min": "0.17",
+    "weight_max": "0.38", "created_at": "2026-01-01T00:00:00", "expires_at": "2026-01-02T00:00:00",
+}
+
+
+# Share creations timed per mode and round, and rounds per mode
+SHARES_PER_ROUND, QUICK_SHARES_PER_ROUND = 300, 100
+ROUNDS, QUICK_ROUNDS = 6, 3
+
+
+class SlowStream(io.TextIOBase):
+    """Discards writes after sleeping, to stand in for a sink that can't keep up."""
+
+    def write(self, text: str) -> int:
+        time.sleep(SLOW_WRITE_SECONDS)
+        return len(text)
+
+
+def time_calls(func: Callable[[], object], number: int) -> tuple:
+    """Wall and CPU seconds per call over number calls."""
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start) / number, (time.process_time() - cpu_start) / number
+
+
+def summarize(wall: List[float], cpu: List[float], number: int) -> dict:
+    """Per-round timings in the keys measure() uses."""
+    return {
+        "number": number,
+        "repeat": len(wall),
+        "min_us": round(min(wall) * 1e6, 3),
+        "median_us": round(statistics.median(wall) * 1e6, 3),
+        "cpu_us": round(min(cpu) * 1e6, 3)
+    }
+
+
+def ratio_summary(ratios: List[float]) -> dict:
+    """Median paired ratio with its spread across rounds."""
+    return {
+        "rounds": len(ratios),
+        "ratio_median": round(statistics.median(ratios), 3),
+        "ratio_min": round(min(ratios), 3),
+        "ratio_max": round(max(ratios), 3)
+    }
+
+
+def run(quick: bool = False) -> Dict[str, dict]:
+    """Benchmark single log calls per handler setup, then share creation per logging mode."""
+    use_website()
+    import main
+    from log_pipeline import LOG_RECORDS_DROPPED, log_pipeline
+    from services.shared_results_service import shared_results_service
+
+    root = logging.getLogger()
+    logger = logging.getLogger("bench.logging")
+    devnull = open(os.devnull, "w")
+
+    def log_share():
+        logger.info("Created shared result: %s", "share_1", extra={"event": "share_created", "share_id": "share_1"})
+
+    def use_handler(handler: logging.Handler, level: int = logging.INFO) -> None:
+        log_pipeline.uninstall()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(handler)
+        root.setLevel(level)
+
+    def use_pipeline(sample_rates=None) -> None:
+        log_pipeline.install(stream=SlowStream(), sample_rates=sample_rates, routed_loggers=())
+
+    results = {}
+    dropped = {}
+    try:
+        use_handler(logging.StreamHandler(devnull), logging.WARNING)
+        results["log.disabled"] = measure(log_share, quick=quick)
+        use_handler(logging.StreamHandler(devnull))
+        results["log.sync_devnull"] = measure(log_share, quick=quick)
+        use_handler(logging.StreamHandler(SlowStream()))
+        results["log.sync_slow_sink"] = measure(log_share, quick=quick)
+
+        for name, sample_rates in (("log.queued_slow_sink", None), ("log.queued_sampled", {"share_created": 0.1})):
+            before = {reason: LOG_RECORDS_DROPPED.value(reason) for reason in ("sampled", "queue_full")}
+            use_pipeline(sample_rates)
+            results[name] = measure(log_share, quick=quick)
+            log_pipeline.uninstall()
+            dropped[name] = {
+                f"{reason}_dropped": int(LOG_RECORDS_DROPPED.value(reason) - count)
+                for reason, count in before.items()
+            }
+
+        # End to end: one INFO record per share created
+        app = main.create_app()
+        loop = asyncio.new_event_loop()
+        body = json_body(SHARE)
+
+        def share():
+            status, _, _ = loop.run_until_complete(call_asgi(app, "POST", "/api/share", body))
+            assert status == 200, status
+
+        modes = {
+            "logging_off": lambda: use_handler(logging.StreamHandler(devnull), logging.WARNING),
+            "sync_slow_sink": lambda: use_handler(logging.StreamHandler(SlowStream())),
+            "queued_sampled": lambda: use_pipeline({"share_created": 0.1}),
+        }
+        number = QUICK_SHARES_PER_ROUND if quick else SHARES_PER_ROUND
+        rounds = QUICK_ROUNDS if quick else ROUNDS
+        wall = {mode: [] for mode in modes}
+        cpu = {mode: [] for mode in modes}
+        scratch = tempfile.TemporaryDirectory(prefix="growcalc_bench_logging_")
+        original_db = shared_results_service.db_path
+        try:
+            names = list(modes)
+            for round_index in range(rounds):
+                # Rotate the order so no mode always runs first (or last)
+                for mode in names[round_index % len(names):] + names[:round_index % len(names)]:
+                    shared_results_service.db_path = Path(scratch.name) / f"{round_index}_{mode}.db"
+                    shared_results_service._initialized = False
+                    shared_results_service.init_database()
+                    modes[mode]()
+                    share()  # Warm up the connection and statements outside the timing
+                    mode_wall, mode_cpu = time_calls(share, number)
+                    # Drain the queue before the next mode starts
+                    log_pipeline.uninstall()
+                    wall[mode].append(mode_wall)
+                    cpu[mode].append(mode_cpu)
+        finally:
+            shared_results_service.db_path = original_db
+            shared_results_service._initialized = False
+            loop.close()
+            scratch.cleanup()
+
+        for mode in modes:
+            results[f"share_create.{mode}"] = summarize(wall[mode], cpu[mode], number)
+        for mode in ("sync_slow_sink", "queued_sampled"):
+            results[f"share_create.{mode}_vs_off"] = ratio_summary([
+                mode_wall / off_wall for mode_wall, off_wall in zip(wall[mode], wall["logging_off"])
+            ])
+    finally:
+        log_pipeline.uninstall()
+        devnull.close()
+
+    for name, counts in dropped.items():
+        results[name].update(counts)
+    return results
+
+
+if __name__ == "__main__":
+    results = run(quick="--quick" in sys.argv)
+    print_results({name: stats for name, stats in results.items() if "median_us" in stats}, "Logging overhead")
+    for name in ("log.queued_slow_sink", "log.queued_sampled"):
+        print(f"{name}: {results[name]['sampled_dropped']} sampled out, "
+              f"{results[name]['queue_full_dropped']} dropped on a full queue")
+    for name in ("share_create.sync_slow_sink_vs_off", "share_create.queued_sampled_vs_off"):
+        ratio = results[name]
+        print(f"{name}: x{ratio['ratio_median']} (x{ratio['ratio_min']} to x{ratio['ratio_max']} "
+              f"over {ratio['rounds']} rounds)")
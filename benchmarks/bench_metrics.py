@@ -0,0 +1,62 @@
+"""
+Per-request overhead of the metrics middleware and the cost of recording and
+rendering metrics.
+
+Usage: python benchmarks/bench_metrics.py [--quick]
+"""
+import asyncio
+import sys
+from typing import Dict
+
+from _common import call_asgi, measure, print_results, use_website
+
+
+async def noop_app(scope, receive, send):
+    """Smallest possible ASGI endpoint, so only the middleware is measured."""
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def run(quick: bool = False) -> Dict[str, dict]:
+    """Benchmark a bare ASGI app with and without MetricsMiddleware, plus metric primitives."""
+    use_website()
+    from metrics import MetricsMiddleware, MetricsRegistry
+
+    registry = MetricsRegistry()
+    instrumented = MetricsMiddleware(noop_app, registry)
+    counter = registry.counter("bench_total", "Benchmark counter", ("route",))
+    histogram = registry.histogram("bench_seconds", "Benchmark histogram", ("route",))
+    loop = asyncio.new_event_loop()
+
+    def request(app):
+        def call():
+            status, _, _ = loop.run_until_complete(call_asgi(app, "GET", "/api/plants"))
+            assert status == 200, status
+        return call
+
+    try:
+        results = {
+            "asgi.bare": measure(request(noop_app), quick=quick),
+            "asgi.metrics_middleware": measure(request(instrumented), quick=quick),
+            "counter.inc": measure(lambda: counter.inc("/api/calculate"), quick=quick),
+            "histogram.observe": measure(lambda: histogram.observe(0.003, "/api/calculate"), quick=quick),
+        }
+    finally:
+        loop.close()
+
+    # A realistic scrape: ~20 routes with a few status codes each
+    for index in range(20):
+        for status in ("200", "400", "404"):
+            registry.counter("bench_requests_total", "", ("route", "status")).inc(f"/route/{index}", status)
+        histogram.observe(0.01, f"/route/{index}")
+    results["registry.render"] = measure(registry.render, quick=quick)
+
+    results["middleware.overhead"] = {
+        key: round(results["asgi.metrics_middleware"][key] - results["asgi.bare"][key], 3)
+        for key in ("median_us", "min_us", "cpu_us")
+    }
+    return results
+
+
+if __name__ == "__main__":
+    print_results(run(quick="--quick" in sys.argv), "Metrics overhead")
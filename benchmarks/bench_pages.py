@@ -0,0 +1,66 @@
+"""
+Server-side rendering cost of the HTML pages, through the app and template only.
+
+Usage: python benchmarks/bench_pages.py [--quick]
+"""
+import asyncio
+import sys
+from typing import Dict
+
+from _common import call_asgi, measure, print_results, use_website
+
+
+SHARE = {
+    "share_id": "benchpage",
+    "plant": "Carrot",
+    "variant": "Gold",
+    "mutations": ["Wet", "Shocked"],
+    "weight": 0.5,
+    "amount": 1,
+    "result_value": "133,554",
+    "final_sheckles": "133,554",
+    "total_value": "133,554",
+    "total_multiplier": "101x",
+    "mutation_breakdown": "Wet + Shocked",
+    "weight_min": "0.19",
+    "weight_max": "0.38",
+    "created_at": "2025-01-01T00:00:00",
+    "expires_at": "2025-01-02T00:00:00",
+}
+
+
+def run(quick: bool = False) -> Dict[str, dict]:
+    """Benchmark GET / end to end and the index and share templates on their own."""
+    use_website()
+    from main import app
+    from routes.calculator import render_share_page, templates
+    from services.calculator_service import calculator_service
+
+    loop = asyncio.new_event_loop()
+    index = templates.get_template("index.html")
+    context = {
+        "request": None,
+        "plants": calculator_service.get_plants(),
+        "variants": calculator_service.get_variants(),
+        "mutations": calculator_service.get_mutations(),
+    }
+
+    def page(path: str):
+        def request():
+            status, _, _ = loop.run_until_complete(call_asgi(app, "GET", path))
+            assert status == 200, status
+        return request
+
+    try:
+        return {
+            "page.index": measure(page("/"), quick=quick),
+            "page.mutation_calculator": measure(page("/mutation-calculator"), quick=quick),
+            "template.index": measure(lambda: index.render(context), quick=quick),
+            "template.share": measure(lambda: render_share_page(SHARE), quick=quick),
+        }
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    print_results(run(quick="--quick" in sys.argv), "Page rendering")
@@ -0,0 +1,66 @@
+"""
+Per-request cost of /api/calculate with and without the fast response path.
+
+Usage: python benchmarks/bench_serialization.py [--quick]
+"""
+import asyncio
+import sys
+from typing import Dict
+
+from _common import call_asgi, json_body, measure, print_results, use_website
+
+
+PAYLOAD = {
+    "plant_name": "Carrot",
+    "variant": "Gold",
+    "weight": 0.5,
+    "mutations": ["Wet", "Shocked", "Chilled"],
+    "plant_amount": 10
+}
+
+
+def run(quick: bool = False) -> Dict[str, dict]:
+    """Benchmark the validated and fast response paths, end to end and engine only."""
+    use_website()
+    import config
+    from main import app
+    from services.calculator_service import calculator_service
+
+    loop = asyncio.new_event_loop()
+    body = json_body(PAYLOAD)
+    headers = [("content-type", "application/json")]
+
+    def request():
+        status, _, _ = loop.run_until_complete(
+            call_asgi(app, "POST", "/api/calculate", body, headers)
+        )
+        assert status == 200, status
+
+    args = (
+        PAYLOAD["plant_name"], PAYLOAD["variant"], PAYLOAD["weight"],
+        PAYLOAD["mutations"], PAYLOAD["plant_amount"]
+    )
+    results = {
+        "engine.calculate_full_value": measure(
+            lambda: calculator_service.calculate_full_value(*args), quick=quick
+        ),
+        "engine.calculate_full_value_dict": measure(
+            lambda: calculator_service.calculate_full_value_dict(*args), quick=quick
+        ),
+    }
+
+    fast_responses = config.FAST_RESPONSES
+    try:
+        config.FAST_RESPONSES = False
+        results["api.calculate.validated"] = measure(request, quick=quick)
+        config.FAST_RESPONSES = True
+        results["api.calculate.fast"] = measure(request, quick=quick)
+    finally:
+        config.FAST_RESPONSES = fast_responses
+        loop.close()
+
+    return results
+
+
+if __name__ == "__main__":
+    print_results(run(quick="--quick" in sys.argv), "Calculation response serialization")
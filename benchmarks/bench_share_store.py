@@ -0,0 +1,126 @@
+"""
+SharedResultsService create, get and cleanup cost as the table grows, from 10k
+to 1M stored shares. Databases are built in a temporary directory.
+
+Usage: python benchmarks/bench_share_store.py [--quick]
+"""
+import itertools
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict
+
+from _common import measure, print_results, use_website
+
+
+SIZES = (10_000, 100_000, 1_000_000)
+QUICK_SIZES = (10_000,)
+
+# Share IDs per bulk lookup
+LOOKUP_SIZE = 100
+
+# Fraction of stored shares that have expired when cleanup runs
+EXPIRED_FRACTION = 0.01
+
+
+def share(share_id: str, created_at: datetime, expires_at: datetime) -> dict:
+    """A shared result shaped like the ones the calculator page posts."""
+    return {
+        "share_id": share_id,
+        "plant": "Carrot",
+        "variant": "Gold",
+        "mutations": ["Wet", "Shocked"],
+        "weight": 0.5,
+        "amount": 1,
+        "result_value": "133,554",
+        "final_sheckles": "133,554",
+        "total_value": "133,554",
+        "total_multiplier": "101x",
+        "mutation_breakdown": "Wet + Shocked",
+        "weight_min": "0.19",
+        "weight_max": "0.38",
+        "created_at": created_at.isoformat(),
+        "expires_at": expires_at.isoformat(),
+    }
+
+
+def fill(service, rows: int, expired: int) -> None:
+    """Bulk-load rows live shares plus expired ones, bypassing the per-share API."""
+    from services.shared_results_service import INSERT_SHARED_RESULT_SQL
+
+    # Tables are created lazily, on the service's first connection
+    service.init_database()
+    now = datetime.utcnow()
+    live_until = now + timedelta(hours=24)
+    expired_at = now - timedelta(hours=1)
+    with sqlite3.connect(service.db_path) as conn:
+        conn.executemany(INSERT_SHARED_RESULT_SQL, (
+            service._share_row(share(f"live{index:07d}", now, live_until)) for index in range(rows)
+        ))
+        conn.executemany(INSERT_SHARED_RESULT_SQL, (
+            service._share_row(share(f"expd{index:07d}", expired_at - timedelta(hours=24), expired_at))
+            for index in range(expired)
+        ))
+
+
+def once(func) -> dict:
+    """Time a single call of an operation that can't be repeated; same keys as measure()."""
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    func()
+    elapsed = round((time.perf_counter() - start) * 1e6, 3)
+    return {
+        "number": 1,
+        "repeat": 1,
+        "min_us": elapsed,
+        "median_us": elapsed,
+        "cpu_us": round((time.process_time() - cpu_start) * 1e6, 3)
+    }
+
+
+def run_size(rows: int, directory: Path, quick: bool) -> Dict[str, dict]:
+    """Benchmark one table size."""
+    from services.shared_results_service import SharedResultsService
+
+    service = SharedResultsService(directory / f"shares_{rows}.db")
+    fill(service, rows, int(rows * EXPIRED_FRACTION))
+
+    rng = random.Random(rows)
+    ids = itertools.count()
+    now = datetime.utcnow()
+    expires = now + timedelta(hours=24)
+
+    def create():
+        assert service.create_shared_result(share(f"new{next(ids):08d}", now, expires))
+
+    def get():
+        assert service.get_shared_result(f"live{rng.randrange(rows):07d}") is not None
+
+    def lookup():
+        service.get_shared_results([f"live{rng.randrange(rows):07d}" for _ in range(LOOKUP_SIZE)])
+
+    return {
+        f"store.{rows}.create": measure(create, quick=quick),
+        f"store.{rows}.get": measure(get, quick=quick),
+        f"store.{rows}.get_missing": measure(lambda: service.get_shared_result("missing"), quick=quick),
+        f"store.{rows}.lookup.{LOOKUP_SIZE}": measure(lookup, quick=quick),
+        f"store.{rows}.cleanup": once(service.cleanup_expired_results),
+    }
+
+
+def run(quick: bool = False) -> Dict[str, dict]:
+    """Benchmark each table size in a scratch directory."""
+    use_website()
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in QUICK_SIZES if quick else SIZES:
+            results.update(run_size(rows, Path(directory), quick))
+    return results
+
+
+if __name__ == "__main__":
+    print_results(run(quick="--quick" in sys.argv), "Shared results store")
@@ -0,0 +1,158 @@
+"""
+Per-process calculation caches versus the shared-memory cache across several
+worker processes: hit rate, engine computations and memory per worker.
+
+Usage: python benchmarks/bench_shared_cache.py [--quick]
+"""
+import asyncio
+import multiprocessing
+import os
+import random
+import sys
+from typing import Dict, Optional
+
+from _common import measure, memory_kb, print_results, use_website
+
+
+WORKERS = 4
+LOCAL_CACHE_SIZE = 2000
+SHARED_SLOTS = 16384
+
+
+def zipf_inputs(calculator, count: int, seed: int) -> list:
+    """Calculation inputs with a long-tailed popularity, like real traffic."""
+    rng = random.Random(seed)
+    plants = sorted(calculator.plants)
+    variants = sorted(calculator.variants)
+    mutations = sorted(calculator.mutations)
+    universe_rng = random.Random(0)
+    universe = [
+        (
+            universe_rng.choice(plants),
+            universe_rng.choice(variants),
+            round(universe_rng.uniform(0.1, 20.0), 2),
+            universe_rng.sample(mutations, universe_rng.randint(0, 4)),
+            universe_rng.randint(1, 5)
+        )
+        for _ in range(20000)
+    ]
+    weights = [1.0 / (rank + 1) for rank in range(len(universe))]
+    return rng.choices(universe, weights=weights, k=count)
+
+
+def worker(seed: int, requests: int, shared_name: Optional[str], start, results) -> None:
+    """Serve a request mix through a fresh CalculationCache and report its counters."""
+    use_website()
+    from services.calculation_cache import CalculationCache, open_shared_tables
+    from services.calculator_service import calculator_service
+
+    shared_results, shared_multipliers = open_shared_tables(shared_name or "", SHARED_SLOTS)
+    cache = CalculationCache(
+        calculator_service,
+        max_size=LOCAL_CACHE_SIZE,
+        shared_results=shared_results,
+        shared_multipliers=shared_multipliers
+    )
+    inputs = zipf_inputs(calculator_service, requests, seed)
+
+    async def serve():
+        for args in inputs:
+            await cache.calculate(*args)
+
+    start.wait()
+    asyncio.run(serve())
+
+    stats = cache.stats()
+    local = stats["results"]
+    shared_hits = stats["shared_results"]["hits"] if shared_results else 0
+    results.put({
+        "lookups": local["hits"] + local["misses"],
+        "hits": local["hits"] + shared_hits,
+        "computed": local["misses"] - shared_hits,
+        **memory_kb()
+    })
+    if shared_results:
+        shared_results.close()
+        shared_multipliers.close()
+
+
+def run_workers(requests: int, shared_name: Optional[str]) -> dict:
+    """Run WORKERS processes concurrently and aggregate their counters."""
+    context = multiprocessing.get_context("fork")
+    start = context.Event()
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(seed, requests, shared_name, start, results))
+        for seed in range(WORKERS)
+    ]
+    for process in processes:
+        process.start()
+    start.set()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    lookups = sum(report["lookups"] for report in reports)
+    hits = sum(report["hits"] for report in reports)
+    return {
+        "workers": WORKERS,
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        "computed": sum(report["computed"] for report in reports),
+        "rss_kb_per_worker": sum(report["rss_kb"] for report in reports) // WORKERS,
+        "pss_kb_per_worker": sum(report["pss_kb"] for report in reports) // WORKERS
+    }
+
+
+def run(quick: bool = False) -> Dict[str, dict]:
+    """Benchmark table operations, then compare per-process and shared caching."""
+    use_website()
+    from services.cache import LRUCache
+    from services.calculation_cache import SHARED_RESULT
+    from services.shared_memory_cache import SharedMemoryTable, key_digest
+
+    name = f"growcalc_bench_{os.getpid()}"
+    table = SharedMemoryTable(name, SHARED_SLOTS, SHARED_RESULT.size)
+    try:
+        key = (1, 3, 2, 1.5, 0b1011, 1)
+        digest = key_digest(key)
+        value = SHARED_RESULT.pack(2.0, 100.0, 1.5, (300).to_bytes(16, "little", signed=True))
+        lru = LRUCache(max_size=LOCAL_CACHE_SIZE)
+        lru.set(key, value)
+        table.set(digest, value)
+        results = {
+            "lru.get": measure(lambda: lru.get(key), quick=quick),
+            "shared.key_digest": measure(lambda: key_digest(key), quick=quick),
+            "shared.get": measure(lambda: table.get(digest), quick=quick),
+            "shared.set": measure(lambda: table.set(digest, value), quick=quick),
+        }
+    finally:
+        table.close()
+        table.unlink()
+
+    requests = 5000 if quick else 30000
+    results["workers.per_process"] = run_workers(requests, None)
+    try:
+        results["workers.shared"] = run_workers(requests, name)
+    finally:
+        _unlink_tables(name)
+    return results
+
+
+def _unlink_tables(name: str) -> None:
+    """Remove the benchmark's shared segments."""
+    from services.calculation_cache import open_shared_tables
+
+    for table in open_shared_tables(name, SHARED_SLOTS):
+        if table is not None:
+            table.unlink()
+            table.close()
+
+
+if __name__ == "__main__":
+    results = run(quick="--quick" in sys.argv)
+    print_results(
+        {name: stats for name, stats in results.items() if "median_us" in stats},
+        "Shared-memory cache operations"
+    )
+    for name in ("workers.per_process", "workers.shared"):
+        print(f"{name}: {results[name]}")
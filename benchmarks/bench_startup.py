@@ -0,0 +1,76 @@
+"""
+Cold import time of the calculator modules and the web app, and the time to
+build the app and run its startup, each measured in a fresh interpreter.
+
+Usage: python benchmarks/bench_startup.py [--quick]
+"""
+import os
+import subprocess
+import sys
+from typing import Dict
+
+from _common import ROOT_DIR, WEBSITE_DIR, print_results, use_website
+
+
+# Build the app and run its lifespan startup (data, database, shared tables)
+STARTUP = (
+    "import asyncio, main\n"
+    "app = main.create_app()\n"
+    "asyncio.run(main.lifespan(app).__aenter__())"
+)
+
+# (name, working directory, statement)
+IMPORTS = [
+    ("import.core_logic", ROOT_DIR, "from core_logic.plant_calculator import PlantCalculator"),
+    ("import.calculator_service", WEBSITE_DIR, "import services.calculator_service"),
+    ("import.shared_results_service", WEBSITE_DIR, "import services.shared_results_service"),
+    ("import.main", WEBSITE_DIR, "import main"),
+    ("startup.create_app", WEBSITE_DIR, "import main\nmain.create_app()"),
+    ("startup.lifespan", WEBSITE_DIR, STARTUP),
+]
+
+# Prints the import's wall and CPU time in seconds
+TIMER = (
+    "import time\n"
+    "wall, cpu = time.perf_counter(), time.process_time()\n"
+    "{statement}\n"
+    "print(time.perf_counter() - wall, time.process_time() - cpu)\n"
+)
+
+
+def time_import(cwd, statement: str, repeat: int) -> dict:
+    """Time a statement in repeat fresh interpreters; same keys as measure()."""
+    use_website()
+    env = {
+        **os.environ,
+        "PYTHONDONTWRITEBYTECODE": "1",
+        "PYTHONPATH": str(cwd),
+        "GROWCALC_WARM_TIME_BUDGET": "0"
+    }
+    wall_times = []
+    cpu_times = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(statement=statement)],
+            cwd=cwd, env=env, capture_output=True, text=True, check=True
+        ).stdout.split()
+        wall_times.append(float(output[-2]))
+        cpu_times.append(float(output[-1]))
+    wall_times.sort()
+    return {
+        "number": 1,
+        "repeat": repeat,
+        "min_us": round(wall_times[0] * 1e6, 3),
+        "median_us": round(wall_times[len(wall_times) // 2] * 1e6, 3),
+        "cpu_us": round(min(cpu_times) * 1e6, 3)
+    }
+
+
+def run(quick: bool = False) -> Dict[str, dict]:
+    """Benchmark each statement in a fresh interpreter."""
+    repeat = 3 if quick else 7
+    return {name: time_import(cwd, statement, repeat) for name, cwd, statement in IMPORTS}
+
+
+if __name__ == "__main__":
+    print_results(run(quick="--quick" in sys.argv), "Import time")
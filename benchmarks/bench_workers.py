@@ -0,0 +1,124 @@
+"""
+Memory per worker when several workers fork from one parent, with the catalog
+loaded lazily in each worker versus preloaded and gc.freeze()d in the parent
+(main.prefork, as gunicorn.conf.py does), plus how long each worker takes to
+become ready after the fork.
+
+Usage: python benchmarks/bench_workers.py [--quick]
+"""
+import asyncio
+import gc
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+from _common import call_asgi, memory_kb, use_website
+
+
+WORKERS = 4
+MODES = ("lazy", "prefork")
+
+# Requests each worker serves before measuring, so it touches what real traffic does
+REQUESTS = [
+    ("GET", "/", b""),
+    ("GET", "/api/catalog", b""),
+    ("POST", "/api/calculate", json.dumps({
+        "plant_name": "Carrot", "variant": "Gold", "weight": 0.3,
+        "mutations": ["Wet", "Shocked"], "plant_amount": 1
+    }).encode()),
+    ("GET", "/api/weight-range/Carrot", b""),
+]
+
+
+def worker(app, forked_at: float, rounds: int, ready, measure, results) -> None:
+    """Start the app's lifespan, serve some traffic, then report memory once every worker is up."""
+    import main
+
+    async def serve():
+        async with main.lifespan(app):
+            ready_ms = (time.perf_counter() - forked_at) * 1000
+            for _ in range(rounds):
+                for method, path, body in REQUESTS:
+                    headers = [("content-type", "application/json")] if body else []
+                    status, _, _ = await call_asgi(app, method, path, body, headers)
+                    assert status == 200, (path, status)
+            gc.collect()
+            ready.put(ready_ms)
+            measure.wait()
+            results.put({"ready_ms": ready_ms, **memory_kb()})
+
+    gc.enable()
+    asyncio.run(serve())
+
+
+def run_mode(mode: str, rounds: int) -> dict:
+    """Fork WORKERS workers from a parent prepared for mode and aggregate their reports."""
+    if mode == "prefork":
+        gc.disable()
+    use_website()
+    import main
+    app = main.create_app()
+    if mode == "prefork":
+        main.prefork()
+
+    context = multiprocessing.get_context("fork")
+    ready = context.Queue()
+    measure = context.Event()
+    results = context.Queue()
+    processes = []
+    for _ in range(WORKERS):
+        process = context.Process(
+            target=worker, args=(app, time.perf_counter(), rounds, ready, measure, results)
+        )
+        process.start()
+        processes.append(process)
+    for _ in processes:
+        ready.get()
+    measure.set()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    return {
+        "workers": WORKERS,
+        "ready_ms": round(max(report["ready_ms"] for report in reports), 1),
+        "rss_kb_per_worker": sum(report["rss_kb"] for report in reports) // WORKERS,
+        "pss_kb_per_worker": sum(report["pss_kb"] for report in reports) // WORKERS,
+        "uss_kb_per_worker": sum(report["uss_kb"] for report in reports) // WORKERS
+    }
+
+
+def run(quick: bool = False) -> Dict[str, dict]:
+    """Measure each mode in a fresh parent process, so imports don't carry over."""
+    rounds = 20 if quick else 200
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            "GROWCALC_DB_PATH": str(Path(directory) / "shares.db"),
+            "GROWCALC_WARM_SNAPSHOT_FILE": str(Path(directory) / "snapshot.json"),
+            "GROWCALC_WARM_TIME_BUDGET": "0",
+        }
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--rounds", str(rounds)],
+                env=env, capture_output=True, text=True, check=True
+            ).stdout
+            results[f"workers.{mode}"] = json.loads(output.splitlines()[-1])
+    return results
+
+
+if __name__ == "__main__":
+    if "--mode" in sys.argv:
+        mode = sys.argv[sys.argv.index("--mode") + 1]
+        rounds = int(sys.argv[sys.argv.index("--rounds") + 1])
+        print(json.dumps(run_mode(mode, rounds)))
+    else:
+        for name, stats in run(quick="--quick" in sys.argv).items():
+            print(f"{name}: {stats}")
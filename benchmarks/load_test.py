@@ -0,0 +1,473 @@
+"""
+Load generator that replays the calculator page's traffic mix against the app
+and reports throughput and latency percentiles per route. It drives the app
+in-process over ASGI by default, or over a local socket: a uvicorn server it
+starts itself (--serve) or one that is already running (--url). Nothing
+leaves the machine.
+
+Usage:
+    python benchmarks/load_test.py [--concurrency 32] [--duration 10] [--rate RPS]
+    python benchmarks/load_test.py --serve [--workers 2] [--concurrency 64]
+    python benchmarks/load_test.py --url http://127.0.0.1:8000
+    python benchmarks/load_test.py --mix calculate=10,share_view=5 --json results.json
+    python benchmarks/load_test.py --clients 1    # every virtual user is the same client
+    python benchmarks/load_test.py --rate-limits  # also apply per-client rate limits
+
+Per-client rate limits are off unless --rate-limits, so by default the numbers
+measure real work. Latencies are reported separately for 2xx responses and for
+everything else (rejections, missing shares, failed requests), since fast
+rejections would otherwise pull the percentiles down.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+from _common import WEBSITE_DIR, call_asgi, use_website
+
+
+# Relative frequency of each request kind, modeled on static/js/main.js: page
+# loads fetch the page, its scripts and the catalog; interactions without the
+# catalog fall back to /api/calculate and /api/mutation-multiplier
+DEFAULT_MIX = {
+    "page": 4,
+    "asset": 8,
+    "catalog": 2,
+    "calculate": 40,
+    "weight_range": 16,
+    "mutation_multiplier": 14,
+    "share_create": 4,
+    "share_view": 12,
+}
+
+ASSETS = ["/static/js/main.js", "/static/js/calculator-core.js", "/static/css/style.css"]
+PAGES = ["/", "/mutation-calculator"]
+
+# Share views that ask for a share that doesn't exist (old or mistyped links)
+MISSING_SHARE_RATE = 0.05
+
+# Percentiles reported per route
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class TrafficModel:
+    """
+    Builds requests like the calculator page sends them. Plant popularity is
+    long-tailed (a few plants get most traffic), weights fall in each plant's
+    expected range and most fruits carry a few mutations.
+    """
+
+    def __init__(self, catalog: dict, mix: Dict[str, float], seed: int = 0):
+        """Initialize from the /api/catalog payload and a request mix."""
+        self.rng = random.Random(seed)
+        self.plants = list(catalog["plants"].items())
+        self.plant_weights = [1.0 / (rank + 1) for rank in range(len(self.plants))]
+        self.rng.shuffle(self.plants)
+        self.variants = list(catalog["variants"])
+        self.variant_weights = [100 if variant == "Normal" else 10 for variant in self.variants]
+        self.mutations = list(catalog["mutations"])
+        self.catalog_url = f"/api/catalog?v={catalog['version']}"
+        self.kinds = [kind for kind, weight in mix.items() if weight > 0]
+        self.kind_weights = [mix[kind] for kind in self.kinds]
+        self.share_ids: List[str] = []
+
+    def _fruit(self) -> dict:
+        """A random fruit: plant, variant, weight, mutations and amount."""
+        (plant, (base_weight, _, _, weight_min, weight_max)), = self.rng.choices(self.plants, self.plant_weights)
+        variant, = self.rng.choices(self.variants, self.variant_weights)
+        return {
+            "plant_name": plant,
+            "variant": variant,
+            "weight": round(self.rng.uniform(weight_min, weight_max), 2),
+            "mutations": self.rng.sample(self.mutations, self.rng.choice((0, 1, 1, 2, 2, 3, 4))),
+            "plant_amount": self.rng.choice((1, 1, 1, 2, 5)),
+        }
+
+    def next_request(self) -> Tuple[str, str, str, bytes]:
+        """(route label, method, path, JSON body) of the next request."""
+        kind, = self.rng.choices(self.kinds, self.kind_weights)
+        if kind == "page":
+            path = self.rng.choice(PAGES)
+            return f"GET {path}", "GET", path, b""
+        if kind == "asset":
+            return "GET /static", "GET", self.rng.choice(ASSETS), b""
+        if kind == "catalog":
+            return "GET /api/catalog", "GET", self.catalog_url, b""
+        if kind == "calculate":
+            return "POST /api/calculate", "POST", "/api/calculate", json.dumps(self._fruit()).encode()
+        if kind == "weight_range":
+            plant = self._fruit()["plant_name"]
+            return "GET /api/weight-range", "GET", f"/api/weight-range/{quote(plant)}", b""
+        if kind == "mutation_multiplier":
+            body = json.dumps(self._fruit()["mutations"]).encode()
+            return "POST /api/mutation-multiplier", "POST", "/api/mutation-multiplier", body
+        if kind == "share_create":
+            return "POST /api/share", "POST", "/api/share", json.dumps(self.share_payload()).encode()
+        if not self.share_ids or self.rng.random() < MISSING_SHARE_RATE:
+            return "GET /share", "GET", f"/share/missing{self.rng.randrange(10 ** 6)}", b""
+        return "GET /share", "GET", f"/share/{self.rng.choice(self.share_ids[-1000:])}", b""
+
+    def share_payload(self) -> dict:
+        """The body main.js posts when sharing a calculated fruit."""
+        fruit = self._fruit()
+        now = time.time()
+        return {
+            "plant": fruit["plant_name"],
+            "variant": fruit["variant"],
+            "mutations": fruit["mutations"],
+            "weight": str(fruit["weight"]),
+            "amount": str(fruit["plant_amount"]),
+            "result_value": "1,234",
+            "final_sheckles": "1,234",
+            "total_value": "1,234",
+            "total_multiplier": "x1",
+            "mutation_breakdown": "Default",
+            "weight_min": "0.17",
+            "weight_max": "0.38",
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now)),
+            "expires_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now + 86400)),
+        }
+
+    def record_share(self, body: bytes) -> None:
+        """Remember a created share so later views can open it."""
+        try:
+            self.share_ids.append(json.loads(body)["data"]["share_id"])
+        except (ValueError, KeyError, TypeError):
+            pass
+
+
+def client_address(index: int) -> str:
+    """A distinct IPv4 address per simulated client."""
+    return f"10.{(index >> 16) & 255}.{(index >> 8) & 255}.{index & 255}"
+
+
+class AsgiTransport:
+    """Sends requests straight into the ASGI app, in this process, as one client."""
+
+    def __init__(self, app, client: str):
+        self.app = app
+        self.client = (client, 50000)
+
+    async def request(self, method: str, path: str, body: bytes) -> Tuple[int, bytes]:
+        headers = [("content-type", "application/json")] if body else []
+        status, _, content = await call_asgi(self.app, method, path, body, headers, self.client)
+        return status, content
+
+    async def close(self) -> None:
+        pass
+
+
+class SocketTransport:
+    """
+    Minimal HTTP/1.1 client: one keep-alive connection per virtual user. The
+    client address goes in X-Forwarded-For, so a server that trusts it (as
+    --serve configures) applies per-client limits per virtual user.
+    """
+
+    def __init__(self, host: str, port: int, client: str):
+        self.host = host
+        self.port = port
+        self.client = client
+        self._connection: Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = None
+
+    async def request(self, method: str, path: str, body: bytes) -> Tuple[int, bytes]:
+        for attempt in (0, 1):
+            if self._connection is None:
+                self._connection = await asyncio.open_connection(self.host, self.port)
+            reader, writer = self._connection
+            head = (
+                f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                f"Content-Length: {len(body)}\r\nX-Forwarded-For: {self.client}\r\n"
+                + ("Content-Type: application/json\r\n" if body else "")
+                + "\r\n"
+            )
+            try:
+                writer.write(head.encode("latin-1") + body)
+                return await self._read_response(reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # The server closed an idle keep-alive connection; reconnect once
+                await self.close()
+                if attempt:
+                    raise
+
+    async def _read_response(self, reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+        status_line = await reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                chunk = await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            content = b"".join(chunks)
+        else:
+            content = await reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, content
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            self._connection[1].close()
+            self._connection = None
+
+
+# Suffix of the report rows for responses other than 2xx
+NON_2XX = " [non-2xx]"
+
+
+class Stats:
+    """Latencies and status classes per route label, 2xx and non-2xx kept apart."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+
+    def record(self, route: str, status: Optional[int], latency: float) -> None:
+        if not (status and 200 <= status < 300):
+            route += NON_2XX
+        self.latencies.setdefault(route, []).append(latency)
+        statuses = self.statuses.setdefault(route, {})
+        key = f"{status // 100}xx" if status else "failed"
+        statuses[key] = statuses.get(key, 0) + 1
+
+    def report(self, elapsed: float) -> Dict[str, dict]:
+        """
+        Throughput and latency percentiles (ms) per route and overall; each
+        has a separate "<route> [non-2xx]" entry when any response wasn't 2xx.
+        """
+        report = {}
+        overall: Dict[str, List[float]] = {"all": [], "all" + NON_2XX: []}
+        totals: Dict[str, Dict[str, int]] = {"all": {}, "all" + NON_2XX: {}}
+        for route in sorted(self.latencies):
+            latencies = sorted(self.latencies[route])
+            report[route] = self._summary(latencies, elapsed, self.statuses[route])
+            group = "all" + NON_2XX if route.endswith(NON_2XX) else "all"
+            overall[group].extend(latencies)
+            for key, count in self.statuses[route].items():
+                totals[group][key] = totals[group].get(key, 0) + count
+        for group, latencies in overall.items():
+            if latencies or group == "all":
+                report[group] = self._summary(sorted(latencies), elapsed, totals[group])
+        return report
+
+    @staticmethod
+    def _summary(latencies: List[float], elapsed: float, statuses: Dict[str, int]) -> dict:
+        def percentile(p):
+            if not latencies:
+                return 0.0
+            index = min(len(latencies) - 1, max(0, int(round(p / 100 * len(latencies))) - 1))
+            return round(latencies[index] * 1000, 3)
+
+        return {
+            "requests": len(latencies),
+            "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+            **{f"p{p:g}_ms": percentile(p) for p in PERCENTILES},
+            "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+            "statuses": dict(sorted(statuses.items())),
+        }
+
+
+async def run_load(
+    transport_factory,
+    model: TrafficModel,
+    concurrency: int,
+    duration: float,
+    rate: Optional[float] = None,
+    warmup: float = 1.0,
+    clients: Optional[int] = None
+) -> Dict[str, dict]:
+    """
+    Drive the app with concurrency virtual users for duration seconds after a
+    warm-up. Closed loop by default (each user sends its next request when the
+    previous one finishes). With rate, requests start on a fixed schedule and
+    latency is measured from the scheduled time, so queueing isn't hidden.
+    Users are spread over clients distinct client addresses (one each by default).
+    """
+    stats = Stats()
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    measure_from = start + warmup
+    deadline = measure_from + duration
+    schedule = iter(range(10 ** 12))
+
+    async def user(index: int):
+        transport = transport_factory(client_address(index % (clients or concurrency)))
+        try:
+            while True:
+                if rate:
+                    scheduled = start + next(schedule) / rate
+                    if scheduled >= deadline:
+                        return
+                    await asyncio.sleep(max(0.0, scheduled - loop.time()))
+                else:
+                    scheduled = loop.time()
+                    if scheduled >= deadline:
+                        return
+                route, method, path, body = model.next_request()
+                status = None
+                try:
+                    status, content = await transport.request(method, path, body)
+                    if route == "POST /api/share" and status == 200:
+                        model.record_share(content)
+                except (OSError, asyncio.IncompleteReadError, ValueError):
+                    pass
+                if scheduled >= measure_from:
+                    stats.record(route, status, loop.time() - scheduled)
+        finally:
+            await transport.close()
+
+    await asyncio.gather(*(user(index) for index in range(concurrency)))
+    return stats.report(duration)
+
+
+def print_report(report: Dict[str, dict], title: str) -> None:
+    """Print a report as an aligned table."""
+    print(title)
+    width = max(len(route) for route in report)
+    columns = ["requests", "rps"] + [f"p{p:g}_ms" for p in PERCENTILES] + ["max_ms"]
+    print(f"{'route':<{width}}  " + "  ".join(f"{column:>9}" for column in columns) + "  statuses")
+    for route, summary in report.items():
+        statuses = " ".join(f"{key}:{count}" for key, count in summary["statuses"].items())
+        print(
+            f"{route:<{width}}  "
+            + "  ".join(f"{summary[column]:>9}" for column in columns)
+            + f"  {statuses}"
+        )
+
+
+def free_port() -> int:
+    """An unused local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int, rate_limits: bool = False) -> subprocess.Popen:
+    """Start uvicorn on a local port with a scratch database and wait until it answers."""
+    use_website(rate_limits=rate_limits)
+    env = {**os.environ, "GROWCALC_WARM_TIME_BUDGET": "0"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=WEBSITE_DIR, env=env
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("uvicorn did not start within 30 seconds")
+
+
+def parse_mix(text: Optional[str]) -> Dict[str, float]:
+    """Parse "kind=weight,..." overrides on top of DEFAULT_MIX."""
+    mix = dict(DEFAULT_MIX)
+    if text:
+        for item in text.split(","):
+            kind, _, weight = item.partition("=")
+            if kind not in DEFAULT_MIX:
+                raise ValueError(f"Unknown request kind {kind!r}; choose from {', '.join(DEFAULT_MIX)}")
+            mix[kind] = float(weight)
+    return mix
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Replay calculator traffic and report latency per route.")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--serve", action="store_true", help="start uvicorn on a local port and load it over TCP")
+    target.add_argument("--url", help="load an already running server, e.g. http://127.0.0.1:8000")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers with --serve")
+    parser.add_argument("--concurrency", type=int, default=32, help="virtual users")
+    parser.add_argument("--clients", type=int, help="distinct client addresses (default: one per user)")
+    parser.add_argument("--rate-limits", action="store_true",
+                        help="apply per-client rate limits (off by default, so results measure real work)")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=1.0, help="unmeasured seconds before measuring")
+    parser.add_argument("--rate", type=float, help="open loop: total requests per second to schedule")
+    parser.add_argument("--mix", help="request kind weights, e.g. calculate=40,share_create=0")
+    parser.add_argument("--seed", type=int, default=0, help="traffic model seed")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run one load test and print its report."""
+    args = parse_args(argv)
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    server = None
+    try:
+        if args.serve or args.url:
+            if args.serve:
+                host, port = "127.0.0.1", free_port()
+                server = start_server(port, args.workers, args.rate_limits)
+                title = f"uvicorn on :{port}, {args.workers} worker(s)"
+            else:
+                parts = urlsplit(args.url)
+                host, port = parts.hostname, parts.port or 80
+                title = args.url
+
+            def transport_factory(client):
+                return SocketTransport(host, port, client)
+        else:
+            use_website(rate_limits=args.rate_limits)
+            from main import app
+            title = "in-process ASGI"
+
+            def transport_factory(client):
+                return AsgiTransport(app, client)
+
+        async def load():
+            status, content = await transport_factory("127.0.0.1").request("GET", "/api/catalog", b"")
+            if status != 200:
+                raise RuntimeError(f"GET /api/catalog returned {status}")
+            model = TrafficModel(json.loads(content), mix, args.seed)
+            return await run_load(
+                transport_factory, model, args.concurrency, args.duration,
+                args.rate, args.warmup, args.clients
+            )
+
+        report = asyncio.run(load())
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    mode = f"rate {args.rate:g}/s" if args.rate else f"concurrency {args.concurrency}"
+    print_report(report, f"Load test: {title}, {mode}, {args.duration:g}s")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"target": title, "mode": mode, "duration": args.duration, "routes": report}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
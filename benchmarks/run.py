@@ -0,0 +1,179 @@
+"""
+Run the benchmark suite, store the results as a JSON baseline and compare a
+run against a baseline, failing when anything got slower than a threshold.
+
+Usage:
+    python benchmarks/run.py [--quick] [--only engine pages] --save baselines/main.json
+    python benchmarks/run.py [--quick] --compare baselines/main.json [--threshold 0.15]
+    python benchmarks/run.py --results new.json --compare baselines/main.json
+
+Exit status is 1 when a comparison finds regressions, 2 on bad input.
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+
+# Stats compared between runs; min is the least noisy for microbenchmarks
+METRICS = ("min_us", "median_us", "cpu_us")
+
+
+def discover() -> List[str]:
+    """Names of the suites (bench_<name>.py) in this directory."""
+    return sorted(path.stem[len("bench_"):] for path in BENCHMARKS_DIR.glob("bench_*.py"))
+
+
+def git_commit() -> Optional[str]:
+    """Current commit of the checkout, if it is one."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCHMARKS_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suites(names: List[str], quick: bool) -> dict:
+    """Run each suite in this process and collect its results with run metadata."""
+    if str(BENCHMARKS_DIR) not in sys.path:
+        sys.path.insert(0, str(BENCHMARKS_DIR))
+    cwd = os.getcwd()
+    suites = {}
+    try:
+        for name in names:
+            print(f"Running {name}...", file=sys.stderr)
+            module = importlib.import_module(f"bench_{name}")
+            suites[name] = module.run(quick=quick)
+    finally:
+        # Suites chdir into Website or the repo root
+        os.chdir(cwd)
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "quick": quick,
+        },
+        "suites": suites,
+    }
+
+
+def compare(
+    baseline: dict,
+    current: dict,
+    metric: str,
+    threshold: float,
+    min_delta_us: float = 0.0
+) -> List[dict]:
+    """
+    Compare timing entries present in both runs. Returns one row per entry
+    with the relative change; rows slower than threshold (and by more than
+    min_delta_us, to ignore jitter on sub-microsecond entries) are marked regressed.
+    """
+    rows = []
+    for suite, entries in current["suites"].items():
+        base_entries = baseline["suites"].get(suite, {})
+        for name, stats in entries.items():
+            base_stats = base_entries.get(name)
+            if not isinstance(stats, dict) or not isinstance(base_stats, dict):
+                continue
+            if metric not in stats or not base_stats.get(metric):
+                continue
+            change = stats[metric] / base_stats[metric] - 1
+            rows.append({
+                "name": f"{suite}.{name}",
+                "baseline": base_stats[metric],
+                "current": stats[metric],
+                "change": change,
+                "regressed": change > threshold and stats[metric] - base_stats[metric] > min_delta_us,
+            })
+    return rows
+
+
+def print_comparison(rows: List[dict], metric: str, threshold: float) -> None:
+    """Print a comparison as an aligned table, regressions flagged."""
+    width = max((len(row["name"]) for row in rows), default=10)
+    print(f"{'benchmark':<{width}}  {'baseline':>12}  {'current':>12}  {'change':>8}   ({metric}, threshold {threshold:+.0%})")
+    for row in rows:
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(
+            f"{row['name']:<{width}}  {row['baseline']:>12.3f}  {row['current']:>12.3f}  "
+            f"{row['change']:>+8.1%}{flag}"
+        )
+
+
+def load(path: str) -> dict:
+    """Read a results file written by --save."""
+    with open(path, "r", encoding="utf-8") as f:
+        results = json.load(f)
+    if not isinstance(results, dict) or "suites" not in results:
+        raise ValueError(f"{path} is not a benchmark results file")
+    return results
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Run benchmarks and compare them against a baseline.")
+    parser.add_argument("--quick", action="store_true", help="fewer, shorter repeats (noisier)")
+    parser.add_argument("--only", nargs="+", metavar="SUITE", choices=discover(),
+                        help="suites to run (default: all)")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a JSON baseline")
+    parser.add_argument("--results", metavar="PATH", help="use saved results instead of running")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="relative slowdown that counts as a regression (default 0.15)")
+    parser.add_argument("--min-delta-us", type=float, default=0.0,
+                        help="ignore slowdowns smaller than this many microseconds")
+    parser.add_argument("--metric", choices=METRICS, default="min_us", help="statistic to compare")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run or load results, then save and/or compare them."""
+    args = parse_args(argv)
+    try:
+        baseline = load(args.compare) if args.compare else None
+        current = load(args.results) if args.results else run_suites(args.only or discover(), args.quick)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    if args.save:
+        Path(args.save).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"Saved results to {args.save}", file=sys.stderr)
+
+    if baseline is None:
+        if not args.save:
+            print(json.dumps(current, indent=2))
+        return 0
+
+    if baseline["meta"].get("machine") != current["meta"].get("machine") or \
+            baseline["meta"].get("quick") != current["meta"].get("quick"):
+        print("Warning: baseline was recorded on a different machine or mode", file=sys.stderr)
+
+    rows = compare(baseline, current, args.metric, args.threshold, args.min_delta_us)
+    print_comparison(rows, args.metric, args.threshold)
+    regressions = [row for row in rows if row["regressed"]]
+    if regressions:
+        print(f"{len(regressions)} of {len(rows)} benchmarks regressed by more than {args.threshold:.0%}")
+        return 1
+    print(f"No regressions across {len(rows)} benchmarks")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,6 @@
 # grow_calculator_logic.py
 import json
-from typing import List
+from typing import Iterable, List, Sequence, Tuple
 
 
 class PlantCalculator:
@@ -16,6 +16,12 @@ class PlantCalculator:
             self.mutations = json.load(f)
             print(f"✅ Loaded {len(self.mutations)} mutations from mutations.json")
 
+        # Flat lookup tables for calculate_batch
+        self._plant_factors = {
+            name: (data["base_price"], data["base_weight"]) for name, data in self.plants.items()
+        }
+        self._variant_multipliers = {name: data["multiplier"] for name, data in self.variants.items()}
+        self._mutation_bonuses = {name: data["value_multi"] - 1 for name, data in self.mutations.items()}
 
     def calculate_mutation_multiplier(self, selected_mutations: list[str]) -> float:
         """
@@ -81,6 +87,54 @@ class PlantCalculator:
 
         return round(final_value)
 
+    def calculate_batch(self, rows: Iterable[Tuple[str, str, float, Sequence[str], int]]) -> List[dict]:
+        """
+        Value many (plant_name, variant, weight, mutations, plant_amount) rows at once.
+        Same formula as calculate_mutation_multiplier and calculate_plant_value, but
+        the plant and variant lookups are flat tables and each distinct mutation
+        set's multiplier is worked out once per call. Rows that can't be valued
+        get an "error" entry instead of raising.
+        """
+        plant_factors = self._plant_factors
+        variant_multipliers = self._variant_multipliers
+        mutation_bonuses = self._mutation_bonuses
+        mutation_multis = {}
+
+        results = []
+        for plant_name, variant, weight, mutations, plant_amount in rows:
+            factors = plant_factors.get(plant_name)
+            if factors is None:
+                results.append({"error": f"Unknown plant: {plant_name}"})
+                continue
+            variant_multiplier = variant_multipliers.get(variant)
+            if variant_multiplier is None:
+                results.append({"error": f"Unknown variant: {variant}"})
+                continue
+
+            key = tuple(mutations)
+            mutation_multi = mutation_multis.get(key)
+            if mutation_multi is None:
+                # Additive, as in calculate_mutation_multiplier; unknown names add nothing
+                mutation_multi = 1.0
+                for mutation_name in key:
+                    mutation_multi += mutation_bonuses.get(mutation_name, 0)
+                mutation_multi = mutation_multis[key] = max(1.0, mutation_multi)
+
+            base_price, base_weight = factors
+            base_value = base_price * mutation_multi * variant_multiplier
+            weight_ratio = weight / base_weight
+            clamped_ratio = max(0.95, min(weight_ratio, 100000000))
+            final_value = round(base_value * (clamped_ratio * clamped_ratio))
+
+            results.append({
+                "mutation_multiplier": mutation_multi,
+                "base_value": base_value,
+                "weight_ratio": weight_ratio,
+                "final_value": final_value,
+                "total_value": final_value * plant_amount
+            })
+        return results
+
     def get_plant_names(self) -> List[str]:
         return sorted(self.plants.keys())
 